@@ -1,95 +1,926 @@
 import argparse
+import concurrent.futures
+import hashlib
+import fcntl
+import json
 import os
+import resource
+import shutil
+import socket
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
 parser = argparse.ArgumentParser(description= 'CLisp — Lisp-interpreter written on C.'
                                               ' This script reads a file containing code similar to Scheme (R5RS),'
                                               ' interprets it into the C language, compiles it into an executable file, and runs it.')
-parser.add_argument('file', help='Path to .scm file')
+parser.add_argument('files', nargs='*', metavar='file',
+                    help='Path to .scm file or to directory with .scm files. Several files are built in parallel')
+parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                    help='Number of files built in parallel (default: number of CPUs)')
+parser.add_argument('--emit-only', action='store_true', default=False,
+                    help='Only build executables into the output directory, without running them')
+parser.add_argument('-o', '--output-dir',
+                    help='Directory where built executables are emitted (default: ./build/bin next to this script)')
+parser.add_argument('--no-cache', action='store_true', default=False,
+                    help='Always translate and compile the file, without looking into the build cache')
+parser.add_argument('--cache-dir', default=os.environ.get('CLISP_CACHE_DIR'),
+                    help='Directory of the build cache (default: ./build/cache next to this script)')
+parser.add_argument('--cache-max-size', type=int, default=256,
+                    help='Maximum size of the build cache in MiB, least recently used entries are evicted above it')
+parser.add_argument('--cache-stats', action='store_true', default=False,
+                    help='Print build cache statistics and exit')
+parser.add_argument('--clear-cache', action='store_true', default=False,
+                    help='Remove all entries from the build cache and exit')
+parser.add_argument('--profile', choices=['dev', 'release'], default='dev',
+                    help='dev: fast compilation without optimizations (default);'
+                         ' release: -O2 and LTO with the static runtime library')
+parser.add_argument('--pgo', action='store_true', default=False,
+                    help='Release profile only: build an instrumented executable, run it on the training input'
+                         ' and rebuild the program with the collected profile')
+parser.add_argument('--pgo-input', help='File passed to stdin of the PGO training run (default: empty input)')
+parser.add_argument('--no-server', action='store_true', default=False,
+                    help='Start a new translator process instead of using the persistent translation server')
+parser.add_argument('--timings', action='store_true', default=False,
+                    help='Report wall time, CPU time and peak RSS of every phase: translation (each of its phases),'
+                         ' compilation and execution')
+parser.add_argument('--timings-format', choices=['text', 'json'], default='text',
+                    help='Format of the timings report (default: text)')
+parser.add_argument('--timings-file', help='Write the timings report to the file instead of stderr')
+parser.add_argument('--tail-calls', action='store_true', default=False,
+                    help='Make all calls in the tail position through the trampoline of the runtime,'
+                         ' as if every program had (declare tail-calls)')
+parser.add_argument('--gc', action='store_true', default=False,
+                    help='Manage memory by the tracing collector instead of reference counting'
+                         ' (the runtime is built by CLISP_GC=1 ./install.sh)')
+parser.add_argument('--stop-server', action='store_true', default=False,
+                    help='Stop the persistent translation server and exit')
 
 args = parser.parse_args()
 
 RED = '\033[0;31m'
 NC = '\033[0m'
 
+SCRIPT_DIR = Path(__file__).parent.absolute()
+BUILD_DIR = SCRIPT_DIR / "build"
+LIB_DIR = SCRIPT_DIR / "lib"
+# Generated code is the same for both memory managers, the collector is chosen by CL_GC and the runtime built with it
+RUNTIME_NAME = "runtime_gc" if args.gc else "runtime"
+RUNTIME_LIB = LIB_DIR / f"lib{RUNTIME_NAME}.so"
+RUNTIME_STATIC_LIB = LIB_DIR / f"lib{RUNTIME_NAME}.a"
+MEMORY_FLAGS = ["-DCL_GC"] if args.gc else []
+RUNTIME_DIR = SCRIPT_DIR / "runtime"
+TRANSLATOR_DIR = SCRIPT_DIR / "translator"
+TRANSLATOR_VENV = TRANSLATOR_DIR / ".venv"
+
+# Bump it when the layout of the cache entries changes
+CACHE_VERSION = "1"
+CACHE_C_FILE = "out.c"
+CACHE_EXECUTABLE = "out"
+CACHE_STATS_FILE = "stats.json"
+CACHE_LOCK_FILE = ".lock"
+
+SERVER_IDLE_TIMEOUT = 1800
+SERVER_START_TIMEOUT = 10
+
+
 def print_error(message):
     print(f"{RED}{message}{NC}")
 
 
-def main():
-    input_path = Path(args.file).absolute()
-    if not input_path.exists():
-        print_error(f"Error: file {input_path} doesn't exist!")
-        sys.exit(1)
+class BuildError(Exception):
+    """
+    Error of building or running a program. Message is shown to the user as is.
+    """
 
-    script_dir = Path(__file__).parent.absolute()
-    os.chdir(script_dir)
 
-    build_dir = script_dir / "build"
-    build_dir.mkdir(exist_ok=True)
+class Timings:
+    def __init__(self):
+        """
+        Wall time, CPU time and peak RSS of the phases of the build. Phases are kept in the order they were started,
+        so nested phases (named "<phase>: <subphase>") follow the enclosing one.
+        """
 
-    out_file = build_dir / "out"
-    if out_file.exists():
-        out_file.unlink()
+        self.__phases = []
+        self.__remote_cpu = 0.0  # CPU time of the phases measured by other processes
 
-    lib_dir = script_dir / "lib"
-    runtime_lib = lib_dir / "libruntime.so"
+    @contextmanager
+    def measure(self, name: str):
+        """
+        Measures the code in the block as a phase with given name. CPU time includes the processes waited in the
+        block and the phases measured by other processes, peak RSS is the maximum of this process and the phases
+        added in the block.
+        """
 
-    if not lib_dir.exists() or not runtime_lib.exists():
-        print_error("Error: no runtime library!")
-        print_error("Execute ./install.sh")
-        sys.exit(1)
+        phase = {"phase": name}
+        self.__phases.append(phase)
+        index = len(self.__phases)
 
-    translator_venv = script_dir / "translator" / ".venv"
-    if not translator_venv.exists():
-        print_error("Error: no translator venv!")
-        print_error("Execute ./install.sh")
-        sys.exit(1)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time() + get_children_cpu_time() + self.__remote_cpu
+        try:
+            yield
+        finally:
+            phase["wall"] = time.perf_counter() - wall_start
+            phase["cpu"] = time.process_time() + get_children_cpu_time() + self.__remote_cpu - cpu_start
+            phase["max_rss"] = max(
+                [resource.getrusage(resource.RUSAGE_SELF).ru_maxrss]
+                + [p["max_rss"] for p in self.__phases[index:] if "max_rss" in p]
+            )
+
+    def add(self, name: str, wall: float, cpu: float, max_rss: int) -> None:
+        self.__phases.append({"phase": name, "wall": wall, "cpu": cpu, "max_rss": max_rss})
+
+    def extend(self, phases: list, prefix: str) -> None:
+        """
+        Adds phases measured by another process (the translator).
+        """
+
+        self.__phases.extend({**p, "phase": f"{prefix}: {p['phase']}"} for p in phases)
+        self.__remote_cpu += sum(p["cpu"] for p in phases)
+
+    @property
+    def phases(self) -> list:
+        """
+        Dictionaries with name ("phase"), wall and CPU time in seconds ("wall", "cpu") and peak RSS in KiB ("max_rss").
+        """
+
+        return self.__phases
+
+
+def get_children_cpu_time() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_process(cmd: list, timings: Timings, phase: str, stdin=None, capture_output=False, cwd=None):
+    """
+    Runs the process and measures it as a phase. Returns exit code, stdout and stderr (None if not captured).
+    """
+
+    pipe = subprocess.PIPE if capture_output else None
+    start = time.perf_counter()
+    process = subprocess.Popen(list(map(str, cmd)), cwd=cwd, stdin=stdin, stdout=pipe, stderr=pipe, text=True)
+
+    # Pipes are read in threads, so the process can be waited by wait4(), which returns resource usage of the process
+    outputs = {}
+    readers = [
+        threading.Thread(target=lambda name, f: outputs.__setitem__(name, f.read()), args=(name, f))
+        for name, f in [("stdout", process.stdout), ("stderr", process.stderr)]
+        if f is not None
+    ]
+    for reader in readers:
+        reader.start()
+
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    wall = time.perf_counter() - start
+
+    for reader in readers:
+        reader.join()
+    for f in [process.stdout, process.stderr]:
+        if f is not None:
+            f.close()
+
+    timings.add(phase, wall, usage.ru_utime + usage.ru_stime, usage.ru_maxrss)
+    return process.returncode, outputs.get("stdout"), outputs.get("stderr")
+
+
+def format_timings(phases: list) -> str:
+    header = ["Phase", "Wall", "CPU", "Peak RSS"]
+    rows = [
+        [
+            p["phase"],
+            f"{p['wall'] * 1000:.1f} ms",
+            f"{p['cpu'] * 1000:.1f} ms",
+            f"{p['max_rss'] / 1024:.1f} MiB",
+        ]
+        for p in phases
+    ]
+
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) if i == 0 else cell.rjust(width) for i, (cell, width) in enumerate(zip(row, widths)))
+        for row in [header, *rows]
+    )
+
+
+def write_timings_report(results: list) -> None:
+    """
+    Writes the timings of the built programs to stderr or to the file given by --timings-file.
+
+    :param results: dictionaries with name, status and timings ("phases") of the programs.
+    """
+
+    if args.timings_format == "json":
+        report = json.dumps({"files": [{key: r[key] for key in ("name", "status", "phases")} for r in results]})
+    else:
+        report = "\n\n".join(f"{r['name']} ({r['status']}):\n{format_timings(r['phases'])}" for r in results)
+
+    if args.timings_file:
+        Path(args.timings_file).write_text(report + "\n")
+    else:
+        print(report, file=sys.stderr)
+
+
+class BuildCache:
+    def __init__(self, cache_dir: Path, max_size: int):
+        """
+        Content-addressed cache of the translated and compiled programs. Every entry is a directory named by the hash of
+        all translation and compilation inputs; it contains the generated C-code and the linked executable. Least
+        recently used entries are evicted when total size of the cache exceeds the limit.
+
+        :param cache_dir: directory of the cache.
+        :param max_size: maximum size of the cache in bytes.
+        """
+
+        self.__dir = cache_dir
+        self.__max_size = max_size
+        self.__stats_path = cache_dir / CACHE_STATS_FILE
+
+    def lookup(self, key: str):
+        """
+        Returns the directory of the entry with given key or None if there is no such entry.
+        Found entry is marked as recently used.
+        """
+
+        entry = self.__dir / key
+        if not (entry / CACHE_EXECUTABLE).exists():
+            self.__update_stats(misses=1)
+            return None
+
+        now = time.time()
+        os.utime(entry, (now, now))
+        self.__update_stats(hits=1)
+        return entry
+
+    def store(self, key: str, c_file: Path, executable: Path) -> Path:
+        """
+        Copies the generated C-code and the executable into the entry with given key and returns its directory.
+        The entry appears atomically, so concurrent runs never see a partially written one.
+        """
+
+        self.__dir.mkdir(parents=True, exist_ok=True)
+        entry = self.__dir / key
+
+        tmp_entry = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=self.__dir))
+        shutil.copy2(c_file, tmp_entry / CACHE_C_FILE)
+        shutil.copy2(executable, tmp_entry / CACHE_EXECUTABLE)
+
+        try:
+            tmp_entry.rename(entry)
+        except OSError:
+            # Another run has already stored the same entry
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+        self.__evict()
+        return entry
+
+    def clear(self) -> None:
+        """
+        Removes all entries and statistics.
+        """
+
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+
+    def stats(self) -> dict:
+        """
+        Returns statistics of the cache: hits, misses, evictions, count of entries and their total size.
+        """
+
+        entries = self.__entries()
+        stats = self.__load_stats()
+        stats["entries"] = len(entries)
+        stats["size"] = sum(size for _, _, size in entries)
+        stats["max_size"] = self.__max_size
+        return stats
+
+    def __evict(self) -> None:
+        entries = self.__entries()
+        total_size = sum(size for _, _, size in entries)
+        evicted = 0
 
-    translator_dir = script_dir / "translator"
-    out_c_file = build_dir / "out.c"
+        for entry, _, size in sorted(entries, key=lambda e: e[1]):
+            if total_size <= self.__max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+            evicted += 1
+
+        if evicted:
+            self.__update_stats(evictions=evicted)
+
+    def __entries(self) -> list:
+        # (directory, last use time, size in bytes)
+        if not self.__dir.exists():
+            return []
+
+        entries = []
+        for entry in self.__dir.iterdir():
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            size = sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+            entries.append((entry, entry.stat().st_mtime, size))
+
+        return entries
+
+    def __load_stats(self) -> dict:
+        stats = {"hits": 0, "misses": 0, "evictions": 0}
+        try:
+            with open(self.__stats_path) as f:
+                stats.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        return stats
+
+    def __update_stats(self, **deltas) -> None:
+        self.__dir.mkdir(parents=True, exist_ok=True)
+
+        # Concurrent runs must not lose each other's updates
+        with open(self.__dir / CACHE_LOCK_FILE, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+            stats = self.__load_stats()
+            for k, v in deltas.items():
+                stats[k] += v
+
+            tmp_fd, tmp_path = tempfile.mkstemp(prefix=".stats.", dir=self.__dir)
+            with os.fdopen(tmp_fd, "w") as f:
+                json.dump(stats, f)
+            os.replace(tmp_path, self.__stats_path)
+
+
+def iter_translator_inputs():
+    """
+    Yields all files of the translator that affect the result of translation.
+    """
+
+    yield TRANSLATOR_DIR / "symbols.json"
+    yield TRANSLATOR_DIR / "Lisp.g4"
+    yield from sorted((TRANSLATOR_DIR / "src").rglob("*.py"))
+
+
+def iter_cache_inputs():
+    """
+    Yields all files of the toolchain that affect the result of translation and compilation.
+    """
+
+    yield from iter_translator_inputs()
+    yield from sorted(RUNTIME_DIR.rglob("*.h"))
+
+    if args.pgo:
+        yield from iter_runtime_sources()
+        if args.pgo_input:
+            yield Path(args.pgo_input).absolute()
+    elif args.profile == "release":
+        yield RUNTIME_STATIC_LIB
+    else:
+        yield RUNTIME_LIB
+
+
+def iter_runtime_sources():
+    yield from sorted((RUNTIME_DIR / "lib").rglob("*.c"))
+
+
+def update_hash(h, paths) -> None:
+    for path in paths:
+        h.update(b"\0")
+        h.update(str(path.relative_to(SCRIPT_DIR) if path.is_relative_to(SCRIPT_DIR) else path.name).encode())
+        h.update(b"\0")
+        h.update(path.read_bytes())
+
+
+def compute_cache_key(input_path: Path, compile_cmd: list) -> str:
+    """
+    Computes the key of the cache entry: hash of the contents of all translation and compilation inputs.
+    """
+
+    h = hashlib.sha256()
+    h.update(CACHE_VERSION.encode())
+    h.update("\0".join(compile_cmd).encode())
+    h.update(b"\0pgo" if args.pgo else b"")
+    h.update(b"\0tail-calls" if args.tail_calls else b"")
+
+    # The program itself is identified only by its content, not by its location
+    h.update(input_path.read_bytes())
+
+    update_hash(h, iter_cache_inputs())
+
+    return h.hexdigest()
+
+
+def print_cache_stats(cache: BuildCache) -> None:
+    stats = cache.stats()
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = stats["hits"] / lookups * 100 if lookups else 0
+
+    print(f"Entries:   {stats['entries']}")
+    print(f"Size:      {stats['size'] / 2 ** 20:.2f} MiB of {stats['max_size'] / 2 ** 20:.2f} MiB")
+    print(f"Hits:      {stats['hits']}")
+    print(f"Misses:    {stats['misses']}")
+    print(f"Hit rate:  {hit_rate:.1f}%")
+    print(f"Evictions: {stats['evictions']}")
+
+
+def get_server_socket_path() -> Path:
+    """
+    Returns path of the socket of the translation server. The path depends on the sources of the translator, so
+    a server with stale sources is never used (it stops by idle timeout).
+    """
+
+    h = hashlib.sha256(str(SCRIPT_DIR).encode())
+    update_hash(h, iter_translator_inputs())
+
+    # Unix socket path is limited by ~100 bytes, so it can't be placed in the build directory
+    sockets_dir = Path(tempfile.gettempdir()) / f"clisp-{os.getuid()}"
+    sockets_dir.mkdir(mode=0o700, exist_ok=True)
+
+    return sockets_dir / f"translator-{h.hexdigest()[:16]}.sock"
+
+
+def request_server(socket_path: Path, message: dict, timeout=None) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(str(socket_path))
+        with s.makefile("rwb") as f:
+            f.write(json.dumps(message).encode() + b"\n")
+            f.flush()
+            response = f.readline()
+
+    if not response:
+        raise ConnectionError("Translation server closed the connection")
+
+    return json.loads(response)
+
+
+def start_server(socket_path: Path) -> None:
+    subprocess.Popen(
+        [
+            TRANSLATOR_VENV / "bin" / "python3",
+            "-m", "src.server",
+            "--socket", str(socket_path),
+            "--idle-timeout", str(SERVER_IDLE_TIMEOUT),
+        ],
+        cwd=TRANSLATOR_DIR,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while True:
+        try:
+            request_server(socket_path, {"command": "ping"}, timeout=SERVER_START_TIMEOUT)
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def translate_on_server(source: str) -> tuple:
+    """
+    Translates the code on the translation server and returns generated C-code and timings of the phases of translation.
+    The server is started if it isn't running.
+
+    :raises OSError: the server is unavailable.
+    """
+
+    socket_path = get_server_socket_path()
+    message = {"source": source, "timings": True, "tail_calls": args.tail_calls}
+
+    try:
+        response = request_server(socket_path, message)
+    except (FileNotFoundError, ConnectionRefusedError):
+        start_server(socket_path)
+        response = request_server(socket_path, message)
+
+    if "error" in response:
+        raise BuildError(response["error"])
+
+    return response["code"], response.get("timings", [])
+
+
+def stop_server() -> None:
+    try:
+        request_server(get_server_socket_path(), {"command": "shutdown"})
+    except (FileNotFoundError, ConnectionRefusedError):
+        pass
 
+
+def translate(input_path: Path, out_c_file: Path, timings: Timings) -> None:
+    if not args.no_server:
+        start = len(timings.phases)
+        try:
+            with timings.measure("translate"):
+                with timings.measure("translate: read source"):
+                    source = input_path.read_text()
+
+                code, translation_timings = translate_on_server(source)
+                timings.extend(translation_timings, "translate")
+
+                with timings.measure("translate: write"):
+                    out_c_file.write_text(code)
+            return
+        except OSError:
+            # Fall back to one-shot translator, which is measured instead
+            del timings.phases[start:]
+
+    timings_file = out_c_file.with_name("timings.json")
     translator_cmd = [
-        translator_venv / "bin" / "python3",
+        TRANSLATOR_VENV / "bin" / "python3",
         "-m", "src.main",
         "-f", str(input_path),
-        "-o", str(out_c_file)
+        "-o", str(out_c_file),
+        "--timings",
+        "--timings-format", "json",
+        "--timings-file", str(timings_file),
     ]
+    if args.tail_calls:
+        translator_cmd.append("--tail-calls")
 
-    translation_result = subprocess.run(
-        translator_cmd,
-        cwd=translator_dir,
-        capture_output=True,
-        text=True
-    )
-    if translation_result.returncode:
-        print_error(translation_result.stderr);
-        sys.exit(1);
+    returncode, _, stderr = run_process(translator_cmd, timings, "translate", capture_output=True, cwd=TRANSLATOR_DIR)
+
+    if timings_file.exists():
+        timings.extend(json.loads(timings_file.read_text())["phases"], "translate")
+
+    if returncode:
+        raise BuildError(stderr)
 
-    os.chdir(build_dir)
 
-    compile_cmd = [
+def make_compile_cmd(c_file: str, executable: str, pgo_flag: str = None) -> list:
+    if args.profile == "dev":
+        return [
+            "gcc",
+            *MEMORY_FLAGS,
+            "-o", executable,
+            c_file,
+            f"-I{RUNTIME_DIR}",
+            f"-L{LIB_DIR}",
+            f"-l{RUNTIME_NAME}",
+            f"-Wl,-rpath,{LIB_DIR}"
+        ]
+
+    release_cmd = [
         "gcc",
-        "-o", "out",
-        "out.c",
-        "-I../runtime",
-        "-L../lib",
-        "-lruntime",
-        "-Wl,-rpath,../lib"
+        "-O2",
+        "-flto=auto",
+        *MEMORY_FLAGS,
+        "-o", executable,
+        c_file,
+        f"-I{RUNTIME_DIR}",
+    ]
+
+    if pgo_flag is None:
+        return release_cmd + [str(RUNTIME_STATIC_LIB), "-lm", "-lffi", "-ldl"]
+
+    # Profile of the runtime is collected only if it is instrumented too, so it is compiled together with the program
+    return release_cmd + [
+        pgo_flag,
+        f"-I{RUNTIME_DIR / 'lib'}",
+        *map(str, iter_runtime_sources()),
+        "-lm", "-lffi", "-ldl",
+    ]
+
+
+def run_compiler(cmd: list, message: str, timings: Timings, phase: str) -> None:
+    returncode, _, stderr = run_process(cmd, timings, phase, capture_output=True)
+    if returncode:
+        raise BuildError(f"{message}\n{stderr}".rstrip())
+
+
+def compile_program(c_file: Path, executable: Path, timings: Timings) -> None:
+    if args.pgo:
+        with timings.measure("compile"):
+            compile_program_pgo(c_file, executable, timings)
+        return
+
+    run_compiler(make_compile_cmd(str(c_file), str(executable)), "Error during compilation!", timings, "compile")
+
+
+def compile_program_pgo(c_file: Path, executable: Path, timings: Timings) -> None:
+    profile_dir = executable.parent / f"{executable.name}.pgo"
+    shutil.rmtree(profile_dir, ignore_errors=True)
+
+    # Names of the profile files depend on the name of the executable, so both builds must produce the same one
+    run_compiler(
+        make_compile_cmd(str(c_file), str(executable), f"-fprofile-generate={profile_dir}"),
+        "Error during compilation of the instrumented program!",
+        timings,
+        "compile: instrumented build",
+    )
+
+    training_input = open(args.pgo_input, "rb") if args.pgo_input else subprocess.DEVNULL
+    try:
+        returncode, _, _ = run_process([executable], timings, "compile: training run", stdin=training_input,
+                                       capture_output=True)
+    finally:
+        if args.pgo_input:
+            training_input.close()
+
+    if returncode:
+        raise BuildError("Error during PGO training run!")
+
+    try:
+        run_compiler(
+            make_compile_cmd(
+                str(c_file), str(executable), f"-fprofile-use={profile_dir}"
+            ) + ["-fprofile-partial-training", "-Wno-missing-profile"],
+            "Error during compilation!",
+            timings,
+            "compile: optimized build",
+        )
+    finally:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+
+def execute(executable: Path, timings: Timings, capture_output: bool = False) -> str:
+    """
+    Runs the program in the build directory and returns its output if it is captured.
+    Captured programs get empty stdin, so they can't wait for input of the user.
+    """
+
+    returncode, stdout, stderr = run_process(
+        [executable],
+        timings,
+        "run",
+        stdin=subprocess.DEVNULL if capture_output else None,
+        capture_output=capture_output,
+        cwd=BUILD_DIR,
+    )
+
+    output = (stdout or "") + (stderr or "")
+    if returncode:
+        raise BuildError(f"{output}Error during execution!")
+
+    return output
+
+
+def make_cache():
+    cache_dir = Path(args.cache_dir).absolute() if args.cache_dir else BUILD_DIR / "cache"
+    return BuildCache(cache_dir, args.cache_max_size * 2 ** 20)
+
+
+def build(input_path: Path, job_dir: Path, timings: Timings) -> Path:
+    """
+    Translates and compiles the program in its own directory, so several programs can be built at once.
+    Returns path of the executable, which is taken from the build cache if possible.
+
+    :param input_path: path of the .scm file.
+    :param job_dir: directory for the intermediate files of this program only.
+    :param timings: performed phases are measured into it.
+    :raises BuildError: the program can't be translated or compiled.
+    """
+
+    cache = make_cache()
+
+    cache_key = None
+    if not args.no_cache:
+        with timings.measure("cache lookup"):
+            cache_key = compute_cache_key(input_path, make_compile_cmd(CACHE_C_FILE, CACHE_EXECUTABLE))
+            entry = cache.lookup(cache_key)
+        if entry is not None:
+            return entry / CACHE_EXECUTABLE
+
+    out_c_file = job_dir / "out.c"
+    out_file = job_dir / "out"
+
+    translate(input_path, out_c_file, timings)
+    compile_program(out_c_file, out_file, timings)
+
+    if cache_key is not None:
+        with timings.measure("cache store"):
+            cache.store(cache_key, out_c_file, out_file)
+
+    return out_file
+
+
+def emit(executable: Path, name: str) -> Path:
+    output_dir = Path(args.output_dir).absolute() if args.output_dir else BUILD_DIR / "bin"
+    output_path = output_dir / name
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Executable may be running in another job, so it is replaced instead of being overwritten
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}")
+    shutil.copy2(executable, tmp_path)
+    os.replace(tmp_path, output_path)
+
+    return output_path
+
+
+def run_job(input_path: Path, name: str) -> dict:
+    """
+    Builds the program and runs it (or emits its executable). Output of the program is captured.
+    Returns the result of the job: name, status ("ok", "cached" or "failed"), timings of the phases,
+    output of the program and the error.
+    """
+
+    jobs_dir = BUILD_DIR / "jobs"
+    jobs_dir.mkdir(parents=True, exist_ok=True)
+    job_dir = Path(tempfile.mkdtemp(prefix=f"{input_path.stem}.", dir=jobs_dir))
+
+    timings = Timings()
+    result = {"name": name, "status": "ok", "phases": timings.phases, "output": "", "error": None}
+
+    try:
+        executable = build(input_path, job_dir, timings)
+        if not is_measured(timings.phases, "compile"):
+            result["status"] = "cached"
+
+        if args.emit_only:
+            emit(executable, name)
+        else:
+            result["output"] = execute(executable, timings, capture_output=True)
+    except BuildError as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+    finally:
+        shutil.rmtree(job_dir, ignore_errors=True)
+
+    return result
+
+
+def collect_inputs(paths: list) -> list:
+    """
+    Returns pairs (path of the .scm file, name of the job). Directories are searched recursively, names of the
+    files found there are relative to the directory.
+    """
+
+    inputs = []
+
+    for path in map(lambda p: Path(p).absolute(), paths):
+        if path.is_dir():
+            for file in sorted(path.rglob("*.scm")):
+                inputs.append((file, str(file.relative_to(path).with_suffix(""))))
+        elif path.exists():
+            inputs.append((path, path.stem))
+        else:
+            raise BuildError(f"Error: file {path} doesn't exist!")
+
+    names = [name for _, name in inputs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise BuildError(f"Error: several files have the same name: {', '.join(duplicates)}")
+
+    return inputs
+
+
+def is_measured(phases: list, name: str) -> bool:
+    return any(p["phase"] == name for p in phases)
+
+
+def format_duration(phases: list, name: str) -> str:
+    wall = sum(p["wall"] for p in phases if p["phase"] == name)
+    return f"{wall:.2f}s" if is_measured(phases, name) else "-"
+
+
+def print_summary(results: list) -> None:
+    phases = ["translate", "compile", "run"]
+    header = ["File", "Status", *map(str.capitalize, phases), "Total"]
+
+    rows = [
+        [
+            result["name"],
+            result["status"],
+            *(format_duration(result["phases"], phase) for phase in phases),
+            # Nested phases are already included in the enclosing ones
+            f"{sum(p['wall'] for p in result['phases'] if ': ' not in p['phase']):.2f}s",
+        ]
+        for result in results
     ]
 
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+    for row in [header, *rows]:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+
+    failed = [result for result in results if result["status"] == "failed"]
+    print(f"{len(results) - len(failed)} succeeded, {len(failed)} failed")
+
+    for result in failed:
+        print_error(f"{result['name']}:")
+        print_error(result["error"])
+
+
+def run_batch(inputs: list) -> bool:
+    """
+    Builds (and runs) all programs in the pool of processes. Output of every program is printed when it finishes.
+    Returns whether all programs succeeded.
+    """
+
+    results = {}
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {executor.submit(run_job, input_path, name): name for input_path, name in inputs}
+
+        for future in concurrent.futures.as_completed(futures):
+            # Errors other than BuildError (crashed worker, unexpected exception) fail only their job
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"name": futures[future], "status": "failed", "phases": [], "output": "",
+                          "error": f"{type(e).__name__}: {e}"}
+
+            results[result["name"]] = result
+
+            if not args.emit_only:
+                print(f"==> {result['name']} <==")
+                print(result["output"], end="" if result["output"].endswith("\n") or not result["output"] else "\n")
+
+    print_summary([results[name] for _, name in inputs])
+
+    if args.timings:
+        write_timings_report([results[name] for _, name in inputs])
+
+    return all(result["status"] != "failed" for result in results.values())
+
+
+def run_single(input_path: Path) -> None:
+    """
+    Builds the program and runs it with stdin and stdout of this script.
+    """
+
+    jobs_dir = BUILD_DIR / "jobs"
+    jobs_dir.mkdir(parents=True, exist_ok=True)
+    job_dir = Path(tempfile.mkdtemp(prefix=f"{input_path.stem}.", dir=jobs_dir))
+
+    timings = Timings()
+    status = "failed"
+
     try:
-        subprocess.run(compile_cmd, check=True)
-    except subprocess.CalledProcessError:
-        print_error(f"Error during compilation!")
+        executable = build(input_path, job_dir, timings)
+        status = "ok" if is_measured(timings.phases, "compile") else "cached"
+
+        if args.emit_only:
+            emit(executable, input_path.stem)
+        else:
+            try:
+                execute(executable, timings)
+            except BuildError:
+                status = "failed"
+                raise
+    finally:
+        shutil.rmtree(job_dir, ignore_errors=True)
+
+        if args.timings:
+            write_timings_report([{"name": input_path.stem, "status": status, "phases": timings.phases}])
+
+
+def main():
+    cache = make_cache()
+
+    if args.clear_cache:
+        cache.clear()
+        return
+
+    if args.cache_stats:
+        print_cache_stats(cache)
+        return
+
+    if args.stop_server:
+        stop_server()
+        return
+
+    if not args.files:
+        parser.error("the following arguments are required: file")
+
+    if args.jobs < 1:
+        parser.error("--jobs must be positive")
+
+    if args.pgo and args.profile != "release":
+        parser.error("--pgo requires --profile=release")
+
+    if args.pgo_input and not Path(args.pgo_input).exists():
+        print_error(f"Error: file {args.pgo_input} doesn't exist!")
+        sys.exit(1)
+
+    runtime_lib = RUNTIME_STATIC_LIB if args.profile == "release" else RUNTIME_LIB
+    if not LIB_DIR.exists() or not runtime_lib.exists():
+        print_error("Error: no runtime library!")
+        print_error("Execute CLISP_GC=1 ./install.sh" if args.gc else "Execute ./install.sh")
         sys.exit(1)
 
+    if not TRANSLATOR_VENV.exists():
+        print_error("Error: no translator venv!")
+        print_error("Execute ./install.sh")
+        sys.exit(1)
+
+    BUILD_DIR.mkdir(exist_ok=True)
+
     try:
-        subprocess.run(["./out"], check=True)
-    except subprocess.CalledProcessError:
-        print_error(f"Error during execution!")
+        inputs = collect_inputs(args.files)
+
+        if len(args.files) == 1 and len(inputs) == 1 and not Path(args.files[0]).is_dir():
+            run_single(inputs[0][0])
+        elif not run_batch(inputs):
+            sys.exit(1)
+    except BuildError as e:
+        print_error(str(e))
         sys.exit(1)
 
 if __name__ == "__main__":
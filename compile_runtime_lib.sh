@@ -39,27 +39,38 @@ fi
 cd ./build
 
 echo -e "${YELLOW}Launching CMake from directory ./runtime ...${NC}"
-cmake ..
+# CLISP_GC=1 enables the runtime with the tracing collector, CLISP_NO_SLAB=1 disables the slabs for sanitizer builds.
+# The options are kept by CMake for the next builds
+cmake .. ${CLISP_GC:+-DCLISP_GC=ON} ${CLISP_NO_SLAB:+-DCLISP_NO_SLAB=ON}
 
 if [ $? -ne 0 ]; then
     echo -e "${RED}Error running CMake!${NC}"
     exit 1
 fi
 
+# Shared library is used by default, static one (with LTO) - by release builds
+TARGETS=(runtime runtime_static)
+COMPILED_LIB_PATHS=('./libruntime.so' './libruntime.a')
+
+if grep -q "^CLISP_GC:BOOL=ON" CMakeCache.txt; then
+  TARGETS+=(runtime_gc runtime_gc_static)
+  COMPILED_LIB_PATHS+=('./libruntime_gc.so' './libruntime_gc.a')
+fi
+
 echo -e "${YELLOW}Compiling library...${NC}"
-cmake --build . --target runtime
+cmake --build . --target "${TARGETS[@]}"
 
 if [ $? -eq 0 ]; then
   echo -e "${GREEN}Assembly completed successfully.${NC}"
 
-  COMPILED_LIB_PATH='./libruntime.so'
-
-  if [ -f ${COMPILED_LIB_PATH} ]; then
-      echo -e "${GREEN}The library has been successfully created.${NC}"
-  else
-      echo -e "${RED}Error: Library was not created!${NC}"
-      exit 1
-  fi
+  for COMPILED_LIB_PATH in "${COMPILED_LIB_PATHS[@]}"; do
+    if [ -f ${COMPILED_LIB_PATH} ]; then
+        echo -e "${GREEN}The library ${COMPILED_LIB_PATH} has been successfully created.${NC}"
+    else
+        echo -e "${RED}Error: Library ${COMPILED_LIB_PATH} was not created!${NC}"
+        exit 1
+    fi
+  done
 
   cd ../../
 
@@ -68,20 +79,22 @@ if [ $? -eq 0 ]; then
       mkdir -p ./lib
   fi
 
-  echo -e "${YELLOW}Moving the library to the ./lib folder...${NC}"
+  echo -e "${YELLOW}Moving the libraries to the ./lib folder...${NC}"
 
-  if [ -f "./lib/${COMPILED_LIB_PATH}" ]; then
-      rm "./lib/${COMPILED_LIB_PATH}"
-  fi
+  for COMPILED_LIB_PATH in "${COMPILED_LIB_PATHS[@]}"; do
+    if [ -f "./lib/${COMPILED_LIB_PATH}" ]; then
+        rm "./lib/${COMPILED_LIB_PATH}"
+    fi
 
-  mv "./runtime/build/${COMPILED_LIB_PATH}" "./lib/${COMPILED_LIB_PATH}"
+    mv "./runtime/build/${COMPILED_LIB_PATH}" "./lib/${COMPILED_LIB_PATH}"
 
-  if [ -f "./lib/${COMPILED_LIB_PATH}" ]; then
-    echo -e "${GREEN}The library has been successfully moved to the ./lib folder.${NC}"
-  else
-    echo -e "${RED}Error moving library!${NC}"
-    exit 1
-  fi
+    if [ -f "./lib/${COMPILED_LIB_PATH}" ]; then
+      echo -e "${GREEN}The library ${COMPILED_LIB_PATH} has been successfully moved to the ./lib folder.${NC}"
+    else
+      echo -e "${RED}Error moving library ${COMPILED_LIB_PATH}!${NC}"
+      exit 1
+    fi
+  done
 
   exit 0
 
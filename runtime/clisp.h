@@ -5,6 +5,7 @@
 #include "lib/core/io.h"
 #include "lib/objects/primitive.h"
 #include "lib/objects/evaluable.h"
+#include "lib/objects/cell.h"
 #include "lib/core/logic.h"
 #include "lib/core/comparation.h"
 #include "lib/core/environment.h"
@@ -13,3 +14,4 @@
 #include "lib/core/native_calls.h"
 #include "lib/objects/pair.h"
 #include "lib/objects/list.h"
+#include "lib/memory/collector.h"
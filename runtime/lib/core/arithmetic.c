@@ -6,17 +6,6 @@
 
 #include "lib/objects/primitive.h"
 #include "lib/exit/abort.h"
-#include "lib/objects/primitive_types.h"
-
-static void set_int_value(CL_Object* obj, int new_value) {
-    CL_IntObject* int_object = (CL_IntObject*)obj;
-    int_object->value = new_value;
-}
-
-static void set_double_value(CL_Object* obj, double new_value) {
-    CL_DoubleObject* double_object = (CL_DoubleObject*)obj;
-    double_object->value = new_value;
-}
 
 CL_Object* cl_add(CL_FUNC_PARAMS) {
     if (count == 0) {
@@ -32,34 +21,34 @@ CL_Object* cl_add(CL_FUNC_PARAMS) {
         return operand;
     }
 
-    CL_Object* result = cl_make_int(0);
+    // Sum is accumulated unboxed: integers returned by cl_make_int can be shared, so they are never changed
+    int int_result = 0;
+    double double_result = 0;
+    bool is_double = false;
 
     for (size_t i = 0; i < count; i++) {
         CL_Object* operand = args[i];
         CL_CHECK_FUNC_ARG_NUMERIC_TYPE(cl_get_obj_type(operand));
 
         enum CL_ObjectType operand_type = cl_get_obj_type(operand);
-        enum CL_ObjectType result_type = cl_get_obj_type(result);
 
-        if (operand_type == DOUBLE && result_type == INTEGER) {
-            double prev_value = cl_get_int_value(result);
-            cl_dec_refs_cnt(result);
-            result = cl_make_double(prev_value);
-            result_type = cl_get_obj_type(result);
+        if (operand_type == DOUBLE && !is_double) {
+            double_result = int_result;
+            is_double = true;
         }
 
         double op_value = operand_type == INTEGER
                          ? cl_get_int_value(operand)
                          : cl_get_double_value(operand);
 
-        if (result_type == DOUBLE) {
-            set_double_value(result, cl_get_double_value(result) + op_value);
+        if (is_double) {
+            double_result += op_value;
         } else {
-            set_int_value(result, cl_get_int_value(result) + (int)op_value);
+            int_result += (int)op_value;
         }
     }
 
-    return result;
+    return is_double ? cl_make_double(double_result) : cl_make_int(int_result);
 }
 
 CL_Object* cl_mul(CL_FUNC_PARAMS) {
@@ -76,39 +65,38 @@ CL_Object* cl_mul(CL_FUNC_PARAMS) {
         return operand;
     }
 
-    CL_Object* result = cl_make_int(1);
+    // Product is accumulated unboxed, as in cl_add
+    int int_result = 1;
+    double double_result = 1;
+    bool is_double = false;
 
     for (size_t i = 0; i < count; i++) {
         CL_Object* operand = args[i];
         CL_CHECK_FUNC_ARG_NUMERIC_TYPE(cl_get_obj_type(operand));
 
         enum CL_ObjectType operand_type = cl_get_obj_type(operand);
-        enum CL_ObjectType result_type = cl_get_obj_type(result);
 
         if (cl_unwrap_numeric_to_double(operand) == 0) {
-            cl_dec_refs_cnt(result);
             return cl_make_int(0);
         }
 
-        if (operand_type == DOUBLE && result_type == INTEGER) {
-            double prev_value = cl_get_int_value(result);
-            cl_dec_refs_cnt(result);
-            result = cl_make_double(prev_value);
-            result_type = cl_get_obj_type(result);
+        if (operand_type == DOUBLE && !is_double) {
+            double_result = int_result;
+            is_double = true;
         }
 
         double op_value = operand_type == INTEGER
                          ? cl_get_int_value(operand)
                          : cl_get_double_value(operand);
 
-        if (result_type == DOUBLE) {
-            set_double_value(result, cl_get_double_value(result) * op_value);
+        if (is_double) {
+            double_result *= op_value;
         } else {
-            set_int_value(result, cl_get_int_value(result) * (int)op_value);
+            int_result *= (int)op_value;
         }
     }
 
-    return result;
+    return is_double ? cl_make_double(double_result) : cl_make_int(int_result);
 }
 
 CL_Object* cl_div(CL_FUNC_PARAMS) {
@@ -180,31 +168,62 @@ CL_Object* cl_sub(CL_FUNC_PARAMS) {
         CL_Object* operand = args[0];
         CL_CHECK_FUNC_ARG_NUMERIC_TYPE(cl_get_obj_type(operand));
 
-        enum CL_ObjectType type = cl_get_obj_type(operand);
-
-        if (type == INTEGER) {
-            set_int_value(operand, -1 * cl_get_int_value(operand));
-        } else {
-            set_double_value(operand, -1 * cl_get_double_value(operand));
+        // Negation is a new number: the operand can be a value of the variable or a shared integer
+        if (cl_get_obj_type(operand) == INTEGER) {
+            return cl_make_int(-1 * cl_get_int_value(operand));
         }
-        if (operand == args[0]) {
-            cl_inc_refs_cnt(operand);
-        }
-        return operand;
+        return cl_make_double(-1 * cl_get_double_value(operand));
     }
 
-    CL_Object* operand1 = args[0];
-    CL_Object* operand2 = args[1];
-    CL_CHECK_FUNC_ARG_NUMERIC_TYPE(cl_get_obj_type(operand1));
-    CL_CHECK_FUNC_ARG_NUMERIC_TYPE(cl_get_obj_type(operand2));
+    return cl_sub2(args[0], args[1]);
+}
 
-    CL_Object* result = NULL;
+CL_Object* cl_add2(CL_Object* left, CL_Object* right) {
+    enum CL_ObjectType left_type = cl_get_obj_type(left);
+    enum CL_ObjectType right_type = cl_get_obj_type(right);
 
-    if (cl_get_obj_type(operand1) == DOUBLE ||  cl_get_obj_type(operand2) == DOUBLE) {
-        result = cl_make_double(cl_unwrap_numeric_to_double(operand1) - cl_unwrap_numeric_to_double(operand2));
-    } else {
-        result = cl_make_int(cl_get_int_value(operand1) - cl_get_int_value(operand2));
+    if (left_type == INTEGER && right_type == INTEGER) {
+        return cl_make_int(cl_get_int_value(left) + cl_get_int_value(right));
     }
 
-    return result;
+    CL_CHECK_FUNC_ARG_NUMERIC_TYPE(left_type);
+    CL_CHECK_FUNC_ARG_NUMERIC_TYPE(right_type);
+
+    return cl_make_double(cl_unwrap_numeric_to_double(left) + cl_unwrap_numeric_to_double(right));
+}
+
+CL_Object* cl_sub2(CL_Object* left, CL_Object* right) {
+    enum CL_ObjectType left_type = cl_get_obj_type(left);
+    enum CL_ObjectType right_type = cl_get_obj_type(right);
+
+    if (left_type == INTEGER && right_type == INTEGER) {
+        return cl_make_int(cl_get_int_value(left) - cl_get_int_value(right));
+    }
+
+    CL_CHECK_FUNC_ARG_NUMERIC_TYPE(left_type);
+    CL_CHECK_FUNC_ARG_NUMERIC_TYPE(right_type);
+
+    return cl_make_double(cl_unwrap_numeric_to_double(left) - cl_unwrap_numeric_to_double(right));
+}
+
+CL_Object* cl_mul2(CL_Object* left, CL_Object* right) {
+    enum CL_ObjectType left_type = cl_get_obj_type(left);
+    enum CL_ObjectType right_type = cl_get_obj_type(right);
+
+    if (left_type == INTEGER && right_type == INTEGER) {
+        return cl_make_int(cl_get_int_value(left) * cl_get_int_value(right));
+    }
+
+    CL_CHECK_FUNC_ARG_NUMERIC_TYPE(left_type);
+    CL_CHECK_FUNC_ARG_NUMERIC_TYPE(right_type);
+
+    double left_value = cl_unwrap_numeric_to_double(left);
+    double right_value = cl_unwrap_numeric_to_double(right);
+
+    // Product with zero is integer zero, as in cl_mul
+    if (left_value == 0 || right_value == 0) {
+        return cl_make_int(0);
+    }
+
+    return cl_make_double(left_value * right_value);
 }
@@ -8,3 +8,9 @@ CL_Object* cl_sub(CL_FUNC_PARAMS);
 CL_Object* cl_mul(CL_FUNC_PARAMS);
 
 CL_Object* cl_div(CL_FUNC_PARAMS);
+
+CL_Object* cl_add2(CL_Object* left, CL_Object* right);
+
+CL_Object* cl_sub2(CL_Object* left, CL_Object* right);
+
+CL_Object* cl_mul2(CL_Object* left, CL_Object* right);
@@ -17,22 +17,24 @@ static bool greater_or_equal_than(double a, double b) { return a >= b; }
 static bool less_than(double a, double b) { return a < b; }
 static bool less_or_equal_than(double a, double b) { return a <= b; }
 
-static CL_Object* numeric_comparison(CL_FUNC_PARAMS, const char* func_name, comparison_fn compare) {
-    cl_check_func_args_count(func_name, count, 2, EQUAL);
+static CL_Object* numeric_comparison2(CL_Object* left_term, CL_Object* right_term, const char* func_name, comparison_fn compare) {
+    enum CL_ObjectType left_type = cl_get_obj_type(left_term);
+    enum CL_ObjectType right_type = cl_get_obj_type(right_term);
 
-    CL_Object* left_term = args[0];
-    CL_Object* right_term = args[1];
+    if (left_type == INTEGER && right_type == INTEGER) {
+        return cl_make_boolean(compare(cl_get_int_value(left_term), cl_get_int_value(right_term)));
+    }
 
-    CL_CHECK_FUNC_ARG_NUMERIC_TYPE(cl_get_obj_type(left_term));
-    CL_CHECK_FUNC_ARG_NUMERIC_TYPE(cl_get_obj_type(right_term));
+    cl_check_func_arg_numeric_type(func_name, left_type);
+    cl_check_func_arg_numeric_type(func_name, right_type);
 
-    bool result = false;
+    return cl_make_boolean(compare(cl_unwrap_numeric_to_double(left_term), cl_unwrap_numeric_to_double(right_term)));
+}
 
-    if (compare(cl_unwrap_numeric_to_double(left_term), cl_unwrap_numeric_to_double(right_term))) {
-        result = true;
-    }
+static CL_Object* numeric_comparison(CL_FUNC_PARAMS, const char* func_name, comparison_fn compare) {
+    cl_check_func_args_count(func_name, count, 2, EQUAL);
 
-    return cl_make_boolean(result);
+    return numeric_comparison2(args[0], args[1], func_name, compare);
 }
 
 CL_Object* cl_greater(CL_FUNC_PARAMS) {
@@ -54,22 +56,46 @@ CL_Object* cl_less_or_equal(CL_FUNC_PARAMS) {
 CL_Object *cl_equal(CL_FUNC_PARAMS) {
     CL_CHECK_FUNC_ARGS_COUNT(count, 2, EQUAL);
 
-    CL_Object* left_term = args[0];
-    CL_Object* right_term = args[1];
+    return cl_equal2(args[0], args[1]);
+}
+
+CL_Object* cl_greater2(CL_Object* left, CL_Object* right) {
+    return numeric_comparison2(left, right, __func__, greater_than);
+}
+
+CL_Object* cl_greater_or_equal2(CL_Object* left, CL_Object* right) {
+    return numeric_comparison2(left, right, __func__, greater_or_equal_than);
+}
+
+CL_Object* cl_less2(CL_Object* left, CL_Object* right) {
+    return numeric_comparison2(left, right, __func__, less_than);
+}
+
+CL_Object* cl_less_or_equal2(CL_Object* left, CL_Object* right) {
+    return numeric_comparison2(left, right, __func__, less_or_equal_than);
+}
+
+CL_Object* cl_equal2(CL_Object* left_term, CL_Object* right_term) {
+    enum CL_ObjectType left_type = cl_get_obj_type(left_term);
+    enum CL_ObjectType right_type = cl_get_obj_type(right_term);
+
+    if (left_type == INTEGER && right_type == INTEGER) {
+        return cl_make_boolean(cl_get_int_value(left_term) == cl_get_int_value(right_term));
+    }
 
-    if (cl_is_numeric_internal(cl_get_obj_type(left_term)) && cl_is_numeric_internal(cl_get_obj_type(right_term))) {
+    if (cl_is_numeric_internal(left_type) && cl_is_numeric_internal(right_type)) {
         double left_double_value = cl_unwrap_numeric_to_double(left_term);
         double right_double_value = cl_unwrap_numeric_to_double(right_term);
         return cl_make_boolean(left_double_value == right_double_value);
     }
 
-    if (cl_get_obj_type(left_term) != cl_get_obj_type(right_term)) {
+    if (left_type != right_type) {
         return cl_make_false();
     }
 
     bool result = false;
 
-    switch (cl_get_obj_type(left_term)) {
+    switch (left_type) {
         case INTEGER:
             result = cl_get_int_value(left_term) == cl_get_int_value(right_term);
             break;
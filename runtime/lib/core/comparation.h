@@ -10,3 +10,13 @@ CL_Object* cl_greater_or_equal(CL_FUNC_PARAMS);
 CL_Object* cl_less_or_equal(CL_FUNC_PARAMS);
 
 CL_Object* cl_equal(CL_FUNC_PARAMS);
+
+CL_Object* cl_greater2(CL_Object* left, CL_Object* right);
+
+CL_Object* cl_less2(CL_Object* left, CL_Object* right);
+
+CL_Object* cl_greater_or_equal2(CL_Object* left, CL_Object* right);
+
+CL_Object* cl_less_or_equal2(CL_Object* left, CL_Object* right);
+
+CL_Object* cl_equal2(CL_Object* left, CL_Object* right);
@@ -1,37 +1,47 @@
 #include <assert.h>
 
 #include "core.h"
+#include "tags.h"
 #include "utils.h"
 
+#include "lib/memory/collector.h"
 #include "lib/objects/primitive.h"
+#include "lib/objects/cell.h"
 #include "lib/objects/evaluable.h"
 #include "lib/objects/lambda.h"
 #include "lib/objects/list.h"
 #include "lib/objects/pair.h"
 #include "lib/objects/vector.h"
-#include "lib/memory/memory.h"
 
 CL_Object* cl_make_unspecified() {
-    CL_Object* obj = cl_allocate_memory(sizeof(CL_Object));
-    cl_init_obj(obj, UNSPECIFIED);
-    return obj;
+    return CL_UNSPECIFIED;
 }
 
 void cl_init_obj(CL_Object* obj, enum CL_ObjectType type) {
     obj->type = type;
     obj->ref_count = 1;
+#ifdef CL_GC
+    cl_track_object(obj);
+#endif
 }
 
-void cl_inc_refs_cnt(CL_Object* obj) {
-    obj->ref_count++;
+bool cl_is_immortal(CL_Object* obj) {
+    return CL_IS_TAGGED(obj) || !obj->ref_count;
 }
 
-static void cl_destroy_unspecified(CL_Object* obj) {
-    cl_free_memory(obj);
+// Collector finds the unreachable objects by itself, so the references are counted only without it
+#ifndef CL_GC
+void cl_inc_refs_cnt(CL_Object* obj) {
+    // Values in the pointer and shared objects are referenced by many values at once, their count would overflow
+    if (cl_is_immortal(obj)) {
+        return;
+    }
+
+    obj->ref_count++;
 }
 
 void cl_dec_refs_cnt(CL_Object* obj) {
-    if (!obj || !obj->ref_count) {
+    if (!obj || cl_is_immortal(obj)) {
         return;
     }
 
@@ -46,15 +56,9 @@ void cl_dec_refs_cnt(CL_Object* obj) {
         case DOUBLE:
             cl_destroy_double(obj);
             break;
-        case BOOLEAN:
-            cl_destroy_boolean(obj);
-            break;
         case STRING:
             cl_destroy_string(obj);
             break;
-        case CHAR:
-            cl_destroy_char(obj);
-            break;
         case VECTOR:
             cl_destroy_vector(obj);
             break;
@@ -64,18 +68,16 @@ void cl_dec_refs_cnt(CL_Object* obj) {
         case LAMBDA:
             cl_destroy_lambda(obj);
             break;
-        case UNSPECIFIED:
-            cl_destroy_unspecified(obj);
-            break;
         case PAIR:
             cl_destroy_pair(obj);
             break;
-        case EMPTY_LIST:
-            cl_destroy_empty_list(obj);
+        case CELL:
+            cl_destroy_cell(obj);
             break;
         default: ;
     }
 }
+#endif
 
 char* get_obj_type_name(enum CL_ObjectType type) {
     switch(type) {
@@ -101,12 +103,30 @@ char* get_obj_type_name(enum CL_ObjectType type) {
             return "PAIR";
         case EMPTY_LIST:
             return "EMPTY_LIST";
+        case CELL:
+            return "CELL";
     }
     return "UNKNOWN";
 }
 
 enum CL_ObjectType cl_get_obj_type(CL_Object* obj) {
-    return obj->type;
+    if (!CL_IS_TAGGED(obj)) {
+        return obj->type;
+    }
+
+    if (CL_IS_FIXNUM(obj)) {
+        return INTEGER;
+    }
+
+    if (CL_IS_CHAR(obj)) {
+        return CHAR;
+    }
+
+    if (obj == CL_EMPTY_LIST) {
+        return EMPTY_LIST;
+    }
+
+    return obj == CL_UNSPECIFIED ? UNSPECIFIED : BOOLEAN;
 }
 
 bool cl_is_numeric_internal(enum CL_ObjectType type) {
@@ -14,6 +14,7 @@ enum CL_ObjectType {
     UNSPECIFIED,
     PAIR,
     EMPTY_LIST,
+    CELL,
 };
 
 char* get_obj_type_name(enum CL_ObjectType type);
@@ -32,9 +33,17 @@ enum CL_ObjectType cl_get_obj_type(CL_Object* obj);
 
 void cl_init_obj(CL_Object* obj, enum CL_ObjectType type);
 
+bool cl_is_immortal(CL_Object* obj);
+
+#ifdef CL_GC
+#define cl_inc_refs_cnt(obj) ((void)(obj))
+
+#define cl_dec_refs_cnt(obj) ((void)(obj))
+#else
 void cl_inc_refs_cnt(CL_Object* obj);
 
 void cl_dec_refs_cnt(CL_Object* obj);
+#endif
 
 CL_Object* cl_make_unspecified();
 
@@ -2,6 +2,8 @@
 
 #include <limits.h>
 #include <math.h>
+#include <stdint.h>
+#include <stdlib.h>
 #include <string.h>
 
 #include "arithmetic.h"
@@ -10,8 +12,10 @@
 #include "io.h"
 #include "logic.h"
 
+#include "lib/memory/collector.h"
 #include "lib/memory/memory.h"
 #include "lib/exit/abort.h"
+#include "lib/objects/cell.h"
 #include "lib/objects/lambda.h"
 #include "lib/objects/list.h"
 #include "lib/objects/pair.h"
@@ -20,11 +24,19 @@
 #define BASIC_CAPACITY 4
 #define CAPACITY_MULTIPLIER 1.5
 
+// Variables of the bigger environments (the global one) are found by names through the hash index
+#define INDEX_THRESHOLD 16
+#define INDEX_BASIC_CAPACITY 32
+
+// Environments on the stack aren't registered, so they don't have a slot
+#define STACK_ENV_SLOT SIZE_MAX
+
 typedef struct NamedFunc {
     const char* name;
     cl_func func;
 } NamedFunc;
 
+// Functions take the first slots of the global environment in this order, it's the order of the API functions in the symbols of the translator
 static const NamedFunc reserved[] = {
     {"display", cl_display},
     {"+", cl_add},
@@ -42,8 +54,8 @@ static const NamedFunc reserved[] = {
     {"cdr", cl_get_pair_right},
     {"length", cl_list_length},
     {"list-ref", cl_list_at},
-    {"set-car!", cl_set_pair_left},
     {"set-cdr!", cl_set_pair_right},
+    {"set-car!", cl_set_pair_left},
     {"list?", cl_is_list},
     {"cons", cl_make_pair},
     {"pair?", cl_is_pair},
@@ -67,26 +79,156 @@ static const NamedFunc reserved[] = {
 #define RESERVED_COUNT sizeof(reserved) / sizeof(NamedFunc)
 
 static CL_DynamicArray* reachable_envs = NULL;
+static CL_Environment* global_env = NULL;
+#ifndef CL_GC
+static bool destroying_all = false;
+#endif
+
+// Every environment knows its slot in the registry, so it's registered and unregistered in constant time
+static void register_env(CL_Environment* env) {
+    env->registry_slot = cl_da_size(reachable_envs);
+    cl_da_append(reachable_envs, env);
+}
+
+static void unregister_env(CL_Environment* env) {
+    const size_t slot = env->registry_slot;
+    cl_da_swap_remove_at(reachable_envs, slot);
+    if (slot < cl_da_size(reachable_envs)) {
+        CL_Environment* moved = cl_da_get(reachable_envs, slot);
+        moved->registry_slot = slot;
+    }
+}
 
 static CL_Environment* make_environment(CL_Environment* parent, size_t capacity) {
-    CL_Environment* env = cl_allocate_memory(sizeof(CL_Environment));
+    if (!capacity) {
+        capacity = 1;
+    }
+
+    CL_Environment* env = cl_allocate_object_memory(sizeof(CL_Environment));
     env->parent = parent;
+    if (parent) {
+        cl_inc_env_refs_cnt(parent);
+    }
     env->capacity = capacity;
     env->variables_count = 0;
     env->ref_count = 1;
-    env->variables = cl_allocate_memory(sizeof(CL_Variable) * capacity);
-    cl_da_append(reachable_envs, env);
+    env->variables = cl_allocate_object_memory(sizeof(CL_Variable) * capacity);
+    env->index = NULL;
+    env->index_capacity = 0;
+    register_env(env);
     return env;
 }
 
+static void free_environment(CL_Environment* env) {
+    cl_free_memory(env->index);
+    cl_free_object_memory(env->variables, sizeof(CL_Variable) * env->capacity);
+    cl_free_object_memory(env, sizeof(CL_Environment));
+}
+
+static size_t hash_name(const char* name) {
+    // FNV-1a
+    size_t hash = 14695981039346656037ULL;
+    for (; *name; name++) {
+        hash = (hash ^ (unsigned char)*name) * 1099511628211ULL;
+    }
+    return hash;
+}
+
+static bool is_same_name(const char* key, const char* name) {
+    // Names are string literals of the generated code, so the same name is usually the same pointer
+    return key == name || (key && !strcmp(key, name));
+}
+
+static void index_variable(CL_Environment* env, size_t slot) {
+    size_t mask = env->index_capacity - 1;
+    size_t i = hash_name(env->variables[slot].key) & mask;
+
+    // Index has slots + 1, so zero is the empty entry
+    while (env->index[i]) {
+        if (env->index[i] - 1 == slot) {
+            return;
+        }
+        i = (i + 1) & mask;
+    }
+
+    env->index[i] = slot + 1;
+}
+
+static void build_index(CL_Environment* env) {
+    size_t capacity = INDEX_BASIC_CAPACITY;
+    while (capacity < env->variables_count * 2) {
+        capacity *= 2;
+    }
+
+    cl_free_memory(env->index);
+    env->index = cl_allocate_memory(sizeof(size_t) * capacity);
+    memset(env->index, 0, sizeof(size_t) * capacity);
+    env->index_capacity = capacity;
+
+    for (size_t i = 0; i < env->variables_count; i++) {
+        if (env->variables[i].key) {
+            index_variable(env, i);
+        }
+    }
+}
+
+static void name_variable(CL_Environment* env, size_t slot, const char* name) {
+    CL_Variable* var = &env->variables[slot];
+    if (var->key == name) {
+        return;
+    }
+
+    var->key = name;
+
+    if (!env->index) {
+        return;
+    }
+
+    // Load factor of the index is kept below a half
+    if (env->variables_count * 2 > env->index_capacity) {
+        build_index(env);
+    } else {
+        index_variable(env, slot);
+    }
+}
+
+static CL_Variable* find_own_variable(CL_Environment* env, const char* name) {
+    if (!env->index && env->variables_count > INDEX_THRESHOLD) {
+        build_index(env);
+    }
+
+    if (!env->index) {
+        for (size_t i = 0; i < env->variables_count; i++) {
+            if (is_same_name(env->variables[i].key, name)) {
+                return &env->variables[i];
+            }
+        }
+        return NULL;
+    }
+
+    size_t mask = env->index_capacity - 1;
+    for (size_t i = hash_name(name) & mask; env->index[i]; i = (i + 1) & mask) {
+        CL_Variable* var = &env->variables[env->index[i] - 1];
+        if (is_same_name(var->key, name)) {
+            return var;
+        }
+    }
+    return NULL;
+}
+
+#ifndef CL_GC
 static void destroy_env(CL_Environment* env) {
+    CL_Environment* parent = env->parent;
+
     for (size_t i = 0; i < env->variables_count; i++) {
         cl_dec_refs_cnt(env->variables[i].val);
     }
-    cl_free_memory(env->variables);
-    cl_da_remove(reachable_envs, env);
-    cl_free_memory(env);
+    unregister_env(env);
+    free_environment(env);
+
+    cl_dec_env_refs_cnt(parent);
 }
+#endif
 
 CL_Environment* cl_make_env(CL_Environment* parent) {
     return make_environment(parent, BASIC_CAPACITY);
@@ -96,16 +238,48 @@ CL_Environment* cl_make_env_capacity(CL_Environment* parent, size_t capacity) {
     return make_environment(parent, capacity);
 }
 
+CL_Environment* cl_init_stack_env(CL_Environment* env, CL_Environment* parent, size_t capacity, CL_Variable* variables) {
+    // Environment on the stack doesn't outlive its parent and isn't captured, so it's neither counted nor registered
+    env->parent = parent;
+    env->capacity = capacity;
+    env->variables_count = 0;
+    env->ref_count = 1;
+    env->variables = variables;
+    env->index = NULL;
+    env->index_capacity = 0;
+    env->registry_slot = STACK_ENV_SLOT;
+    return env;
+}
+
+void cl_release_stack_env(CL_Environment* env) {
+    for (size_t i = 0; i < env->variables_count; i++) {
+        cl_dec_refs_cnt(env->variables[i].val);
+    }
+    cl_free_memory(env->index);
+}
+
+#ifdef CL_GC
+bool cl_is_stack_env(CL_Environment* env) {
+    return env->registry_slot == STACK_ENV_SLOT;
+}
+
+// The collector has found the environment unreachable, its values are freed by the collector too
+void cl_free_env(CL_Environment* env) {
+    unregister_env(env);
+    free_environment(env);
+}
+#else
 void cl_inc_env_refs_cnt(CL_Environment* env) {
     env->ref_count++;
 }
 
 void cl_dec_env_refs_cnt(CL_Environment* env) {
-    if (!env || --env->ref_count > 0) {
+    if (!env || --env->ref_count > 0 || destroying_all) {
         return;
     }
     destroy_env(env);
 }
+#endif
 
 void cl_set_variable_value(CL_Environment* env, char* name, CL_Object* value) {
     if (!env) {
@@ -115,22 +289,22 @@ void cl_set_variable_value(CL_Environment* env, char* name, CL_Object* value) {
 
     cl_inc_refs_cnt(value);
 
-    for (size_t i = 0; i < env->variables_count; i++) {
-        CL_Variable* var = &env->variables[i];
-        if (!strcmp(name, var->key)) {
-            cl_dec_refs_cnt(var->val);
-            var->val = value;
-            return;
-        }
+    CL_Variable* var = find_own_variable(env, name);
+    if (var) {
+        cl_dec_refs_cnt(var->val);
+        var->val = value;
+        return;
     }
 
     if (env->variables_count >= env->capacity) {
+        size_t old_capacity = env->capacity;
         env->capacity = (int)ceil((double)env->capacity * CAPACITY_MULTIPLIER);
-        env->variables = cl_reallocate_memory(env->variables, sizeof(CL_Variable) * env->capacity);
+        env->variables = cl_reallocate_object_memory(env->variables, sizeof(CL_Variable) * old_capacity, sizeof(CL_Variable) * env->capacity);
     }
 
-    CL_Variable var = {name, value};
-    env->variables[env->variables_count++] = var;
+    CL_Variable empty = {NULL, value};
+    env->variables[env->variables_count++] = empty;
+    name_variable(env, env->variables_count - 1, name);
 }
 
 CL_Object* cl_update_variable_value(CL_Environment* env, char* name, CL_Object* value) {
@@ -141,18 +315,13 @@ CL_Object* cl_update_variable_value(CL_Environment* env, char* name, CL_Object*
 
     cl_inc_refs_cnt(value);
 
-    CL_Environment* curr_env = env;
-    while (curr_env) {
-        for (size_t i = 0; i < curr_env->variables_count; i++) {
-            CL_Variable* var = &curr_env->variables[i];
-            if (!strcmp(name, var->key)) {
-                cl_dec_refs_cnt(var->val);
-                var->val = value;
-                return cl_make_unspecified();
-            }
+    for (CL_Environment* curr_env = env; curr_env; curr_env = curr_env->parent) {
+        CL_Variable* var = find_own_variable(curr_env, name);
+        if (var) {
+            cl_dec_refs_cnt(var->val);
+            var->val = value;
+            return cl_make_unspecified();
         }
-
-        curr_env = curr_env->parent;
     }
 
     cl_abort("No value in environment!\n");
@@ -160,66 +329,244 @@ CL_Object* cl_update_variable_value(CL_Environment* env, char* name, CL_Object*
 }
 
 CL_Object* cl_get_variable_value(CL_Environment* env, char* name) {
-    CL_Environment* curr_env = env;
-
-    while (curr_env) {
-        for (size_t i = 0; i < curr_env->variables_count; i++) {
-            if (!strcmp(name, curr_env->variables[i].key)) {
-                return curr_env->variables[i].val;
-            }
+    for (CL_Environment* curr_env = env; curr_env; curr_env = curr_env->parent) {
+        CL_Variable* var = find_own_variable(curr_env, name);
+        if (var) {
+            return var->val;
         }
-
-        curr_env = curr_env->parent;
     }
 
     cl_abort("No value in environment!\n");
     __builtin_unreachable();
 }
 
+static CL_Variable* get_defined_variable(CL_Environment* env, size_t depth, size_t slot) {
+    for (; depth > 0; depth--) {
+        env = env->parent;
+    }
+
+    if (slot >= env->variables_count || !env->variables[slot].val) {
+        cl_abort("No value in environment!\n");
+        __builtin_unreachable();
+    }
+
+    return &env->variables[slot];
+}
+
+void cl_set_variable_value_at(CL_Environment* env, size_t slot, char* name, CL_Object* value) {
+    cl_inc_refs_cnt(value);
+    cl_set_variable_value_at_move(env, slot, name, value);
+}
+
+static CL_Variable* reserve_variable(CL_Environment* env, size_t slot) {
+    if (!env) {
+        cl_abort("Environment is NULL!\n");
+        __builtin_unreachable();
+    }
+
+    if (slot >= env->capacity) {
+        size_t old_capacity = env->capacity;
+        env->capacity = slot + 1;
+        env->variables = cl_reallocate_object_memory(env->variables, sizeof(CL_Variable) * old_capacity, sizeof(CL_Variable) * env->capacity);
+    }
+
+    // Slots before the defined one stay empty until their variables are defined
+    while (env->variables_count <= slot) {
+        CL_Variable empty = {NULL, NULL};
+        env->variables[env->variables_count++] = empty;
+    }
+
+    return &env->variables[slot];
+}
+
+void cl_set_variable_value_at_move(CL_Environment* env, size_t slot, char* name, CL_Object* value) {
+    CL_Variable* var = reserve_variable(env, slot);
+    cl_dec_refs_cnt(var->val);
+    var->val = value;
+    name_variable(env, slot, name);
+}
+
+CL_Object* cl_update_variable_value_at(CL_Environment* env, size_t depth, size_t slot, CL_Object* value) {
+    cl_inc_refs_cnt(value);
+    return cl_update_variable_value_at_move(env, depth, slot, value);
+}
+
+CL_Object* cl_update_variable_value_at_move(CL_Environment* env, size_t depth, size_t slot, CL_Object* value) {
+    CL_Variable* var = get_defined_variable(env, depth, slot);
+    cl_dec_refs_cnt(var->val);
+    var->val = value;
+    return cl_make_unspecified();
+}
+
+CL_Object* cl_get_variable_value_at(CL_Environment* env, size_t depth, size_t slot) {
+    return get_defined_variable(env, depth, slot)->val;
+}
+
+CL_Object* cl_get_variable_cell_at(CL_Environment* env, size_t depth, size_t slot) {
+    for (; depth > 0; depth--) {
+        env = env->parent;
+    }
+
+    // Closure can capture the variable before its definition (recursive functions), so the empty cell is created for it
+    CL_Variable* var = reserve_variable(env, slot);
+    if (!var->val) {
+        var->val = cl_make_cell(NULL);
+    }
+
+    return var->val;
+}
+
+void cl_set_cell_variable_value_at(CL_Environment* env, size_t slot, char* name, CL_Object* value) {
+    cl_inc_refs_cnt(value);
+    cl_set_cell_variable_value_at_move(env, slot, name, value);
+}
+
+void cl_set_cell_variable_value_at_move(CL_Environment* env, size_t slot, char* name, CL_Object* value) {
+    CL_Variable* var = reserve_variable(env, slot);
+    name_variable(env, slot, name);
+
+    if (var->val) {
+        cl_set_cell_value_move(var->val, value);
+    } else {
+        var->val = cl_make_cell(value);
+    }
+}
+
+static CL_Object* get_defined_cell(CL_Environment* env, size_t depth, size_t slot) {
+    CL_Object* cell = get_defined_variable(env, depth, slot)->val;
+
+    if (!cl_get_cell_value(cell)) {
+        cl_abort("No value in environment!\n");
+        __builtin_unreachable();
+    }
+
+    return cell;
+}
+
+CL_Object* cl_update_cell_variable_value_at(CL_Environment* env, size_t depth, size_t slot, CL_Object* value) {
+    cl_inc_refs_cnt(value);
+    return cl_update_cell_variable_value_at_move(env, depth, slot, value);
+}
+
+CL_Object* cl_update_cell_variable_value_at_move(CL_Environment* env, size_t depth, size_t slot, CL_Object* value) {
+    cl_set_cell_value_move(get_defined_cell(env, depth, slot), value);
+    return cl_make_unspecified();
+}
+
+CL_Object* cl_get_cell_variable_value_at(CL_Environment* env, size_t depth, size_t slot) {
+    return cl_get_cell_value(get_defined_cell(env, depth, slot));
+}
+
+CL_Environment* cl_make_closure_env(size_t count, CL_Object** values) {
+    // Closure without captured variables accesses only the global variables
+    if (!count) {
+        cl_inc_env_refs_cnt(global_env);
+        return global_env;
+    }
+
+    CL_Environment* env = make_environment(global_env, count);
+    for (size_t i = 0; i < count; i++) {
+        cl_inc_refs_cnt(values[i]);
+        CL_Variable var = {NULL, values[i]};
+        env->variables[env->variables_count++] = var;
+    }
+
+    return env;
+}
+
 static void set_reserved_variable(CL_Environment* env, const char* name, CL_Object* value) {
-    CL_Variable var = {name, value};
+    CL_Variable var = {NULL, value};
     env->variables[env->variables_count++] = var;
+    name_variable(env, env->variables_count - 1, name);
 }
 
-CL_Environment* cl_make_global_env() {
+CL_Environment* cl_make_global_env(size_t capacity) {
     reachable_envs = cl_da_create(BASIC_CAPACITY);
+#ifdef CL_GC
+    cl_init_collector(reachable_envs);
+#endif
 
-    CL_Environment* env = cl_make_env_capacity(NULL, RESERVED_COUNT);
+    CL_Environment* env = cl_make_env_capacity(NULL, capacity > RESERVED_COUNT ? capacity : RESERVED_COUNT);
     for (size_t i = 0; i < RESERVED_COUNT; i++) {
         set_reserved_variable(env, reserved[i].name, cl_make_lambda_without_env(reserved[i].func));
     }
 
+    global_env = env;
     return env;
 }
 
 void cl_destroy_global_env(CL_Environment* env) {
     if (env) {}
-    while (cl_da_size(reachable_envs) > 0) {
-        CL_Environment* environment = cl_da_get(reachable_envs, 0);
-        // Destroying lambdas will decrease env refs => they provoke redestroy of env.
-        environment->ref_count = environment->variables_count + 1;
-        destroy_env(cl_da_get(reachable_envs, 0));
+
+    if (getenv("CLISP_MEMORY_STATS")) {
+        cl_print_memory_stats(stderr);
+#ifdef CL_GC
+        cl_print_collector_stats(stderr);
+#endif
+    }
+
+    // Memory of the process is freed by the system anyway, the teardown is needed only to check the leaks
+    if (getenv("CLISP_FAST_EXIT")) {
+        return;
+    }
+
+#ifdef CL_GC
+    cl_release_tracked_objects();
+#else
+    // Values are released before any environment is freed: destroying lambdas decreases refs of the environments, that may be already released
+    destroying_all = true;
+    for (size_t i = 0; i < cl_da_size(reachable_envs); i++) {
+        CL_Environment* environment = cl_da_get(reachable_envs, i);
+        for (size_t j = 0; j < environment->variables_count; j++) {
+            CL_Object* value = environment->variables[j].val;
+            environment->variables[j].val = NULL;
+            cl_dec_refs_cnt(value);
+        }
+    }
+#endif
+
+    for (size_t i = 0; i < cl_da_size(reachable_envs); i++) {
+        free_environment(cl_da_get(reachable_envs, i));
     }
     cl_da_destroy(reachable_envs);
+    global_env = NULL;
+
+    // Nothing is alive after the global environment, so the pages of the objects are released at once
+    cl_release_object_memory();
 }
 
 CL_Environment* cl_move_env(CL_Environment* env) {
-    CL_Environment* new = cl_allocate_memory(sizeof(CL_Environment));
+    CL_Environment* new = cl_allocate_object_memory(sizeof(CL_Environment));
     new->variables_count = env->variables_count;
     new->capacity = env->capacity;
     new->ref_count = 1;
+    new->index = NULL;
+    new->index_capacity = 0;
     new->parent = env->parent;
-    cl_da_append(reachable_envs, new);
-
-    if (new->variables_count) {
-        new->variables = cl_allocate_memory(sizeof(CL_Variable) * new->variables_count);
-        memcpy(new->variables, env->variables, sizeof(CL_Variable) * new->variables_count);
-    } else {
-        new->variables = cl_allocate_memory(sizeof(CL_Variable) * BASIC_CAPACITY);
+    if (new->parent) {
+        cl_inc_env_refs_cnt(new->parent);
     }
+    register_env(new);
+
+    new->variables = cl_allocate_object_memory(sizeof(CL_Variable) * new->capacity);
+    memcpy(new->variables, env->variables, sizeof(CL_Variable) * new->variables_count);
 
     for (size_t i = 0; i < new->variables_count; i++) {
-        cl_inc_refs_cnt(new->variables[i].val);
+        CL_Object* value = new->variables[i].val;
+        if (!value) {
+            continue;
+        }
+
+        // Copy has new bindings, so closures of the previous iteration keep their cells
+        if (cl_get_obj_type(value) == CELL) {
+            CL_Object* cell_value = cl_get_cell_value(value);
+            if (cell_value) {
+                cl_inc_refs_cnt(cell_value);
+            }
+            new->variables[i].val = cl_make_cell(cell_value);
+        } else {
+            cl_inc_refs_cnt(value);
+        }
     }
 
     cl_dec_env_refs_cnt(env);
@@ -12,16 +12,33 @@ typedef struct Environment {
     CL_Variable* variables;
     size_t variables_count;
     size_t capacity;
-    unsigned short ref_count;
+    size_t ref_count;
+    size_t* index;
+    size_t index_capacity;
+    size_t registry_slot;
 } CL_Environment;
 
 CL_Environment* cl_make_env(CL_Environment* parent);
 
 CL_Environment* cl_make_env_capacity(CL_Environment* parent, size_t capacity);
 
+CL_Environment* cl_init_stack_env(CL_Environment* env, CL_Environment* parent, size_t capacity, CL_Variable* variables);
+
+void cl_release_stack_env(CL_Environment* env);
+
+#ifdef CL_GC
+#define cl_inc_env_refs_cnt(env) ((void)(env))
+
+#define cl_dec_env_refs_cnt(env) ((void)(env))
+
+bool cl_is_stack_env(CL_Environment* env);
+
+void cl_free_env(CL_Environment* env);
+#else
 void cl_inc_env_refs_cnt(CL_Environment* env);
 
 void cl_dec_env_refs_cnt(CL_Environment* env);
+#endif
 
 void cl_set_variable_value(CL_Environment* env, char* name, CL_Object* value);
 
@@ -29,7 +46,31 @@ CL_Object* cl_update_variable_value(CL_Environment* env, char* name, CL_Object*
 
 CL_Object* cl_get_variable_value(CL_Environment* env, char* name);
 
-CL_Environment* cl_make_global_env();
+void cl_set_variable_value_at(CL_Environment* env, size_t slot, char* name, CL_Object* value);
+
+void cl_set_variable_value_at_move(CL_Environment* env, size_t slot, char* name, CL_Object* value);
+
+CL_Object* cl_update_variable_value_at(CL_Environment* env, size_t depth, size_t slot, CL_Object* value);
+
+CL_Object* cl_update_variable_value_at_move(CL_Environment* env, size_t depth, size_t slot, CL_Object* value);
+
+CL_Object* cl_get_variable_value_at(CL_Environment* env, size_t depth, size_t slot);
+
+CL_Object* cl_get_variable_cell_at(CL_Environment* env, size_t depth, size_t slot);
+
+void cl_set_cell_variable_value_at(CL_Environment* env, size_t slot, char* name, CL_Object* value);
+
+void cl_set_cell_variable_value_at_move(CL_Environment* env, size_t slot, char* name, CL_Object* value);
+
+CL_Object* cl_update_cell_variable_value_at(CL_Environment* env, size_t depth, size_t slot, CL_Object* value);
+
+CL_Object* cl_update_cell_variable_value_at_move(CL_Environment* env, size_t depth, size_t slot, CL_Object* value);
+
+CL_Object* cl_get_cell_variable_value_at(CL_Environment* env, size_t depth, size_t slot);
+
+CL_Environment* cl_make_closure_env(size_t count, CL_Object** values);
+
+CL_Environment* cl_make_global_env(size_t capacity);
 
 void cl_destroy_global_env(CL_Environment* env);
 
@@ -82,6 +82,9 @@ static void display_one_object(CL_Object* obj) {
         case EVALUABLE:
             printf("Promise(%p)", (void*)to_display);
             break;
+        case CELL:
+            printf("Cell(%p)", (void*)to_display);
+            break;
     }
 }
 
@@ -160,7 +160,7 @@ CL_Object* cl_call_native(CL_NativeData* data, CL_FUNC_PARAMS) {
 
     void* variables[count];
     for (size_t i = 0; i < count; i++) {
-        switch (args[i]->type) {
+        switch (cl_get_obj_type(args[i])) {
             HANDLE_OBJ(INTEGER, CL_NATIVE_INTEGER, int, cl_get_int_value)
             HANDLE_OBJ(DOUBLE, CL_NATIVE_DOUBLE, double, cl_get_double_value)
             HANDLE_OBJ(CHAR, CL_NATIVE_CHAR, char, cl_get_char_value)
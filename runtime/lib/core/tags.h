@@ -0,0 +1,28 @@
+#pragma once
+#include <stdint.h>
+
+#include "core.h"
+
+#define CL_TAG_MASK ((uintptr_t)7)
+#define CL_TAG_SHIFT 3
+#define CL_FIXNUM_TAG ((uintptr_t)1)
+#define CL_CHAR_TAG ((uintptr_t)2)
+#define CL_CONSTANT_TAG ((uintptr_t)4)
+
+#define CL_IS_TAGGED(obj) (((uintptr_t)(obj) & CL_TAG_MASK) != 0)
+#define CL_IS_FIXNUM(obj) (((uintptr_t)(obj) & CL_FIXNUM_TAG) != 0)
+#define CL_IS_CHAR(obj) (((uintptr_t)(obj) & CL_TAG_MASK) == CL_CHAR_TAG)
+
+#define CL_FIXNUM_MIN (INTPTR_MIN >> 1)
+#define CL_FIXNUM_MAX (INTPTR_MAX >> 1)
+#define CL_MAKE_FIXNUM(value) ((CL_Object*)(((uintptr_t)(intptr_t)(value) << 1) | CL_FIXNUM_TAG))
+#define CL_FIXNUM_VALUE(obj) ((int)((intptr_t)(obj) >> 1))
+
+#define CL_MAKE_CHAR(value) ((CL_Object*)(((uintptr_t)(unsigned char)(value) << CL_TAG_SHIFT) | CL_CHAR_TAG))
+#define CL_CHAR_VALUE(obj) ((char)(unsigned char)((uintptr_t)(obj) >> CL_TAG_SHIFT))
+
+#define CL_MAKE_CONSTANT(number) ((CL_Object*)(((uintptr_t)(number) << CL_TAG_SHIFT) | CL_CONSTANT_TAG))
+#define CL_FALSE CL_MAKE_CONSTANT(0)
+#define CL_TRUE CL_MAKE_CONSTANT(1)
+#define CL_EMPTY_LIST CL_MAKE_CONSTANT(2)
+#define CL_UNSPECIFIED CL_MAKE_CONSTANT(3)
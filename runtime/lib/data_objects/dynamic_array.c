@@ -61,6 +61,15 @@ void cl_da_remove_at(CL_DynamicArray *da, size_t index) {
     da->size--;
 }
 
+// Removal doesn't keep the order: the last element takes the place of the removed one
+void cl_da_swap_remove_at(CL_DynamicArray *da, size_t index) {
+    if (index >= da->size) {
+        cl_abort("Index out of dynamic array size");
+    }
+
+    da->data[index] = da->data[--da->size];
+}
+
 void* cl_da_get(CL_DynamicArray *da, size_t index) {
     if (index >= da->size) {
         cl_abort("Index out of dynamic array size");
@@ -0,0 +1,255 @@
+#include "collector.h"
+
+#ifdef CL_GC
+#include "memory.h"
+
+#include "lib/core/tags.h"
+#include "lib/objects/cell.h"
+#include "lib/objects/evaluable.h"
+#include "lib/objects/lambda.h"
+#include "lib/objects/pair.h"
+#include "lib/objects/primitive.h"
+#include "lib/objects/vector.h"
+
+#define BASIC_CAPACITY 1024
+#define COLLECTION_MIN_THRESHOLD 100000
+
+// Reference counters aren't used by the collector, so they keep the marks: 0 is still the immortal object
+#define WHITE 1
+#define BLACK 2
+
+CL_RootFrame* cl_roots_top = NULL;
+
+static CL_DynamicArray* envs = NULL;
+static CL_DynamicArray* objects = NULL;
+static CL_DynamicArray* gray_objects = NULL;
+static CL_DynamicArray* gray_envs = NULL;
+static size_t collection_threshold = COLLECTION_MIN_THRESHOLD;
+static CL_CollectorStats stats;
+
+void cl_init_collector(CL_DynamicArray* registry) {
+    envs = registry;
+}
+
+void cl_track_object(CL_Object* obj) {
+    if (!objects) {
+        objects = cl_da_create(BASIC_CAPACITY);
+        gray_objects = cl_da_create(BASIC_CAPACITY);
+        gray_envs = cl_da_create(BASIC_CAPACITY);
+    }
+
+    cl_da_append(objects, obj);
+}
+
+static void mark_object(CL_Object* obj) {
+    if (!obj || CL_IS_TAGGED(obj) || obj->ref_count != WHITE) {
+        return;
+    }
+
+    obj->ref_count = BLACK;
+    cl_da_append(gray_objects, obj);
+}
+
+static void mark_env(CL_Environment* env) {
+    if (!env) {
+        return;
+    }
+
+    // Environment on the stack is referenced only by the frames of its call, so it's scanned without the mark
+    if (!cl_is_stack_env(env)) {
+        if (env->ref_count != WHITE) {
+            return;
+        }
+        env->ref_count = BLACK;
+    }
+
+    cl_da_append(gray_envs, env);
+}
+
+static void scan_object(CL_Object* obj) {
+    switch (obj->type) {
+        case PAIR:
+            mark_object(cl_get_pair_left_internal(obj));
+            mark_object(cl_get_pair_right_internal(obj));
+            break;
+        case VECTOR:
+            for (size_t i = 0; i < cl_vector_length(obj); i++) {
+                mark_object(cl_vector_at(obj, i));
+            }
+            break;
+        case CELL:
+            mark_object(cl_get_cell_value(obj));
+            break;
+        case LAMBDA: {
+            const CL_LambdaObject* lambda_object = (CL_LambdaObject*)obj;
+            if (lambda_object->lambda_type == USER) {
+                mark_env(((CL_LambdaUserObject*)obj)->environment);
+            }
+            break;
+        }
+        case EVALUABLE: {
+            // Environment is released by the evaluation, so only the promise that wasn't forced holds it
+            const CL_EvaluableObject* evaluable_object = (CL_EvaluableObject*)obj;
+            if (evaluable_object->result) {
+                mark_object(evaluable_object->result);
+            } else {
+                mark_env(evaluable_object->environment);
+            }
+            break;
+        }
+        default: ;
+    }
+}
+
+static void scan_env(CL_Environment* env) {
+    mark_env(env->parent);
+    for (size_t i = 0; i < env->variables_count; i++) {
+        mark_object(env->variables[i].val);
+    }
+}
+
+static void mark_roots() {
+    for (const CL_RootFrame* frame = cl_roots_top; frame; frame = frame->prev) {
+        for (size_t i = 0; i < frame->objects_count; i++) {
+            mark_object(frame->objects[i]);
+        }
+        for (size_t i = 0; i < frame->envs_count; i++) {
+            mark_env(frame->envs[i]);
+        }
+    }
+
+    // Marking is iterative, so long lists and deep chains of environments don't overflow the C-stack
+    while (cl_da_size(gray_objects) || cl_da_size(gray_envs)) {
+        while (cl_da_size(gray_objects)) {
+            CL_Object* obj = cl_da_get(gray_objects, cl_da_size(gray_objects) - 1);
+            cl_da_pop(gray_objects);
+            scan_object(obj);
+        }
+        while (cl_da_size(gray_envs)) {
+            CL_Environment* env = cl_da_get(gray_envs, cl_da_size(gray_envs) - 1);
+            cl_da_pop(gray_envs);
+            scan_env(env);
+        }
+    }
+}
+
+static void destroy_object(CL_Object* obj) {
+    // Destructors only free the memory: references aren't counted, so they don't release the children
+    switch (obj->type) {
+        case INTEGER:
+            cl_destroy_int(obj);
+            break;
+        case DOUBLE:
+            cl_destroy_double(obj);
+            break;
+        case STRING:
+            cl_destroy_string(obj);
+            break;
+        case VECTOR:
+            cl_destroy_vector(obj);
+            break;
+        case EVALUABLE:
+            cl_destroy_evaluable(obj);
+            break;
+        case LAMBDA:
+            cl_destroy_lambda(obj);
+            break;
+        case PAIR:
+            // cl_destroy_pair follows the tail of the list, that may be alive
+            cl_free_object_memory(obj, sizeof(CL_PairObject));
+            break;
+        case CELL:
+            cl_destroy_cell(obj);
+            break;
+        default: ;
+    }
+}
+
+static void sweep_objects() {
+    size_t alive = 0;
+    for (size_t i = 0; i < cl_da_size(objects); i++) {
+        CL_Object* obj = objects->data[i];
+        if (obj->ref_count == BLACK) {
+            obj->ref_count = WHITE;
+            objects->data[alive++] = obj;
+        } else {
+            destroy_object(obj);
+            stats.reclaimed_objects++;
+        }
+    }
+    objects->size = alive;
+}
+
+static void sweep_envs() {
+    // Freed environment is replaced by the last one in the registry, so the registry is swept from the end
+    for (size_t i = cl_da_size(envs); i-- > 0;) {
+        CL_Environment* env = cl_da_get(envs, i);
+        if (env->ref_count == BLACK) {
+            env->ref_count = WHITE;
+        } else {
+            cl_free_env(env);
+            stats.reclaimed_envs++;
+        }
+    }
+}
+
+void cl_collect_garbage() {
+    if (!objects || !envs) {
+        return;
+    }
+
+    mark_roots();
+    sweep_objects();
+    sweep_envs();
+    stats.collections++;
+}
+
+static size_t count_tracked() {
+    return (objects ? cl_da_size(objects) : 0) + (envs ? cl_da_size(envs) : 0);
+}
+
+// The translator puts the safe points where every live value is in the roots: at the entries of the functions and the iterations of the loops
+void cl_safe_point() {
+    if (count_tracked() < collection_threshold) {
+        return;
+    }
+
+    cl_collect_garbage();
+
+    // Next collection waits until the heap doubles, so surviving values aren't traced too often
+    const size_t survived = count_tracked() * 2;
+    collection_threshold = survived > COLLECTION_MIN_THRESHOLD ? survived : COLLECTION_MIN_THRESHOLD;
+}
+
+void cl_release_tracked_objects() {
+    if (!objects) {
+        return;
+    }
+
+    for (size_t i = 0; i < cl_da_size(objects); i++) {
+        destroy_object(objects->data[i]);
+    }
+
+    cl_da_destroy(objects);
+    cl_da_destroy(gray_objects);
+    cl_da_destroy(gray_envs);
+    objects = NULL;
+    gray_objects = NULL;
+    gray_envs = NULL;
+    envs = NULL;
+}
+
+CL_CollectorStats cl_get_collector_stats() {
+    return stats;
+}
+
+void cl_print_collector_stats(FILE* stream) {
+    fprintf(
+        stream,
+        "Collector: %zu collections, %zu environments and %zu objects reclaimed\n",
+        stats.collections,
+        stats.reclaimed_envs,
+        stats.reclaimed_objects
+    );
+}
+#endif
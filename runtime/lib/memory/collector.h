@@ -0,0 +1,69 @@
+#pragma once
+#include <stddef.h>
+#include <stdio.h>
+
+#include "lib/core/core.h"
+#include "lib/core/environment.h"
+#include "lib/data_objects/dynamic_array.h"
+
+typedef struct {
+    size_t collections;
+    size_t reclaimed_envs;
+    size_t reclaimed_objects;
+} CL_CollectorStats;
+
+typedef struct RootFrame {
+    struct RootFrame* prev;
+    CL_Object** objects;
+    size_t objects_count;
+    CL_Environment** envs;
+    size_t envs_count;
+} CL_RootFrame;
+
+#ifdef CL_GC
+extern CL_RootFrame* cl_roots_top;
+
+#define CL_PUSH_ROOTS(objects_count, envs_count) \
+    CL_Object* cl_object_roots[(objects_count) ? (objects_count) : 1] = {0}; \
+    CL_Environment* cl_env_roots[(envs_count) ? (envs_count) : 1] = {0}; \
+    CL_RootFrame cl_roots_frame = {cl_roots_top, cl_object_roots, (objects_count), cl_env_roots, (envs_count)}; \
+    cl_roots_top = &cl_roots_frame
+
+#define CL_PUSH_ARRAY_ROOTS(count, objects) \
+    CL_RootFrame cl_roots_frame = {cl_roots_top, (objects), (count), NULL, 0}; \
+    cl_roots_top = &cl_roots_frame
+
+#define CL_ROOT(slot, object) (cl_object_roots[slot] = (object))
+
+#define CL_ENV_ROOT(slot, env) (cl_env_roots[slot] = (env))
+
+#define CL_POP_ROOTS() (cl_roots_top = cl_roots_frame.prev)
+
+#define CL_SAFE_POINT() cl_safe_point()
+
+void cl_init_collector(CL_DynamicArray* envs);
+
+void cl_track_object(CL_Object* obj);
+
+void cl_safe_point();
+
+void cl_collect_garbage();
+
+void cl_release_tracked_objects();
+
+CL_CollectorStats cl_get_collector_stats();
+
+void cl_print_collector_stats(FILE* stream);
+#else
+#define CL_PUSH_ROOTS(objects_count, envs_count)
+
+#define CL_PUSH_ARRAY_ROOTS(count, objects)
+
+#define CL_ROOT(slot, object) ((void)0)
+
+#define CL_ENV_ROOT(slot, env) ((void)0)
+
+#define CL_POP_ROOTS() ((void)0)
+
+#define CL_SAFE_POINT() ((void)0)
+#endif
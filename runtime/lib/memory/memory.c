@@ -1,10 +1,46 @@
 #include "memory.h"
 #include "lib/core/utils.h"
 
+#include <stdbool.h>
+#include <stdint.h>
 #include <stdlib.h>
+#include <string.h>
 
 #include "lib/exit/abort.h"
 
+#define SLAB_CLASS_STEP 8
+#define SLAB_CLASSES_COUNT 16
+#define SLAB_PAGE_SIZE 65536
+
+// Without slabs every block is taken from malloc, so sanitizers and valgrind see each object
+#ifdef CL_NO_SLAB
+#define SLAB_MAX_SIZE 0
+#else
+#define SLAB_MAX_SIZE (SLAB_CLASS_STEP * SLAB_CLASSES_COUNT)
+#endif
+
+typedef struct CL_FreeBlock {
+    struct CL_FreeBlock* next;
+} CL_FreeBlock;
+
+typedef struct CL_SlabPage {
+    struct CL_SlabPage* prev;
+    struct CL_SlabPage* next;
+    CL_FreeBlock* free_list;
+    char* next_block;
+    size_t live_blocks;
+    size_t slab_class;
+} CL_SlabPage;
+
+typedef struct {
+    CL_SlabPage* pages;
+    CL_SlabPage* full_pages;
+} CL_SlabClass;
+
+// Every thread has its own slabs, so the objects are allocated without locks
+static _Thread_local CL_SlabClass slab_classes[SLAB_CLASSES_COUNT];
+static _Thread_local CL_MemoryStats stats;
+
 void* cl_allocate_memory(size_t size) {
     if (!size) {
         cl_abort("Memory allocation: no memory block size!\n");
@@ -40,3 +76,180 @@ void cl_free_memory(void* ptr) {
 
     free(ptr);
 }
+
+static size_t get_slab_class(size_t size) {
+    return (size - 1) / SLAB_CLASS_STEP;
+}
+
+static size_t get_block_size(size_t slab_class) {
+    return (slab_class + 1) * SLAB_CLASS_STEP;
+}
+
+// Pages are aligned by their size, so the page of the block is found by its address
+static CL_SlabPage* get_slab_page(void* ptr) {
+    return (CL_SlabPage*)((uintptr_t)ptr & ~(uintptr_t)(SLAB_PAGE_SIZE - 1));
+}
+
+static bool is_page_full(const CL_SlabPage* page) {
+    const size_t rest = (size_t)((const char*)page + SLAB_PAGE_SIZE - page->next_block);
+    return !page->free_list && rest < get_block_size(page->slab_class);
+}
+
+static void push_page(CL_SlabPage** pages, CL_SlabPage* page) {
+    page->prev = NULL;
+    page->next = *pages;
+    if (*pages) {
+        (*pages)->prev = page;
+    }
+    *pages = page;
+}
+
+static void unlink_page(CL_SlabPage** pages, CL_SlabPage* page) {
+    if (page->prev) {
+        page->prev->next = page->next;
+    } else {
+        *pages = page->next;
+    }
+    if (page->next) {
+        page->next->prev = page->prev;
+    }
+}
+
+static CL_SlabPage* add_slab_page(size_t slab_class) {
+    CL_SlabPage* page = aligned_alloc(SLAB_PAGE_SIZE, SLAB_PAGE_SIZE);
+
+    if (!page) {
+        cl_abort_errno("aligned_alloc");
+    }
+
+    // Sizes of the header and the blocks are multiples of the step, so blocks are aligned as pointers
+    page->free_list = NULL;
+    page->next_block = (char*)page + sizeof(CL_SlabPage);
+    page->live_blocks = 0;
+    page->slab_class = slab_class;
+    push_page(&slab_classes[slab_class].pages, page);
+    stats.pages++;
+
+    return page;
+}
+
+void* cl_allocate_object_memory(size_t size) {
+    if (!size) {
+        cl_abort("Memory allocation: no memory block size!\n");
+    }
+
+    stats.allocations++;
+
+    if (size > SLAB_MAX_SIZE) {
+        stats.large_allocations++;
+        return cl_allocate_memory(size);
+    }
+
+    const size_t slab_class_index = get_slab_class(size);
+    CL_SlabClass* slab_class = &slab_classes[slab_class_index];
+    CL_SlabPage* page = slab_class->pages ? slab_class->pages : add_slab_page(slab_class_index);
+
+    void* ptr;
+    if (page->free_list) {
+        CL_FreeBlock* block = page->free_list;
+        page->free_list = block->next;
+        stats.reused++;
+        ptr = block;
+    } else {
+        ptr = page->next_block;
+        page->next_block += get_block_size(slab_class_index);
+    }
+    page->live_blocks++;
+
+    // Full pages are kept aside, so the first page of the class always has a free block
+    if (is_page_full(page)) {
+        unlink_page(&slab_class->pages, page);
+        push_page(&slab_class->full_pages, page);
+    }
+
+    return ptr;
+}
+
+void* cl_reallocate_object_memory(void* ptr, size_t old_size, size_t size) {
+    if (old_size > SLAB_MAX_SIZE && size > SLAB_MAX_SIZE) {
+        return cl_reallocate_memory(ptr, size);
+    }
+
+    void* new_ptr = cl_allocate_object_memory(size);
+    memcpy(new_ptr, ptr, old_size < size ? old_size : size);
+    cl_free_object_memory(ptr, old_size);
+    return new_ptr;
+}
+
+void cl_free_object_memory(void* ptr, size_t size) {
+    if (!ptr) {
+        return;
+    }
+
+    stats.frees++;
+
+    if (size > SLAB_MAX_SIZE) {
+        cl_free_memory(ptr);
+        return;
+    }
+
+    CL_SlabPage* page = get_slab_page(ptr);
+    CL_SlabClass* slab_class = &slab_classes[page->slab_class];
+
+    if (is_page_full(page)) {
+        unlink_page(&slab_class->full_pages, page);
+        push_page(&slab_class->pages, page);
+    }
+
+    CL_FreeBlock* block = ptr;
+    block->next = page->free_list;
+    page->free_list = block;
+    page->live_blocks--;
+
+    // Empty page is returned while the program runs, but the last page with free blocks is kept: an object that is
+    // allocated and freed in a loop doesn't take a new page every time
+    if (!page->live_blocks && (page->prev || page->next)) {
+        unlink_page(&slab_class->pages, page);
+        cl_free_memory(page);
+        stats.released_pages++;
+    }
+}
+
+static void free_pages(CL_SlabPage* page) {
+    while (page) {
+        CL_SlabPage* next = page->next;
+        cl_free_memory(page);
+        page = next;
+    }
+}
+
+void cl_release_object_memory() {
+    for (size_t i = 0; i < SLAB_CLASSES_COUNT; i++) {
+        free_pages(slab_classes[i].pages);
+        free_pages(slab_classes[i].full_pages);
+    }
+
+    memset(slab_classes, 0, sizeof(slab_classes));
+}
+
+CL_MemoryStats cl_get_memory_stats() {
+    return stats;
+}
+
+void cl_print_memory_stats(FILE* stream) {
+    const size_t small_allocations = stats.allocations - stats.large_allocations;
+    const double hit_rate = small_allocations ? 100.0 * (double)stats.reused / (double)small_allocations : 0;
+
+    fprintf(
+        stream,
+        "Objects: %zu allocations (%zu from free lists, %.1f%%), %zu without slabs, %zu frees, %zu pages of %d KiB (%zu released)\n",
+        stats.allocations,
+        stats.reused,
+        hit_rate,
+        stats.large_allocations,
+        stats.frees,
+        stats.pages,
+        SLAB_PAGE_SIZE / 1024,
+        stats.released_pages
+    );
+}
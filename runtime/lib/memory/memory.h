@@ -1,8 +1,30 @@
 #pragma once
 #include <stddef.h>
+#include <stdio.h>
+
+typedef struct {
+    size_t allocations;
+    size_t reused;
+    size_t large_allocations;
+    size_t frees;
+    size_t pages;
+    size_t released_pages;
+} CL_MemoryStats;
 
 void* cl_allocate_memory(size_t size);
 
 void* cl_reallocate_memory(void* ptr, size_t size);
 
 void cl_free_memory(void* ptr);
+
+void* cl_allocate_object_memory(size_t size);
+
+void* cl_reallocate_object_memory(void* ptr, size_t old_size, size_t size);
+
+void cl_free_object_memory(void* ptr, size_t size);
+
+void cl_release_object_memory();
+
+CL_MemoryStats cl_get_memory_stats();
+
+void cl_print_memory_stats(FILE* stream);
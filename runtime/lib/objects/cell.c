@@ -0,0 +1,29 @@
+#include "cell.h"
+
+#include "lib/memory/memory.h"
+
+// Cell keeps the variable that is shared by the environment and the flat closures, the cell takes the reference of the value
+CL_Object* cl_make_cell(CL_Object* value) {
+    CL_CellObject* cell_object = cl_allocate_object_memory(sizeof(CL_CellObject));
+    cl_init_obj((CL_Object*)cell_object, CELL);
+
+    cell_object->value = value;
+    return (CL_Object*)cell_object;
+}
+
+void cl_destroy_cell(CL_Object* obj) {
+    CL_CellObject* cell_object = (CL_CellObject*)obj;
+    cl_dec_refs_cnt(cell_object->value);
+    cl_free_object_memory(obj, sizeof(CL_CellObject));
+}
+
+CL_Object* cl_get_cell_value(CL_Object* obj) {
+    return ((CL_CellObject*)obj)->value;
+}
+
+void cl_set_cell_value_move(CL_Object* obj, CL_Object* value) {
+    CL_CellObject* cell_object = (CL_CellObject*)obj;
+    CL_Object* old_value = cell_object->value;
+    cell_object->value = value;
+    cl_dec_refs_cnt(old_value);
+}
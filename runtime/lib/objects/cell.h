@@ -0,0 +1,16 @@
+#pragma once
+#include "lib/core/core.h"
+
+typedef struct {
+    enum CL_ObjectType type;
+    unsigned short ref_count;
+    CL_Object* value;
+} CL_CellObject;
+
+CL_Object* cl_make_cell(CL_Object* value);
+
+void cl_destroy_cell(CL_Object* obj);
+
+CL_Object* cl_get_cell_value(CL_Object* obj);
+
+void cl_set_cell_value_move(CL_Object* obj, CL_Object* value);
@@ -4,7 +4,7 @@
 #include "lib/core/utils.h"
 
 CL_Object* cl_make_evaluable(cl_evaluable_func func, CL_Environment* env) {
-    CL_EvaluableObject* evaluable_object = cl_allocate_memory(sizeof(CL_EvaluableObject));
+    CL_EvaluableObject* evaluable_object = cl_allocate_object_memory(sizeof(CL_EvaluableObject));
     cl_init_obj((CL_Object*)evaluable_object, EVALUABLE);
 
     evaluable_object->function = func;
@@ -18,9 +18,12 @@ void cl_destroy_evaluable(CL_Object* obj) {
     CL_EvaluableObject* evaluable_object = (CL_EvaluableObject*)obj;
     if (evaluable_object->result) {
         cl_dec_refs_cnt(evaluable_object->result);
+    } else {
+        // Environment is released by the evaluation, so only the promise that wasn't forced holds it
+        cl_dec_env_refs_cnt(evaluable_object->environment);
     }
 
-    cl_free_memory(obj);
+    cl_free_object_memory(obj, sizeof(CL_EvaluableObject));
 }
 
 CL_Object* cl_evaluate(CL_Object* obj) {
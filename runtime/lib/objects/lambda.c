@@ -1,27 +1,39 @@
 #include "objects/lambda.h"
-#include <stdarg.h>
 #include "vector.h"
 #include "list.h"
 #include "pair.h"
 
+#include <stdio.h>
+
+#include "lib/memory/collector.h"
 #include "lib/memory/memory.h"
 #include "lib/core/utils.h"
 #include "lib/exit/abort.h"
+#include "lib/exit/error.h"
 
-CL_Object* cl_make_lambda(cl_func_with_env func, CL_Environment* environment) {
-    CL_LambdaUserObject* lambda_object = cl_allocate_memory(sizeof(CL_LambdaUserObject));
+CL_Object* cl_make_lambda(cl_func_with_env func, CL_Environment* environment, size_t env_capacity, bool stack_call_env) {
+    CL_LambdaUserObject* lambda_object = cl_allocate_object_memory(sizeof(CL_LambdaUserObject));
     cl_init_obj((CL_Object*)lambda_object, LAMBDA);
 
     lambda_object->cl_func = func;
     lambda_object->lambda_type = USER;
     lambda_object->environment = environment;
-    lambda_object->call_environments = cl_da_create(UNDEFINED_DA_CAPACITY);
+    lambda_object->env_capacity = env_capacity;
+    lambda_object->stack_call_env = stack_call_env;
     cl_inc_env_refs_cnt(environment);
     return (CL_Object*)lambda_object;
 }
 
+// Flat closure: its environment has only the captured values (or cells of the shared variables), its parent is the global environment
+CL_Object* cl_make_closure(cl_func_with_env func, size_t env_capacity, bool stack_call_env, size_t count, CL_Object** captures) {
+    CL_Environment* environment = cl_make_closure_env(count, captures);
+    CL_Object* lambda = cl_make_lambda(func, environment, env_capacity, stack_call_env);
+    cl_dec_env_refs_cnt(environment);
+    return lambda;
+}
+
 CL_Object* cl_make_lambda_without_env(cl_func func) {
-    CL_LambdaLibraryObject* lambda_object = cl_allocate_memory(sizeof(CL_LambdaLibraryObject));
+    CL_LambdaLibraryObject* lambda_object = cl_allocate_object_memory(sizeof(CL_LambdaLibraryObject));
     cl_init_obj((CL_Object*)lambda_object, LAMBDA);
 
     lambda_object->cl_func = func;
@@ -30,7 +42,7 @@ CL_Object* cl_make_lambda_without_env(cl_func func) {
 }
 
 CL_Object* cl_make_lambda_native(cl_func_native func, CL_NativeData* data) {
-    CL_LambdaNativeObject* lambda_object = cl_allocate_memory(sizeof(CL_LambdaNativeObject));
+    CL_LambdaNativeObject* lambda_object = cl_allocate_object_memory(sizeof(CL_LambdaNativeObject));
     cl_init_obj((CL_Object*)lambda_object, LAMBDA);
 
     lambda_object->cl_func = func;
@@ -44,38 +56,60 @@ void cl_destroy_lambda(CL_Object* obj) {
     switch (lambda_object->lambda_type) {
         case USER: {
             CL_LambdaUserObject* lambda_user = (CL_LambdaUserObject*)lambda_object;
-            CL_DynamicArray* call_envs = lambda_user->call_environments;
-
-            for (size_t i = 0; i < cl_da_size(call_envs); i++) {
-                CL_Environment* call_env = cl_da_get(call_envs, i);
-                cl_dec_env_refs_cnt(call_env);
-            }
-
-            cl_da_destroy(call_envs);
             cl_dec_env_refs_cnt(lambda_user->environment);
+            cl_free_object_memory(obj, sizeof(CL_LambdaUserObject));
+            break;
+        }
+        case LIBRARY: {
+            cl_free_object_memory(obj, sizeof(CL_LambdaLibraryObject));
             break;
         }
         case NATIVE: {
             CL_LambdaNativeObject* lambda_native = (CL_LambdaNativeObject*)lambda_object;
             cl_destroy_native_data(lambda_native->native_data);
+            cl_free_object_memory(obj, sizeof(CL_LambdaNativeObject));
             break;
         }
-        default: {}
+        default:
+            __builtin_unreachable();
     }
-
-    cl_free_memory(obj);
 }
 
-static CL_Object* cl_lambda_call_array(CL_Object* obj, CL_FUNC_PARAMS) {
+// Tail call that is returned to the trampoline instead of being made by the procedure, see cl_tail_call
+static struct {
+    CL_Object* procedure;
+    size_t count;
+    size_t capacity;
+    CL_Object** args;
+} pending_call = {NULL, 0, 0, NULL};
+
+// Result of the procedure that returns the tail call, it's immortal
+static CL_Object tail_call_marker = {UNSPECIFIED, 0};
+
+static CL_Object* call_procedure(CL_Object* obj, CL_FUNC_PARAMS) {
     CL_CHECK_FUNC_ARG_TYPE(cl_get_obj_type(obj), LAMBDA);
 
     const CL_LambdaObject* lambda_object = (CL_LambdaObject*)obj;
     switch (lambda_object->lambda_type) {
         case USER: {
             CL_LambdaUserObject* lambda_user = (CL_LambdaUserObject*)lambda_object;
-            CL_Environment* lambda_call_env = cl_make_env(lambda_user->environment);
-            cl_da_append(lambda_user->call_environments, lambda_call_env);
-            return lambda_user->cl_func(lambda_call_env, CL_FUNC_PARAMS_WITHOUT_TYPES);
+
+            // Environment of the call isn't captured by the function, so it's released with the frame of the call
+            if (lambda_user->stack_call_env) {
+                size_t capacity = lambda_user->env_capacity ? lambda_user->env_capacity : 1;
+                CL_Environment lambda_call_env;
+                CL_Variable variables[capacity];
+                cl_init_stack_env(&lambda_call_env, lambda_user->environment, capacity, variables);
+                CL_Object* result = lambda_user->cl_func(&lambda_call_env, CL_FUNC_PARAMS_WITHOUT_TYPES);
+                cl_release_stack_env(&lambda_call_env);
+                return result;
+            }
+
+            CL_Environment* lambda_call_env = cl_make_env_capacity(lambda_user->environment, lambda_user->env_capacity);
+            CL_Object* result = lambda_user->cl_func(lambda_call_env, CL_FUNC_PARAMS_WITHOUT_TYPES);
+            // Environment of the call outlives it only if closures, promises or nested environments captured it
+            cl_dec_env_refs_cnt(lambda_call_env);
+            return result;
         }
         case NATIVE: {
             CL_LambdaNativeObject* lambda_native = (CL_LambdaNativeObject*)lambda_object;
@@ -90,49 +124,62 @@ static CL_Object* cl_lambda_call_array(CL_Object* obj, CL_FUNC_PARAMS) {
     }
 }
 
-// The function is called by an ordinary procedure call
-CL_Object* cl_lambda_call(CL_Object* obj, size_t count, ...) {
-    CL_CHECK_FUNC_ARG_TYPE(cl_get_obj_type(obj), LAMBDA);
+// Trampoline: tail calls returned by the procedures are made here one after another, so the C-stack doesn't grow
+static CL_Object* run_trampoline(CL_Object* obj, CL_FUNC_PARAMS) {
+    CL_Object* result = call_procedure(obj, CL_FUNC_PARAMS_WITHOUT_TYPES);
+
+    while (result == &tail_call_marker) {
+        // Pending call is replaced by the tail calls of the next procedure, so it's copied
+        CL_Object* procedure = pending_call.procedure;
+        size_t tail_count = pending_call.count;
+        CL_Object* tail_args[tail_count ? tail_count : 1];
+        for (size_t i = 0; i < tail_count; i++) {
+            tail_args[i] = pending_call.args[i];
+        }
+
+        // Arguments are kept only by the copy, the procedure that made the tail call has already returned
+        CL_PUSH_ARRAY_ROOTS(tail_count, tail_args);
+        result = call_procedure(procedure, tail_count, tail_args);
+        CL_POP_ROOTS();
 
-    va_list args;
-    va_start(args, count);
-    CL_Object* obj_args[count];
-    for (unsigned int i = 0; i < count; i++) {
-        obj_args[i] = va_arg(args, CL_Object*);
+        for (size_t i = 0; i < tail_count; i++) {
+            cl_dec_refs_cnt(tail_args[i]);
+        }
+        cl_dec_refs_cnt(procedure);
     }
-    va_end(args);
 
-    CL_Object* result = cl_lambda_call_array(obj, count, obj_args);
     return result;
 }
 
-// The function is called by (apply ...)
-CL_Object* cl_lambda_call_list(CL_Object* obj, size_t count, ...) {
-    CL_CHECK_FUNC_ARG_TYPE(cl_get_obj_type(obj), LAMBDA);
-
-    va_list args;
-    va_start(args, count);
-    CL_Object* tmp[count];
-    for (size_t i = 0; i < count; i++) {
-        tmp[i] = va_arg(args, CL_Object*);
+static CL_Object** reserve_pending_call(CL_Object* obj, size_t count) {
+    if (count > pending_call.capacity) {
+        pending_call.capacity = count;
+        pending_call.args = cl_reallocate_memory(pending_call.args, sizeof(CL_Object*) * count);
     }
-    va_end(args);
 
-    size_t scalar_args_count = count - 1;
-    CL_Object* list_arg = tmp[scalar_args_count];
+    cl_inc_refs_cnt(obj);
+    pending_call.procedure = obj;
+    pending_call.count = count;
+    return pending_call.args;
+}
+
+static size_t count_list_call_args(size_t count, CL_Object** args) {
+    CL_Object* list_arg = args[count - 1];
 
     if (!cl_is_list_internal(list_arg)) {
         cl_abort("cl_lamda_call_list: Expected list in last argument!\n");
         __builtin_unreachable();
     }
 
+    return count - 1 + cl_list_length_internal(list_arg);
+}
 
-    size_t list_arg_length = cl_list_length_internal(list_arg);
-    size_t obj_args_count = scalar_args_count + list_arg_length;
-    CL_Object* obj_args[obj_args_count];
+static void spread_list_call_args(size_t count, CL_Object** args, CL_Object** obj_args) {
+    size_t scalar_args_count = count - 1;
+    CL_Object* list_arg = args[scalar_args_count];
 
     for (size_t i = 0; i < scalar_args_count; i++) {
-        obj_args[i] = tmp[i];
+        obj_args[i] = args[i];
     }
 
     size_t curr_list_pos = 0;
@@ -140,7 +187,62 @@ CL_Object* cl_lambda_call_list(CL_Object* obj, size_t count, ...) {
         obj_args[scalar_args_count + curr_list_pos++] = cl_get_pair_left_internal(list_arg);
         list_arg = cl_get_pair_right_internal(list_arg);
     }
+}
+
+// The function is called by an ordinary procedure call, arguments are passed in the array that is built by the caller
+CL_Object* cl_lambda_call(CL_Object* obj, CL_FUNC_PARAMS) {
+    CL_CHECK_FUNC_ARG_TYPE(cl_get_obj_type(obj), LAMBDA);
+
+    return run_trampoline(obj, CL_FUNC_PARAMS_WITHOUT_TYPES);
+}
 
-    CL_Object* result = cl_lambda_call_array(obj, obj_args_count, obj_args);
+// The function is called by (apply ...)
+CL_Object* cl_lambda_call_list(CL_Object* obj, CL_FUNC_PARAMS) {
+    CL_CHECK_FUNC_ARG_TYPE(cl_get_obj_type(obj), LAMBDA);
+
+    size_t obj_args_count = count_list_call_args(count, args);
+    CL_Object* obj_args[obj_args_count ? obj_args_count : 1];
+    spread_list_call_args(count, args, obj_args);
+
+    CL_PUSH_ARRAY_ROOTS(obj_args_count, obj_args);
+    CL_Object* result = run_trampoline(obj, obj_args_count, obj_args);
+    CL_POP_ROOTS();
     return result;
 }
+
+// The function is called by a procedure call in the tail position: the call is made by the trampoline after the procedure returns
+CL_Object* cl_tail_call(CL_Object* obj, CL_FUNC_PARAMS) {
+    CL_CHECK_FUNC_ARG_TYPE(cl_get_obj_type(obj), LAMBDA);
+
+    CL_Object** obj_args = reserve_pending_call(obj, count);
+    for (size_t i = 0; i < count; i++) {
+        obj_args[i] = args[i];
+        cl_inc_refs_cnt(obj_args[i]);
+    }
+
+    return &tail_call_marker;
+}
+
+// The function is called by (apply ...) in the tail position
+CL_Object* cl_tail_call_list(CL_Object* obj, CL_FUNC_PARAMS) {
+    CL_CHECK_FUNC_ARG_TYPE(cl_get_obj_type(obj), LAMBDA);
+
+    size_t obj_args_count = count_list_call_args(count, args);
+    CL_Object** obj_args = reserve_pending_call(obj, obj_args_count);
+    spread_list_call_args(count, args, obj_args);
+
+    for (size_t i = 0; i < obj_args_count; i++) {
+        cl_inc_refs_cnt(obj_args[i]);
+    }
+
+    return &tail_call_marker;
+}
+
+// The translator replaces the call of the known procedure with other number of the arguments by this one, so the error is raised only if the call is reached
+CL_Object* cl_arity_error(char* name, size_t expected, bool is_variadic, size_t count) {
+    char error_str[CL_ERROR_BUF_SIZE];
+    snprintf(error_str, sizeof(error_str), "Procedure \"%s\" expects %s%zu argument%s, got %zu\n",
+        name, is_variadic ? "at least " : "", expected, expected == 1 ? "" : "s", count);
+    cl_abort(error_str);
+    __builtin_unreachable();
+}
@@ -24,7 +24,8 @@ typedef struct {
     enum CL_LambdaType lambda_type;
     cl_func_with_env cl_func;
     CL_Environment* environment;
-    CL_DynamicArray* call_environments;
+    size_t env_capacity;
+    bool stack_call_env;
 } CL_LambdaUserObject;
 
 typedef struct {
@@ -42,7 +43,9 @@ typedef struct {
     CL_NativeData* native_data;
 } CL_LambdaNativeObject;
 
-CL_Object* cl_make_lambda(cl_func_with_env func, CL_Environment* environment);
+CL_Object* cl_make_lambda(cl_func_with_env func, CL_Environment* environment, size_t env_capacity, bool stack_call_env);
+
+CL_Object* cl_make_closure(cl_func_with_env func, size_t env_capacity, bool stack_call_env, size_t count, CL_Object** captures);
 
 CL_Object* cl_make_lambda_without_env(cl_func func);
 
@@ -50,6 +53,12 @@ CL_Object* cl_make_lambda_native(cl_func_native func, CL_NativeData* data);
 
 void cl_destroy_lambda(CL_Object* object);
 
-CL_Object* cl_lambda_call(CL_Object* obj, size_t count, ...);
+CL_Object* cl_lambda_call(CL_Object* obj, CL_FUNC_PARAMS);
+
+CL_Object* cl_lambda_call_list(CL_Object* obj, CL_FUNC_PARAMS);
+
+CL_Object* cl_tail_call(CL_Object* obj, CL_FUNC_PARAMS);
+
+CL_Object* cl_tail_call_list(CL_Object* obj, CL_FUNC_PARAMS);
 
-CL_Object* cl_lambda_call_list(CL_Object* obj, size_t count, ...);
+CL_Object* cl_arity_error(char* name, size_t expected, bool is_variadic, size_t count);
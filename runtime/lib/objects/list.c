@@ -3,22 +3,19 @@
 #include "pair.h"
 #include "primitive.h"
 
-#include "lib/memory/memory.h"
+#include "lib/core/tags.h"
 #include "lib/core/utils.h"
 #include "lib/exit/abort.h"
 
 CL_Object* cl_make_list(CL_FUNC_PARAMS) {
-    CL_EmptyListObject* empty_list_object = cl_allocate_memory(sizeof(CL_EmptyListObject));
-    cl_init_obj((CL_Object*)empty_list_object, EMPTY_LIST);
-
     if (!count) {
-        return (CL_Object*)empty_list_object;
+        return CL_EMPTY_LIST;
     }
 
     CL_PairObject* result = NULL;
     CL_PairObject* curr_pair = NULL;
     for (size_t i = 0; i < count; i++) {
-        CL_PairObject* new_pair = (CL_PairObject*)cl_make_pair_internal(args[i], (CL_Object*)empty_list_object);
+        CL_PairObject* new_pair = (CL_PairObject*)cl_make_pair_internal(args[i], CL_EMPTY_LIST);
         if (!result) {
             result = new_pair;
             curr_pair = new_pair;
@@ -31,9 +28,6 @@ CL_Object* cl_make_list(CL_FUNC_PARAMS) {
         curr_pair = new_pair;
     }
 
-    // After resets in cycle upper count of refs = 2. Decrease it to 1.
-    cl_dec_refs_cnt((CL_Object*)empty_list_object);
-
     return (CL_Object*)result;
 }
 
@@ -122,7 +116,3 @@ CL_Object* cl_list_length(CL_FUNC_PARAMS) {
     CL_Object* list = args[0];
     return cl_make_int((int)cl_list_length_internal(list));
 }
-
-void cl_destroy_empty_list(CL_Object* obj) {
-    cl_free_memory(obj);
-}
@@ -7,7 +7,7 @@
 #include "lib/memory/memory.h"
 
 CL_Object* cl_make_pair_internal(CL_Object* left, CL_Object* right) {
-    CL_PairObject* pair_object = cl_allocate_memory(sizeof(CL_PairObject));
+    CL_PairObject* pair_object = cl_allocate_object_memory(sizeof(CL_PairObject));
     cl_init_obj((CL_Object*)pair_object, PAIR);
 
     pair_object->left = left;
@@ -88,7 +88,17 @@ void cl_set_pair_right_internal_weak(CL_Object* obj, CL_Object* new) {
 }
 
 void cl_destroy_pair(CL_Object* obj) {
-    cl_dec_refs_cnt(cl_get_pair_left_internal(obj));
-    cl_dec_refs_cnt(cl_get_pair_right_internal(obj));
-    cl_free_memory(obj);
+    // Tail of the list that is released with the pair is destroyed in the loop, so long lists don't overflow the C-stack
+    while (obj) {
+        CL_Object* right = cl_get_pair_right_internal(obj);
+        cl_dec_refs_cnt(cl_get_pair_left_internal(obj));
+        cl_free_object_memory(obj, sizeof(CL_PairObject));
+
+        if (right && cl_get_obj_type(right) == PAIR && right->ref_count == 1) {
+            obj = right;
+        } else {
+            cl_dec_refs_cnt(right);
+            obj = NULL;
+        }
+    }
 }
@@ -11,34 +11,47 @@
 #include "primitive_types.h"
 
 #include "lib/memory/memory.h"
+#include "lib/core/tags.h"
 #include "lib/core/utils.h"
 #include "lib/exit/abort.h"
 #include "lib/exit/error.h"
 
 #define TOO_LOW_DOUBLE 1e-308
-static void destroy_simple_object(CL_Object* obj) {
-    cl_free_memory(obj);
+
+static void destroy_simple_object(CL_Object* obj, size_t size) {
+    cl_free_object_memory(obj, size);
 }
 
+// Integers, chars and booleans are kept in the pointer itself (see tags.h), so they are never allocated
 CL_Object* cl_make_int(int value) {
-    CL_IntObject* int_object = cl_allocate_memory(sizeof(CL_IntObject));
-    cl_init_obj((CL_Object*)int_object, INTEGER);
-    int_object->value = value;
+#if INTPTR_MAX <= INT_MAX
+    if (value < CL_FIXNUM_MIN || value > CL_FIXNUM_MAX) {
+        CL_IntObject* int_object = cl_allocate_object_memory(sizeof(CL_IntObject));
+        cl_init_obj((CL_Object*)int_object, INTEGER);
+        int_object->value = value;
+
+        return (CL_Object*)int_object;
+    }
+#endif
 
-    return (CL_Object*)int_object;
+    return CL_MAKE_FIXNUM(value);
 }
 
 int cl_get_int_value(CL_Object* obj) {
+    if (CL_IS_FIXNUM(obj)) {
+        return CL_FIXNUM_VALUE(obj);
+    }
+
     CL_IntObject* int_object = (CL_IntObject*)obj;
     return int_object->value;
 }
 
 void cl_destroy_int(CL_Object* obj) {
-    destroy_simple_object(obj);
+    destroy_simple_object(obj, sizeof(CL_IntObject));
 }
 
 CL_Object* cl_make_double(double value) {
-    CL_DoubleObject* double_object = cl_allocate_memory(sizeof(CL_DoubleObject));
+    CL_DoubleObject* double_object = cl_allocate_object_memory(sizeof(CL_DoubleObject));
     cl_init_obj((CL_Object*)double_object, DOUBLE);
     double_object->value = value;
 
@@ -51,7 +64,7 @@ double cl_get_double_value(CL_Object* obj) {
 }
 
 void cl_destroy_double(CL_Object* obj) {
-    destroy_simple_object(obj);
+    destroy_simple_object(obj, sizeof(CL_DoubleObject));
 }
 
 CL_Object* cl_make_boolean(bool value) {
@@ -59,11 +72,7 @@ CL_Object* cl_make_boolean(bool value) {
         cl_abort("Boolean value must be false or true!\n");
     }
 
-    CL_BooleanObject* boolean_object = cl_allocate_memory(sizeof(CL_BooleanObject));
-    cl_init_obj((CL_Object*)boolean_object, BOOLEAN);
-    boolean_object->value = value;
-
-    return (CL_Object*)boolean_object;
+    return value ? CL_TRUE : CL_FALSE;
 }
 
 CL_Object* cl_make_true() {
@@ -75,16 +84,11 @@ CL_Object* cl_make_false() {
 }
 
 bool cl_get_boolean_value(CL_Object* obj) {
-    CL_BooleanObject* boolean_object = (CL_BooleanObject*)obj;
-    return boolean_object->value;
-}
-
-void cl_destroy_boolean(CL_Object* obj) {
-    destroy_simple_object(obj);
+    return obj == CL_TRUE;
 }
 
 CL_Object* cl_make_string(char* value) {
-    CL_StringObject* string_object = cl_allocate_memory(sizeof(CL_StringObject));
+    CL_StringObject* string_object = cl_allocate_object_memory(sizeof(CL_StringObject));
     cl_init_obj((CL_Object*)string_object, STRING);
     string_object->length = strlen(value);
 
@@ -108,24 +112,15 @@ size_t cl_get_string_length(CL_Object* obj) {
 void cl_destroy_string(CL_Object* obj) {
     char* container = cl_get_string_value(obj);
     cl_free_memory(container);
-    destroy_simple_object(obj);
+    destroy_simple_object(obj, sizeof(CL_StringObject));
 }
 
 CL_Object* cl_make_char(char value) {
-    CL_CharObject* char_object = cl_allocate_memory(sizeof(CL_CharObject));
-    cl_init_obj((CL_Object*)char_object, CHAR);
-    char_object->value = value;
-
-    return (CL_Object*)char_object;
+    return CL_MAKE_CHAR(value);
 }
 
 char cl_get_char_value(CL_Object* obj) {
-    CL_CharObject* char_object = (CL_CharObject*)obj;
-    return char_object->value;
-}
-
-void cl_destroy_char(CL_Object* obj) {
-    destroy_simple_object(obj);
+    return CL_CHAR_VALUE(obj);
 }
 
 CL_Object* cl_to_integer(CL_FUNC_PARAMS) {
@@ -24,8 +24,6 @@ CL_Object* cl_make_false();
 
 bool cl_get_boolean_value(CL_Object* obj);
 
-void cl_destroy_boolean(CL_Object* obj);
-
 CL_Object* cl_make_string(char* value);
 
 char* cl_get_string_value(CL_Object* obj);
@@ -38,8 +36,6 @@ CL_Object* cl_make_char(char value);
 
 char cl_get_char_value(CL_Object* obj);
 
-void cl_destroy_char(CL_Object* obj);
-
 CL_Object* cl_to_integer(CL_FUNC_PARAMS);
 
 CL_Object* cl_to_double(CL_FUNC_PARAMS);
@@ -14,12 +14,6 @@ typedef struct {
     double value;
 } CL_DoubleObject;
 
-typedef struct {
-    enum CL_ObjectType type;
-    unsigned short ref_count;
-    bool value;
-} CL_BooleanObject;
-
 typedef struct {
     enum CL_ObjectType type;
     unsigned short ref_count;
@@ -27,8 +21,3 @@ typedef struct {
     size_t length;
 } CL_StringObject;
 
-typedef struct {
-    enum CL_ObjectType type;
-    unsigned short ref_count;
-    char value;
-} CL_CharObject;
@@ -5,7 +5,7 @@
 #define UNDEFINED_SIZE 0
 
 static CL_Object* make_list(size_t size) {
-    CL_VectorObject* list_object = cl_allocate_memory(sizeof(CL_VectorObject));
+    CL_VectorObject* list_object = cl_allocate_object_memory(sizeof(CL_VectorObject));
     cl_init_obj((CL_Object*)list_object, VECTOR);
 
     list_object->list = cl_da_create(size);
@@ -38,7 +38,7 @@ size_t cl_vector_length(CL_Object* list) {
 }
 
 CL_Object* cl_make_vector_from_array(size_t size, CL_Object** array) {
-    CL_VectorObject* list_object = cl_allocate_memory(sizeof(CL_VectorObject));
+    CL_VectorObject* list_object = cl_allocate_object_memory(sizeof(CL_VectorObject));
     cl_init_obj((CL_Object*)list_object, VECTOR);
 
     list_object->list = cl_da_create(size);
@@ -53,5 +53,5 @@ CL_Object* cl_make_vector_from_array(size_t size, CL_Object** array) {
 void cl_destroy_vector(CL_Object* obj) {
     const CL_VectorObject* list_object = (CL_VectorObject*)obj;
     cl_da_destroy(list_object->list);
-    cl_free_memory(obj);
+    cl_free_object_memory(obj, sizeof(CL_VectorObject));
 }
@@ -2,4 +2,9 @@
 
 filename=$1
 
-gcc -o "build/${filename%.*}.out" "build/$1" -I../runtime -L../lib -lruntime -Wl,-rpath,../lib
+# CLISP_GC=1: the program is compiled with the tracing collector and linked with its runtime
+if [ -n "$CLISP_GC" ]; then
+    gcc -DCL_GC -o "build/${filename%.*}.out" "build/$1" -I../runtime -L../lib -lruntime_gc -Wl,-rpath,../lib
+else
+    gcc -o "build/${filename%.*}.out" "build/$1" -I../runtime -L../lib -lruntime -Wl,-rpath,../lib
+fi
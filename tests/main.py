@@ -18,10 +18,15 @@ parser.add_argument('-ed', '--exclude-directories', nargs='+', help='Exclude all
 parser.add_argument('-ef', '--exclude-files', nargs='+', help='Exclude tests only to files relative ./cases.'
                                                            ' Merges with -ed.')
 parser.add_argument('-c', '--clear', action='store_true', default=False, help='Clear ./build directory after running tests.')
+parser.add_argument('-gc', '--gc', action='store_true', default=False, help='Compile the programs with the tracing collector instead of reference counting.')
 
 args = parser.parse_args()
 
 if __name__ == '__main__':
+    # Install script and compile.sh build and link the runtime with the collector
+    if args.gc:
+        os.environ['CLISP_GC'] = '1'
+
     try:
         subprocess.run(
             [str(INSTALL_SCRIPT)],
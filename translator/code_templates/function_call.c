@@ -1 +0,0 @@
-{% if var %}{{ type }} {{ var }} = {% else %}{% endif %}{{ func }}({{ args | join(', ') }});
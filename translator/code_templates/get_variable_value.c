@@ -1 +0,0 @@
-{{ type }} {{ var }} = {{ func }}({{ env }}, {{ name }});
@@ -1 +0,0 @@
-{{ func }}({{ var }});
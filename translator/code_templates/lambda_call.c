@@ -1,2 +0,0 @@
-{% set _args = [args | length] + args %}
-{{ type }} {{ var }} = {{ func }}({{ lambda_var }}, {{ _args | join(', ') }});
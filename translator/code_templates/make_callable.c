@@ -1 +0,0 @@
-{{ type }} {{ var }} = {{ creation_func }}({{ func }}, {{ env }});
@@ -1 +0,0 @@
-{{ type }} {{ var }} = {{ func }}({{ value }});
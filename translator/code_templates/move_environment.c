@@ -1 +0,0 @@
-{{ var }} = {{ func }}({{ env }});
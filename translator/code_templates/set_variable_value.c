@@ -1 +0,0 @@
-{{ func }}({{ env }}, {{ name }}, {{ value }});
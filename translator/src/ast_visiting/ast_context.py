@@ -33,14 +33,16 @@ class ASTContext:
         return self.__contexts[-1]
 
 
-def visit(context: ASTContext):
-    def decorator(method):
-        def wrapper(self, *args, **kwargs):
-            with context:
-                antlr4_ctx = args[-1]
-                context.visit(antlr4_ctx)
-                return method(self, *args, **kwargs)
+def visit(method):
+    """
+    Decorator of the visiting methods: remembers visited AST node in the AST context of the visitor (its "ast_context" attribute) while the method is running.
+    """
 
-        return wrapper
+    def wrapper(self, *args, **kwargs):
+        context: ASTContext = self.ast_context
+        with context:
+            antlr4_ctx = args[-1]
+            context.visit(antlr4_ctx)
+            return method(self, *args, **kwargs)
 
-    return decorator
+    return wrapper
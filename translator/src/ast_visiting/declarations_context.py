@@ -1,6 +1,6 @@
 from typing import Iterator
 
-from src.rendering.codes import Code
+from src.ir import Function
 
 
 class DeclarationsContext:
@@ -11,16 +11,16 @@ class DeclarationsContext:
     def __init__(self):
         self.__declarations = []
 
-    def add_declaration(self, code: Code) -> None:
+    def add_declaration(self, function: Function) -> None:
         """
         Adds a declaration to the list of declarations.
 
-        :param code: code of the declaration
+        :param function: declared function
         """
 
-        self.__declarations.append(code)
+        self.__declarations.append(function)
 
-    def iter_declarations(self) -> Iterator[Code]:
+    def iter_declarations(self) -> Iterator[Function]:
         """
         Returns an iterator over the declarations.
         """
@@ -1,4 +1,6 @@
-from src.rendering.codes import Code
+from typing import Optional
+
+from src.ir import Sequence, Frame
 from src.environment import Environment
 
 
@@ -28,16 +30,30 @@ class EnvironmentContext:
     def __init__(self):
         self.__env = None
 
-    def init(self, name: str, code: Code):
+    def init(
+        self,
+        name: str,
+        code: Sequence,
+        frame: Optional[Frame] = None,
+        is_function: bool = False,
+    ):
         """
         Creates new environment with given name and code, sets current environment to new one and remembers previous one as parent.
 
         :param name: name of the environment
         :param code: code of the environment
+        :param frame: layout of the runtime environment, by default new frame is created (child of the frame of the parent)
+        :param is_function: whether it's an environment of the function (lambda or promise)
         """
 
         parent = self.__env
-        self.__env = Environment(name=name, code=code, parent=parent)
+
+        if frame is None:
+            frame = Frame(None if parent is None else parent.frame)
+
+        self.__env = Environment(
+            name=name, code=code, parent=parent, frame=frame, is_function=is_function
+        )
 
     def __enter__(self):
         pass
@@ -10,10 +10,8 @@ class VisitingException(Exception):
         :param ctx: context of the visiting.
         """
 
-        shift = 59  # From preprocessing
-
-        start = ctx.start.line - shift
-        stop =  ctx.stop.line - shift
+        start = ctx.start.line
+        stop = ctx.stop.line
 
         if start == stop:
             arg = f"{message} on line {start}"
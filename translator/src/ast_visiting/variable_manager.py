@@ -1,7 +1,12 @@
+from typing import Optional
+
+
 class VariableManager:
-    def __init__(self):
+    def __init__(self, counters: Optional[dict[str, int]] = None):
         """
         Class is responsible for creating names for the variables.
+
+        :param counters: counters to continue from (see "counters"), so the names won't collide with the names created by another manager.
         """
 
         self.__object_count = 0
@@ -9,6 +14,25 @@ class VariableManager:
         self.__lambda_count = 0
         self.__evaluable_count = 0
 
+        if counters is not None:
+            self.__object_count = counters["object"]
+            self.__environment_count = counters["environment"]
+            self.__lambda_count = counters["lambda"]
+            self.__evaluable_count = counters["evaluable"]
+
+    @property
+    def counters(self) -> dict[str, int]:
+        """
+        Current values of the counters of the names.
+        """
+
+        return {
+            "object": self.__object_count,
+            "environment": self.__environment_count,
+            "lambda": self.__lambda_count,
+            "evaluable": self.__evaluable_count,
+        }
+
     def create_object_name(self) -> str:
         """
         Creates and returns a name of the variable for the new object.
@@ -2,14 +2,53 @@ from typing import Union, Optional
 
 from src.LispParser import LispParser
 from src.LispVisitor import LispVisitor
-from src.rendering import (
-    CodeCreator,
-    wrap_codes,
-    join_codes,
-    transfer_secondary,
-    nest_codes,
+from src.environment import Environment
+from src.ir import (
+    Temp,
+    Value,
+    ValueType,
+    Argument,
+    Frame,
+    Address,
+    Block,
+    Instruction,
+    Sequence,
+    Function,
+    FunctionKind,
+    Program,
+    wrap,
+    nest,
+    join,
+    transfer_cleanup,
+    ConstantKind,
+    MakeConstant,
+    MakeLambda,
+    MakeEvaluable,
+    MakeRestList,
+    GetVariable,
+    SetVariable,
+    UpdateVariable,
+    Call,
+    Apply,
+    ArityError,
+    CallBuiltin,
+    Force,
+    NativeCall,
+    ToBoolean,
+    GlobalEnvironment,
+    MakeEnvironment,
+    MoveEnvironment,
+    DestroyEnvironment,
+    DestroyGlobalEnvironment,
+    IncRef,
+    DecRef,
+    If,
+    Loop,
+    Verbatim,
 )
-from src.rendering.codes import MakePrimitiveCode, Code, LambdaCallCode
+from src.ir.passes import TAIL_CALLS_FEATURE
+from src.ir.passes.blocks import Variable, iter_instructions, variable_of
+from src.prelude import Prelude
 from src.symbols import Symbols
 from .ast_context import ASTContext, visit
 from .declarations_context import DeclarationsContext
@@ -24,94 +63,152 @@ from .native_utils import visit_native_function, visit_native_function_types
 from .variable_manager import VariableManager
 
 # (variable, code)
-ExpressionVisitResult = tuple[str, Code]
+ExpressionVisitResult = tuple[Temp, Sequence]
+
+# (None, code) - definitions have no value, the form is the same as in the ExpressionVisitResult
+DefinitionVisitResult = tuple[None, Sequence]
 
 # ([var1, var2, ..., varn], (code1, code2, ..., coden) - same as in the ExpressionVisitResult
-OperandsVisitResult = tuple[list[str], list[Code]]
+OperandsVisitResult = tuple[list[Value], list[Sequence]]
 
 # (variable that matches the last expression, code)
-BodyVisitResult = tuple[str, str]
+BodyVisitResult = tuple[Temp, Block]
 
 # (Codes of creating values of the variables and binding for them, name of the bound variable)
-BindingVisitResult = tuple[Code, str]
+BindingVisitResult = tuple[Sequence, str]
 
 # Codes of the bindings
-BindingListVisitResult = list[Code]
+BindingListVisitResult = list[Sequence]
 
-# Text of the output C-program
-ProgramVisitResult = str
+# (program, variables of the global environment, counters of the variable manager)
+PreludeVisitResult = tuple[Program, list[str], dict[str, int]]
 
 # Name of the function that was declared
 DeclaredFunctionName = str
 
-# List of the codes for each visited program element
-ProgramElementsVisitResult = list[Code]
-
-# For each visited definition there is a secondary part of its code (in first tuple element) and its code without secondary part (in second tuple element)
-LambdaDefinitionsVisitResult = tuple[list[str], list[Code]]
+# (list of the codes for each visited program element, variables of the global environment)
+ProgramElementsVisitResult = tuple[list[Sequence], list[str]]
 
 # (variable of the last expression, list of the codes for each expression)
-LambdaExpressionsVisitResult = tuple[str, list[Code]]
+LambdaExpressionsVisitResult = tuple[Temp, list[Sequence]]
+
+# (number of the fixed formals, whether there is a variadic formal)
+Arity = tuple[int, bool]
+
+# (address of the callee, call)
+CallSite = tuple[Address, Call]
 
 # (Codes for every fixed forma)
-ScalarFormalsVisitResult = list[Code]
+ScalarFormalsVisitResult = list[Sequence]
 
 # (code of variadic formal creation)
-VariadicFormalVisitResult = Code
+VariadicFormalVisitResult = Sequence
 
 # Code with declaration and creation of the formals that will be inserted into the body
-FormalsVisitResult = str
+FormalsVisitResult = Block
+
+# Form of the program that enables features of the translation: (declare feature1 feature2 ...)
+DECLARE = "declare"
 
-ast_context = ASTContext()
+# Features that can be declared
+FEATURES = {TAIL_CALLS_FEATURE}
 
 
 class ASTVisitor(LispVisitor):
-    def __init__(self, symbols: Symbols, code_creator: CodeCreator):
+    def __init__(self, symbols: Symbols, prelude: Optional[Prelude] = None):
         """
-        Class represents a visitor of AST of the Lisp. Result of the visiting - code on C, that can be used in interpretation.
+        Class represents a visitor of AST of the Lisp. Result of the visiting - program in the IR (see src.ir), that is printed as C-code by the backend.
 
         :param symbols: standard elements.
-        :param code_creator: code creator.
-        :param symbols: symbols.
-        :param code_creator: code creator.
+        :param prelude: translated standard functions written on Lisp, its code is added to the program.
         """
 
         self.__symbols = symbols
-        self.__code_creator = code_creator
-        self.__variable_manager = VariableManager()
+        self.__prelude = prelude
+        self.__variable_manager = VariableManager(
+            None if prelude is None else prelude.counters
+        )
         self.__environment_ctx = EnvironmentContext()
         self.__declaration_ctx = DeclarationsContext()
         self.__let_type_ctx = LetTypeContext()
+        self.__ast_context = ASTContext()
+        self.__features: set[str] = set()
+        self.__arities: dict[Variable, Arity] = {}
+        self.__call_sites: list[CallSite] = []
+
+    @property
+    def ast_context(self) -> ASTContext:
+        """
+        Information about currently visiting AST node. Every visitor has its own one, so visitors can work concurrently.
+        """
 
-    @visit(ast_context)
-    def visitProgram(self, ctx: LispParser.ProgramContext) -> ProgramVisitResult:
-        global_env_var = self.__variable_manager.create_environment_name()
-        main_code = self.__code_creator.get_global_environment()
-        main_code.update_data(var=global_env_var)
+        return self.__ast_context
 
-        program_element_codes = self.__visit_program_elements(
+    @visit
+    def visitProgram(self, ctx: LispParser.ProgramContext) -> Program:
+        prelude = self.__prelude
+
+        # Environment of the prelude is the global one too
+        global_env_var = (
+            self.__create_environment()
+            if prelude is None
+            else Temp("global_env", ValueType.ENVIRONMENT)
+        )
+        global_frame = Frame()
+        main_code = self.__global_environment(global_env_var, global_frame)
+
+        program_element_codes, _ = self.__visit_program_elements(
             main_code=main_code,
             global_env_var=global_env_var,
+            global_frame=global_frame,
             elements=ctx.programElement(),
+            variables=[] if prelude is None else prelude.variables,
         )
 
-        if len(program_element_codes) != 0:
-            main_code.add_main_epilog(f"\n{join_codes(program_element_codes)}")
+        if prelude is not None and prelude.main_body != "":
+            main_code.main.append(Verbatim(prelude.main_body))
+
+        main_code.main.extend(join(program_element_codes))
+
+        program = Program(
+            declarations=[] if prelude is None else list(prelude.declarations),
+            functions=list(self.__declaration_ctx.iter_declarations()),
+            main=main_code.instructions(),
+            features=frozenset(self.__features),
+        )
+        self.__check_call_sites(program)
+
+        return program
+
+    @visit
+    def visit_prelude(self, ctx: LispParser.ProgramContext) -> PreludeVisitResult:
+        """
+        Visits the program with the standard functions. Its functions and the body of the "main" (without creation and destruction of the global environment) become the prelude of other programs.
+        """
+
+        global_env_var = self.__create_environment()
 
-        program_code = self.__code_creator.program()
-        program_code.update_data(
-            declarations=[
-                c.render() for c in self.__declaration_ctx.iter_declarations()
-            ],
-            main_body=main_code.render(),
+        program_element_codes, variables = self.__visit_program_elements(
+            main_code=Sequence(),
+            global_env_var=global_env_var,
+            global_frame=Frame(),
+            elements=ctx.programElement(),
+            variables=[],
         )
 
-        return program_code.render()
+        program = Program(
+            declarations=[],
+            functions=list(self.__declaration_ctx.iter_declarations()),
+            main=join(program_element_codes),
+        )
+        self.__check_call_sites(program)
 
-    @visit(ast_context)
+        return program, variables, self.__variable_manager.counters
+
+    @visit
     def visitPlatformDefinition(
         self, ctx: LispParser.PlatformDefinitionContext
-    ) -> ExpressionVisitResult:
+    ) -> DefinitionVisitResult:
         env = self.__environment_ctx.env
 
         variable_name = ctx.variable().getText()
@@ -135,8 +232,9 @@ class ASTVisitor(LispVisitor):
             )
             body_text += line_text + "\n"
 
+        # Variables of the calls are accessed only by names, so their environments are empty
         procedure_var, procedure_code = self.__visit_procedure(
-            formals_text="", body_text=body_text, env_name=env.name
+            formals=None, body=[Verbatim(body_text)], env=env, frame=Frame(env.frame)
         )
 
         return self.__visit_variable_definition(
@@ -145,10 +243,10 @@ class ASTVisitor(LispVisitor):
             expr_code=procedure_code,
         )
 
-    @visit(ast_context)
+    @visit
     def visitVariableDefinition(
         self, ctx: LispParser.VariableDefinitionContext
-    ) -> ExpressionVisitResult:
+    ) -> DefinitionVisitResult:
         variable_name = ctx.variable().getText()
 
         self.__check_variable_definition(variable_name=variable_name)
@@ -161,25 +259,33 @@ class ASTVisitor(LispVisitor):
             variable_name=variable_name, expr_var=expr_var, expr_code=expr_code
         )
 
-    @visit(ast_context)
+    @visit
     def visitProcedureDefinition(
         self, ctx: LispParser.ProcedureDefinitionContext
-    ) -> ExpressionVisitResult:
+    ) -> DefinitionVisitResult:
         env_var = self.__symbols.LAMBDA_ENV
         env = self.__environment_ctx.env
 
         variable_name = ctx.variable().getText()
         self.__check_variable_definition(variable_name)
+
+        # Redefined variable can be called before the procedure is bound to it
+        if not env.has_variable(variable_name):
+            self.__arities[env.frame, variable_name] = self.__arity_of(
+                ctx.procedureDefinitionFormals()
+            )
+
         env.add(variable_name)
 
         with self.__environment_ctx:
-            self.__environment_ctx.init(name=env_var, code=env.code)
-            formals_text = self.visit(ctx.procedureDefinitionFormals())
-            body_expr_var, body_expr_text = self.visit(ctx.procedureBody())
+            self.__environment_ctx.init(name=env_var, code=env.code, is_function=True)
+            formals = self.visit(ctx.procedureDefinitionFormals())
+            body_expr_var, body = self.visit(ctx.procedureBody())
             procedure_var, procedure_code = self.__visit_procedure(
-                formals_text=formals_text,
-                body_text=body_expr_text,
-                env_name=env.name,
+                formals=formals,
+                body=body,
+                env=env,
+                frame=self.__environment_ctx.env.frame,
                 ret_var=body_expr_var,
             )
 
@@ -189,7 +295,7 @@ class ASTVisitor(LispVisitor):
             expr_code=procedure_code,
         )
 
-    @visit(ast_context)
+    @visit
     def visitProcedureDefinitionFixedFormals(
         self, ctx: LispParser.ProcedureDefinitionFixedFormalsContext
     ) -> FormalsVisitResult:
@@ -197,7 +303,7 @@ class ASTVisitor(LispVisitor):
 
         return self.__visit_formals(formals=formals, has_variadic_formal=False)
 
-    @visit(ast_context)
+    @visit
     def visitProcedureDefinitionVariadicFormal(
         self, ctx: LispParser.ProcedureDefinitionVariadicFormalContext
     ) -> FormalsVisitResult:
@@ -205,7 +311,7 @@ class ASTVisitor(LispVisitor):
 
         return self.__visit_formals(formals=[formal], has_variadic_formal=True)
 
-    @visit(ast_context)
+    @visit
     def visitProcedureDefinitionMixedFormals(
         self, ctx: LispParser.ProcedureDefinitionMixedFormalsContext
     ) -> FormalsVisitResult:
@@ -213,14 +319,14 @@ class ASTVisitor(LispVisitor):
 
         return self.__visit_formals(formals=formals, has_variadic_formal=True)
 
-    @visit(ast_context)
+    @visit
     def visitBoolConstant(
         self, ctx: LispParser.BoolConstantContext
     ) -> ExpressionVisitResult:
         lisp_true = "#t"
         return self.__visit_boolean(ctx.getText() == lisp_true)
 
-    @visit(ast_context)
+    @visit
     def visitCharacterConstant(
         self, ctx: LispParser.CharacterConstantContext
     ) -> ExpressionVisitResult:
@@ -229,35 +335,31 @@ class ASTVisitor(LispVisitor):
         if value == "'":
             value = "\\'"  # Escape single quote
 
-        code = self.__code_creator.make_character()
+        return self.__visit_constant(kind=ConstantKind.CHARACTER, value=f"'{value}'")
 
-        return self.__visit_constant(code=code, value=f"'{value}'")
-
-    @visit(ast_context)
+    @visit
     def visitStringConstant(
         self, ctx: LispParser.StringConstantContext
     ) -> ExpressionVisitResult:
-        code = self.__code_creator.make_string()
-
-        return self.__visit_constant(code=code, value=ctx.getText())
+        return self.__visit_constant(kind=ConstantKind.STRING, value=ctx.getText())
 
-    @visit(ast_context)
+    @visit
     def visitIntegerConstant(
         self, ctx: LispParser.IntegerConstantContext
     ) -> ExpressionVisitResult:
-        code = self.__code_creator.make_int()
-
-        return self.__visit_constant(code=code, value=int(ctx.getText()))
+        return self.__visit_constant(
+            kind=ConstantKind.INTEGER, value=int(ctx.getText())
+        )
 
-    @visit(ast_context)
+    @visit
     def visitFloatConstant(
         self, ctx: LispParser.FloatConstantContext
     ) -> ExpressionVisitResult:
-        code = self.__code_creator.make_float()
-
-        return self.__visit_constant(code=code, value=float(ctx.getText()))
+        return self.__visit_constant(
+            kind=ConstantKind.FLOAT, value=float(ctx.getText())
+        )
 
-    @visit(ast_context)
+    @visit
     def visitVariable(self, ctx: LispParser.VariableContext) -> ExpressionVisitResult:
         env = self.__environment_ctx.env
         variable_name = ctx.getText()
@@ -265,13 +367,20 @@ class ASTVisitor(LispVisitor):
         if not env.has_variable_recursively(variable_name):
             raise UnexpectedIdentifierException(variable_name, ctx)
 
-        expr_var = self.__variable_manager.create_object_name()
-        expr_code = self.__code_creator.get_variable_value()
-        expr_code.update_data(var=expr_var, env=env.name, name=variable_name)
+        expr_var = self.__create_object()
+        expr_code = Sequence(
+            [
+                GetVariable(
+                    expr_var,
+                    self.__env_var(env),
+                    self.__resolve_variable(env, variable_name),
+                )
+            ]
+        )
 
         return expr_var, expr_code
 
-    @visit(ast_context)
+    @visit
     def visitProcedureCall(
         self, ctx: LispParser.ProcedureCallContext
     ) -> ExpressionVisitResult:
@@ -279,40 +388,37 @@ class ASTVisitor(LispVisitor):
         operands = ctx.operand()
 
         return self.__visit_procedure_call(
-            operator=operator,
-            operands=operands,
-            expr_code=self.__code_creator.lambda_call(),
+            operator=operator, operands=operands, call_type=Call
         )
 
-    @visit(ast_context)
+    @visit
     def visitApply(self, ctx: LispParser.ApplyContext) -> ExpressionVisitResult:
         operator = ctx.operator()
         operands = ctx.operand()
 
         return self.__visit_procedure_call(
-            operator=operator,
-            operands=operands,
-            expr_code=self.__code_creator.lambda_call_list(),
+            operator=operator, operands=operands, call_type=Apply
         )
 
-    @visit(ast_context)
+    @visit
     def visitProcedure(self, ctx: LispParser.ProcedureContext) -> ExpressionVisitResult:
         env_var = self.__symbols.LAMBDA_ENV
         env = self.__environment_ctx.env
 
         with self.__environment_ctx:
-            self.__environment_ctx.init(name=env_var, code=env.code)
-            formals_text = self.visit(ctx.procedureFormals())
-            body_expr_var, body_expr_text = self.visit(ctx.procedureBody())
+            self.__environment_ctx.init(name=env_var, code=env.code, is_function=True)
+            formals = self.visit(ctx.procedureFormals())
+            body_expr_var, body = self.visit(ctx.procedureBody())
 
             return self.__visit_procedure(
-                formals_text=formals_text,
-                body_text=body_expr_text,
-                env_name=env.name,
+                formals=formals,
+                body=body,
+                env=env,
+                frame=self.__environment_ctx.env.frame,
                 ret_var=body_expr_var,
             )
 
-    @visit(ast_context)
+    @visit
     def visitProcedureFixedFormals(
         self, ctx: LispParser.ProcedureFixedFormalsContext
     ) -> FormalsVisitResult:
@@ -320,7 +426,7 @@ class ASTVisitor(LispVisitor):
 
         return self.__visit_formals(formals=formals, has_variadic_formal=False)
 
-    @visit(ast_context)
+    @visit
     def visitProcedureVariadicFormal(
         self, ctx: LispParser.ProcedureVariadicFormalContext
     ) -> FormalsVisitResult:
@@ -328,7 +434,7 @@ class ASTVisitor(LispVisitor):
 
         return self.__visit_formals(formals=[formal], has_variadic_formal=True)
 
-    @visit(ast_context)
+    @visit
     def visitProcedureMixedFormals(
         self, ctx: LispParser.ProcedureMixedFormalsContext
     ) -> FormalsVisitResult:
@@ -336,7 +442,7 @@ class ASTVisitor(LispVisitor):
 
         return self.__visit_formals(formals=formals, has_variadic_formal=True)
 
-    @visit(ast_context)
+    @visit
     def visitProcedureBody(
         self, ctx: LispParser.ProcedureBodyContext
     ) -> BodyVisitResult:
@@ -344,17 +450,14 @@ class ASTVisitor(LispVisitor):
 
         last_expr_var, expr_codes = self.__visit_expression_sequence(ctx.expression())
 
-        result_increase_ref_count = self.__code_creator.increase_ref_count()
-        result_increase_ref_count.update_data(var=last_expr_var)
-
-        body = wrap_codes(result_increase_ref_count, expr_codes)
+        body = wrap(Sequence([IncRef(last_expr_var)]), expr_codes)
 
         return (
             last_expr_var,
-            join_codes(definitions_codes + [body]),
+            join(definitions_codes + [body]),
         )
 
-    @visit(ast_context)
+    @visit
     def visitCondition(self, ctx: LispParser.ConditionContext) -> ExpressionVisitResult:
         test = ctx.test()
         consequent = ctx.consequent()
@@ -377,29 +480,29 @@ class ASTVisitor(LispVisitor):
             alternate_code=alternate_code,
         )
 
-    @visit(ast_context)
+    @visit
     def visitAnd(self, ctx: LispParser.AndContext) -> ExpressionVisitResult:
         return self.__visit_and(ctx.test())
 
-    @visit(ast_context)
+    @visit
     def visitOr(self, ctx: LispParser.OrContext) -> ExpressionVisitResult:
         return self.__visit_or(ctx.test())
 
-    @visit(ast_context)
+    @visit
     def visitLet(self, ctx: LispParser.LetContext) -> ExpressionVisitResult:
         return self.__visit_let(let_type=LetType.LET)
 
-    @visit(ast_context)
+    @visit
     def visitLetAsterisk(
         self, ctx: LispParser.LetAsteriskContext
     ) -> ExpressionVisitResult:
         return self.__visit_let(let_type=LetType.LET_ASTERISK)
 
-    @visit(ast_context)
+    @visit
     def visitLetRec(self, ctx: LispParser.LetRecContext) -> ExpressionVisitResult:
         return self.__visit_let(let_type=LetType.LET_REC)
 
-    @visit(ast_context)
+    @visit
     def visitBindingList(
         self, ctx: LispParser.BindingListContext
     ) -> BindingListVisitResult:
@@ -431,22 +534,19 @@ class ASTVisitor(LispVisitor):
 
         return binding_list_codes
 
-    @visit(ast_context)
+    @visit
     def visitBinding(self, ctx: LispParser.BindingContext) -> BindingVisitResult:
         env = self.__environment_ctx.env
         variable_name = ctx.variable().getText()
         expression = ctx.expression()
         expr_var, expr_code = self.visit(expression)
-        binding_code = self.__code_creator.set_variable_value()
-        binding_code.update_data(
-            env=env.name,
-            name=variable_name,
-            value=expr_var,
+        binding_code = Sequence(
+            [SetVariable(self.__env_var(env), variable_name, expr_var, env.frame)]
         )
 
-        return wrap_codes(binding_code, expr_code), variable_name
+        return wrap(binding_code, expr_code), variable_name
 
-    @visit(ast_context)
+    @visit
     def visitEnvironmentBody(
         self, ctx: LispParser.EnvironmentBodyContext
     ) -> BodyVisitResult:
@@ -462,14 +562,14 @@ class ASTVisitor(LispVisitor):
 
         for e in expressions:
             e_var, e_code = self.visit(e)
-            transfer_secondary(e_code, env.code)
+            transfer_cleanup(e_code, env.code)
 
             expr_vars.append(e_var)
             body_codes.append(e_code)
 
-        return expr_vars[-1], join_codes(body_codes)
+        return expr_vars[-1], join(body_codes)
 
-    @visit(ast_context)
+    @visit
     def visitAssignment(
         self, ctx: LispParser.AssignmentContext
     ) -> ExpressionVisitResult:
@@ -485,61 +585,69 @@ class ASTVisitor(LispVisitor):
 
         expr_var, expr_code = self.visit(expression)
 
-        assignment_var = self.__variable_manager.create_object_name()
-        assignment_code = self.__code_creator.update_variable_value()
-        assignment_code.update_data(
-            var=assignment_var,
-            env=env.name,
-            name=variable_name,
-            value=expr_var,
+        assignment_var = self.__create_object()
+        assignment_code = self.__owned(
+            UpdateVariable(
+                assignment_var,
+                self.__env_var(env),
+                self.__resolve_variable(env, variable_name),
+                expr_var,
+            )
         )
 
-        return assignment_var, wrap_codes(assignment_code, expr_code)
+        return assignment_var, wrap(assignment_code, expr_code)
 
-    @visit(ast_context)
+    @visit
     def visitDelay(self, ctx: LispParser.DelayContext) -> ExpressionVisitResult:
         env_var = self.__symbols.EVALUABLE_ENV
         env = self.__environment_ctx.env
 
         with self.__environment_ctx:
-            self.__environment_ctx.init(name=env_var, code=env.code)
+            # Promise is evaluated in the environment where it's created
+            self.__environment_ctx.init(
+                name=env_var, code=env.code, frame=env.frame, is_function=True
+            )
 
             return self.__visit_evaluable(ctx.expression())
 
-    @visit(ast_context)
+    @visit
     def visitForce(self, ctx: LispParser.ForceContext) -> ExpressionVisitResult:
         expr_var, expr_code = self.visit(ctx.expression())
 
-        force_var = self.__variable_manager.create_object_name()
-        force_code = self.__code_creator.evaluation()
-        force_code.update_data(var=force_var, evaluable_var=expr_var)
+        force_var = self.__create_object()
+        force_code = self.__owned(Force(force_var, expr_var))
 
-        return force_var, wrap_codes(force_code, expr_code)
+        return force_var, wrap(force_code, expr_code)
 
-    @visit(ast_context)
+    @visit
     def visitNativeCall(
         self, ctx: LispParser.NativeCallContext
     ) -> ExpressionVisitResult:
         function = ctx.nativeFunction().getText()
 
-        library_name, function_name = visit_native_function(function, ast_context)
+        library_name, function_name = visit_native_function(
+            function, self.__ast_context
+        )
 
         types = [t.getText() for t in ctx.nativeType()]
-        args_types = visit_native_function_types(types, self.__symbols, ast_context)
-
-        native_var = self.__variable_manager.create_object_name()
-        native_code = self.__code_creator.native_call()
-        native_code.update_data(
-            var=native_var,
-            function=function_name,
-            library=library_name,
-            result_type=args_types[0],
-            args_types=args_types[1:],
+        args_types = visit_native_function_types(
+            types, self.__symbols, self.__ast_context
+        )
+
+        native_var = self.__create_object()
+        native_code = self.__owned(
+            NativeCall(
+                native_var,
+                library=library_name,
+                function=function_name,
+                result_type=args_types[0],
+                args_types=args_types[1:],
+            )
         )
 
         return native_var, native_code
 
-    @visit(ast_context)
+    @visit
     def visitDo(self, ctx: LispParser.DoContext) -> ExpressionVisitResult:
         variables: list[LispParser.DoVariableContext] = ctx.doVariable()
         test = ctx.doTest()
@@ -549,18 +657,20 @@ class ASTVisitor(LispVisitor):
         variables_names = [v.doVariableName().getText() for v in variables]
         self.__check_do_variables(variables_names)
 
-        loop_var = self.__variable_manager.create_object_name()
+        loop_var = self.__create_object()
 
         with self.__environment_ctx:
-            new_env_code = self.__code_creator.make_environment()
+            parent_env = self.__environment_ctx.env
+            env_var = self.__create_environment()
+            frame = Frame(parent_env.frame)
+            new_env_code = self.__make_environment(
+                env_var, self.__env_var(parent_env), frame
+            )
             self.__environment_ctx.init(
-                name=self.__variable_manager.create_environment_name(),
-                code=new_env_code,
+                name=env_var.name, code=new_env_code, frame=frame
             )
             env = self.__environment_ctx.env
 
-            new_env_code.update_data(var=env.name, parent=env.parent.name)
-
             init_codes = []
             for v in variables:
                 name = v.doVariableName().getText()
@@ -574,16 +684,15 @@ class ASTVisitor(LispVisitor):
 
             env_code = env.code
 
-            pre_body = env_code.render_main()
+            pre_body = list(env_code.main)
             for _, c in init_codes:
-                pre_body += c.render() + "\n"
+                pre_body.extend(c.instructions())
 
             # Test
             test_var, test_code = self.visit(test)
-            test_value_var = f"{test_var}_value"
-            test_value_code = self.__code_creator.get_boolean_value()
-            test_value_code.update_data(var=test_value_var, arg=test_var)
-            test_body = wrap_codes(test_value_code, test_code).render()
+            test_value_var = Temp(f"{test_var.name}_value", ValueType.BOOLEAN)
+            test_value_code = Sequence([ToBoolean(test_value_var, test_var)])
+            test_body = wrap(test_value_code, test_code).instructions()
 
             # True test
             if expressions:
@@ -594,19 +703,16 @@ class ASTVisitor(LispVisitor):
                 var, code = self.__visit_unspecified()
                 last_expr_var = var
                 expr_codes = [code]
-            loop_var_increase_ref_count_code = self.__code_creator.increase_ref_count()
-            loop_var_increase_ref_count_code.update_data(var=last_expr_var)
-            true_test_body = wrap_codes(
-                loop_var_increase_ref_count_code, expr_codes
-            ).render()
+            true_test_body = wrap(
+                Sequence([IncRef(last_expr_var)]), expr_codes
+            ).instructions()
 
             # False test
             ## Commands
             command_codes = [self.visit(c)[1] for c in commands]
 
             ## Step
-            move_code = self.__code_creator.move_environment()
-            move_code.update_data(var=env.name, env=env.name)
+            move_code = Sequence([MoveEnvironment(env_var)])
 
             step_codes = []
 
@@ -623,96 +729,227 @@ class ASTVisitor(LispVisitor):
 
                 step_codes.append(step_code)
 
-            iteration_body = join_codes([move_code] + step_codes)
-
-            loop_code = self.__code_creator.loop()
-            loop_code.update_data(
-                var=loop_var,
-                pre_body=pre_body,
-                post_body=env_code.render_secondary(),
-                test_body=test_body,
-                test_value=test_value_var,
-                true_test_body=true_test_body,
-                true_test_var=last_expr_var,
-                false_test_body=join_codes(command_codes) + "\n" + iteration_body,
+            iteration_body = join([move_code] + step_codes)
+
+            loop_code = self.__owned(
+                Loop(
+                    loop_var,
+                    test_block=test_body,
+                    test_value=test_value_var,
+                    exit_block=true_test_body,
+                    exit_value=last_expr_var,
+                    body_block=join(command_codes) + iteration_body,
+                )
             )
+            loop_code.main[:0] = pre_body
+            loop_code.main.extend(env_code.cleanup)
 
         return loop_var, loop_code
 
-    @visit(ast_context)
+    @visit
     def visitBegin(self, ctx: LispParser.BeginContext) -> ExpressionVisitResult:
         last_expr_var, expr_codes = self.__visit_expression_sequence(ctx.expression())
 
-        return last_expr_var, nest_codes(expr_codes)
+        return last_expr_var, nest(expr_codes)
 
     def __visit_program_elements(
         self,
-        main_code: Code,
-        global_env_var: str,
+        main_code: Sequence,
+        global_env_var: Temp,
+        global_frame: Frame,
         elements: list[LispParser.ProgramElementContext],
+        variables: list[str],
     ) -> ProgramElementsVisitResult:
         with self.__environment_ctx:
-            self.__environment_ctx.init(code=main_code, name=global_env_var)
+            self.__environment_ctx.init(
+                code=main_code, name=global_env_var.name, frame=global_frame
+            )
             env = self.__environment_ctx.env
 
             for lisp_name, _ in self.__symbols.get_api_function_items():
                 env.add(lisp_name)
 
-            return [self.visit(e)[1] for e in elements]
+            env.extend(variables)
+
+            codes = [
+                self.visit(e)[1] for e in elements if not self.__visit_declaration(e)
+            ]
+
+            defined_variables = [
+                v
+                for v in env.variables
+                if not self.__symbols.has_api_function_symbol(v)
+            ]
+
+            return codes, defined_variables
+
+    def __visit_declaration(self, element: LispParser.ProgramElementContext) -> bool:
+        """
+        Checks whether the element of the program is a declaration "(declare feature ...)" and, if it is, enables the features. Declaration has no code, it's recognized only at the top level when "declare" isn't defined by the program.
+        """
+
+        expression = element.expression()
+        call = None if expression is None else expression.procedureCall()
+        if call is None:
+            return False
+
+        variable = call.operator().expression().variable()
+        if (
+            variable is None
+            or variable.getText() != DECLARE
+            or self.__environment_ctx.env.has_variable(DECLARE)
+        ):
+            return False
+
+        for operand in call.operand():
+            feature = operand.expression().variable()
+
+            if feature is None or feature.getText() not in FEATURES:
+                raise VisitingException(
+                    f'Unknown feature "{operand.getText()}" is declared', operand
+                )
+
+            self.__features.add(feature.getText())
+
+        return True
 
     def __visit_procedure_call(
         self,
         operator: LispParser.ExpressionContext,
         operands: list[LispParser.ExpressionContext],
-        expr_code: LambdaCallCode,
+        call_type: type[Call],
     ) -> ExpressionVisitResult:
+        builtin = self.__find_builtin(operator) if call_type is Call else None
+
+        if builtin is not None:
+            symbols = self.__symbols
+            operand_vars, operand_codes = self.__visit_operands(operands)
+
+            binary_function = (
+                symbols.try_find_binary_api_function(builtin)
+                if len(operands) == 2
+                else None
+            )
+
+            # Builtin is found by its API symbol, so the function always exists
+            function = binary_function or symbols.try_find_api_function(builtin)
+            assert function is not None
+
+            expr_var = self.__create_object()
+            expr_code = self.__owned(
+                CallBuiltin(
+                    expr_var,
+                    builtin,
+                    function,
+                    operand_vars,
+                    binary=binary_function is not None,
+                )
+            )
+
+            return expr_var, wrap(expr_code, operand_codes)
+
         operator_var, operator_code = self.visit(operator)
         operand_vars, operand_codes = self.__visit_operands(operands)
 
-        expr_var = self.__variable_manager.create_object_name()
-        expr_code.update_data(
-            var=expr_var,
-            lambda_var=operator_var,
-            args=operand_vars,
-        )
+        expr_var = self.__create_object()
+        call = call_type(expr_var, operator_var, operand_vars)
+        expr_code = self.__owned(call)
 
-        wrapped_expr_code = wrap_codes(expr_code, [operator_code] + operand_codes)
+        variable = operator.expression().variable()
+        if call_type is Call and variable is not None:
+            env = self.__environment_ctx.env
+            self.__call_sites.append(
+                (self.__resolve_variable(env, variable.getText()), call)
+            )
+
+        wrapped_expr_code = wrap(expr_code, [operator_code] + operand_codes)
 
         return expr_var, wrapped_expr_code
 
-    def __visit_if(
-        self,
-        test_var: str,
-        test_code: Code,
-        consequent_var: str,
-        consequent_code: Code,
-        alternate_var: str,
-        alternate_code: Code,
-    ) -> ExpressionVisitResult:
-        var = self.__variable_manager.create_object_name()
-        code = self.__code_creator.if_()
+    def __arity_of(
+        self, formals: LispParser.ProcedureDefinitionFormalsContext
+    ) -> Arity:
+        fixed_formals = formals.procedureDefinitionFixedFormals()
+        if fixed_formals is not None:
+            return len(fixed_formals.variable()), False
 
-        consequent_increase_ref_count_code = self.__code_creator.increase_ref_count()
-        consequent_increase_ref_count_code.update_data(var=consequent_var)
+        mixed_formals = formals.procedureDefinitionMixedFormals()
+        if mixed_formals is not None:
+            return len(mixed_formals.variable()) - 1, True
 
-        alternate_increase_ref_count_code = self.__code_creator.increase_ref_count()
-        alternate_increase_ref_count_code.update_data(var=alternate_var)
+        return 0, True
 
-        consequent_code = wrap_codes(
-            consequent_increase_ref_count_code, consequent_code
-        )
-        alternate_code = wrap_codes(alternate_increase_ref_count_code, alternate_code)
-
-        code.update_data(
-            var=var,
-            cond_var=test_var,
-            then_var=consequent_var,
-            else_var=alternate_var,
-            then_body=consequent_code.render(),
-            else_body=alternate_code.render(),
-            pre_body=test_code.render_main(),
-            post_body=test_code.render_secondary(),
+    def __check_call_sites(self, program: Program) -> None:
+        """
+        Checks number of the arguments of the calls whose callee is known: the variable of the procedure definition that is bound once and never changed. Function reads its arguments from the array that is passed by the caller without checks, so the call with other number of the arguments is replaced by the error. The error is raised only when the call is reached, so such calls in the code that isn't executed don't change the program.
+        """
+
+        bindings: dict[Variable, int] = {}
+        for block in [program.main, *(f.body for f in program.functions)]:
+            for i in iter_instructions(block):
+                if isinstance(i, (SetVariable, UpdateVariable)):
+                    v = variable_of(i)
+                    bindings[v] = bindings.get(v, 0) + 1
+
+        errors: dict[int, ArityError] = {}
+
+        for address, call in self.__call_sites:
+            variable = address.frame, address.name
+            if variable not in self.__arities or bindings.get(variable) != 1:
+                continue
+
+            count = len(call.args)
+            fixed_count, is_variadic = self.__arities[variable]
+            if count == fixed_count or (is_variadic and count > fixed_count):
+                continue
+
+            errors[id(call)] = ArityError(
+                call.result, address.name, fixed_count, is_variadic, count
+            )
+
+        if errors:
+            for block in [program.main, *(f.body for f in program.functions)]:
+                _replace_calls(block, errors)
+
+    def __find_builtin(self, operator: LispParser.OperatorContext) -> Optional[str]:
+        """
+        Returns name of the standard function if the operator is its variable. Standard functions can't be redefined or shadowed (definitions, formals and bindings with their names are rejected), so such variable always refers to the function of the global environment.
+        """
+
+        variable = operator.expression().variable()
+        if variable is None:
+            return None
+
+        name = variable.getText()
+        return name if self.__symbols.has_api_function_symbol(name) else None
+
+    def __visit_if(
+        self,
+        test_var: Temp,
+        test_code: Sequence,
+        consequent_var: Temp,
+        consequent_code: Sequence,
+        alternate_var: Temp,
+        alternate_code: Sequence,
+    ) -> ExpressionVisitResult:
+        var = self.__create_object()
+
+        # Result of the condition is owned, so every branch owns the value of its expression
+        consequent_code = wrap(Sequence([IncRef(consequent_var)]), consequent_code)
+        alternate_code = wrap(Sequence([IncRef(alternate_var)]), alternate_code)
+
+        code = self.__owned(
+            If(
+                var,
+                condition=test_var,
+                then_block=consequent_code.instructions(),
+                then_value=consequent_var,
+                else_block=alternate_code.instructions(),
+                else_value=alternate_var,
+            )
         )
+        code.main[:0] = test_code.main
+        code.main.extend(test_code.cleanup)
 
         return var, code
 
@@ -720,10 +957,7 @@ class ASTVisitor(LispVisitor):
         self, operands: list[LispParser.ExpressionContext]
     ) -> ExpressionVisitResult:
         if not operands:
-            var = self.__variable_manager.create_object_name()
-            code = self.__code_creator.make_true()
-            code.update_data(var=var)
-            return var, code
+            return self.__visit_boolean(True)
 
         if len(operands) == 1:
             return self.visit(operands[0])
@@ -739,7 +973,7 @@ class ASTVisitor(LispVisitor):
         return self.__visit_and2(op1_var, op1_code, op2_var, op2_code)
 
     def __visit_and2(
-        self, op1_var: str, op1_code: Code, op2_var: str, op2_code: Code
+        self, op1_var: Temp, op1_code: Sequence, op2_var: Temp, op2_code: Sequence
     ) -> ExpressionVisitResult:
         test_var, test_code = op1_var, op1_code
         consequent_var, consequent_code = op2_var, op2_code
@@ -758,10 +992,7 @@ class ASTVisitor(LispVisitor):
         self, operands: list[LispParser.ExpressionContext]
     ) -> ExpressionVisitResult:
         if not operands:
-            var = self.__variable_manager.create_object_name()
-            code = self.__code_creator.make_false()
-            code.update_data(var=var)
-            return var, code
+            return self.__visit_boolean(False)
 
         if len(operands) == 1:
             return self.visit(operands[0])
@@ -777,11 +1008,11 @@ class ASTVisitor(LispVisitor):
         return self.__visit_or2(op1_var, op1_code, op2_var, op2_code)
 
     def __visit_or2(
-        self, op1_var: str, op1_code: Code, op2_var: str, op2_code: Code
+        self, op1_var: Temp, op1_code: Sequence, op2_var: Temp, op2_code: Sequence
     ) -> ExpressionVisitResult:
         test_var, test_code = op1_var, op1_code
 
-        consequent_var, consequent_code = (op1_var, self.__code_creator.empty())
+        consequent_var, consequent_code = (op1_var, Sequence())
 
         alternate_var, alternate_code = op2_var, op2_code
 
@@ -795,44 +1026,39 @@ class ASTVisitor(LispVisitor):
         )
 
     def __add_lambda_declaration(
-        self, formals_text: str, body_text: str, ret_var: Optional[str]
+        self,
+        formals: Optional[Block],
+        body: Block,
+        ret_var: Optional[Temp],
     ) -> DeclaredFunctionName:
-        function_code = self.__code_creator.lambda_definition()
         function_name = self.__variable_manager.create_lambda_function_name()
 
-        function_body_text = formals_text + "\n" if formals_text else ""
-        function_body_text += body_text
-
-        function_code.update_data(
-            func=function_name,
-            ret_var=ret_var,
-            body=function_body_text,
+        function = Function(
+            name=function_name,
+            kind=FunctionKind.LAMBDA,
+            body=body if formals is None else formals + body,
+            result=ret_var,
         )
 
-        self.__declaration_ctx.add_declaration(function_code)
+        self.__declaration_ctx.add_declaration(function)
 
         return function_name
 
     def __add_evaluable_declaration(
         self, expression: LispParser.ExpressionContext
     ) -> DeclaredFunctionName:
-        function_code = self.__code_creator.evaluable_definition()
         expr_var, expr_code = self.visit(expression)
 
         function_name = self.__variable_manager.create_evaluable_function_name()
 
-        result_increase_ref_count = self.__code_creator.increase_ref_count()
-        result_increase_ref_count.update_data(var=expr_var)
-
-        body = wrap_codes(result_increase_ref_count, expr_code).render()
-
-        function_code.update_data(
-            func=function_name,
-            ret_var=expr_var,
-            body=body,
+        function = Function(
+            name=function_name,
+            kind=FunctionKind.EVALUABLE,
+            body=wrap(Sequence([IncRef(expr_var)]), expr_code).instructions(),
+            result=expr_var,
         )
 
-        self.__declaration_ctx.add_declaration(function_code)
+        self.__declaration_ctx.add_declaration(function)
 
         return function_name
 
@@ -850,22 +1076,19 @@ class ASTVisitor(LispVisitor):
             )
         else:
             fixed_formals = formals
-            variadic_formal_code = self.__code_creator.empty()
+            variadic_formal_code = Sequence()
 
         fixed_formals_codes = self.__visit_scalar_formals(fixed_formals)
 
-        return join_codes(fixed_formals_codes + [variadic_formal_code])
+        return join(fixed_formals_codes + [variadic_formal_code])
 
     def __visit_scalar_formals(self, formals: list[str]) -> ScalarFormalsVisitResult:
-        args_name = self.__symbols.LAMBDA_ARGS
-
         env = self.__environment_ctx.env
-        codes: list[Code] = []
+        codes: list[Sequence] = []
 
         for i, param_name in enumerate(formals):
-            current_arg_code = self.__code_creator.set_variable_value()
-            current_arg_code.update_data(
-                env=env.name, name=param_name, value=f"{args_name}[{i}]"
+            current_arg_code = Sequence(
+                [SetVariable(self.__env_var(env), param_name, Argument(i), env.frame)]
             )
             env.add(param_name)
 
@@ -878,114 +1101,106 @@ class ASTVisitor(LispVisitor):
         formal: str,
         start_index: int,
     ) -> VariadicFormalVisitResult:
-        count_name = self.__symbols.LAMBDA_COUNT
-        args_name = self.__symbols.LAMBDA_ARGS
-
         env = self.__environment_ctx.env
-        variadic_formal_list_var = self.__variable_manager.create_object_name()
+        variadic_formal_list_var = self.__create_object()
 
-        if start_index == 0:
-            count = count_name
-            args = args_name
-        else:
-            count = f"{count_name}-{start_index}"
-            args = f"{args_name}+{start_index}"
-
-        variadic_formal_list_code = self.__code_creator.make_list_from_array()
-        variadic_formal_list_code.update_data(
-            var=variadic_formal_list_var, count=count, elements=args
+        variadic_formal_list_code = self.__owned(
+            MakeRestList(variadic_formal_list_var, start_index)
         )
 
-        code = self.__code_creator.set_variable_value()
-        code.update_data(env=env.name, name=formal, value=variadic_formal_list_var)
+        code = Sequence(
+            [
+                SetVariable(
+                    self.__env_var(env), formal, variadic_formal_list_var, env.frame
+                )
+            ]
+        )
         env.add(formal)
 
-        return wrap_codes(code, variadic_formal_list_code)
+        return wrap(code, variadic_formal_list_code)
 
     def __visit_expression_sequence(
         self, expressions: list[LispParser.ExpressionContext]
     ) -> LambdaExpressionsVisitResult:
-        last_expr_var = ""
+        expr_vars = []
         expr_codes = []
 
-        for i, e in enumerate(expressions):
+        for e in expressions:
             e_var, e_code = self.visit(e)
-            last_expr_var = e_var
+            expr_vars.append(e_var)
             expr_codes.append(e_code)
 
-        return last_expr_var, expr_codes
+        return expr_vars[-1], expr_codes
 
     def __visit_let(
         self,
         let_type: LetType,
     ) -> ExpressionVisitResult:
         env = self.__environment_ctx.env
-        ctx = ast_context.ctx  # LetContext/LetAsteriskContext/LetRecContext
+        ctx = self.__ast_context.ctx  # LetContext/LetAsteriskContext/LetRecContext
 
-        new_env_var = self.__variable_manager.create_environment_name()
-        new_env_code = self.__code_creator.make_environment()
-        new_env_code.update_data(var=new_env_var, parent=env.name)
+        new_env_var = self.__create_environment()
+        new_frame = Frame(env.frame)
+        new_env_code = self.__make_environment(
+            new_env_var, self.__env_var(env), new_frame
+        )
 
         binding_list = ctx.bindingList()
 
         with self.__environment_ctx:
-            # TODO: parent устанавливается в new_env_code.update_data() и неявно в self.__environment_ctx.init
-            self.__environment_ctx.init(code=new_env_code, name=new_env_var)
+            # TODO: parent устанавливается в __make_environment() и неявно в self.__environment_ctx.init
+            self.__environment_ctx.init(
+                code=new_env_code, name=new_env_var.name, frame=new_frame
+            )
             self.__let_type_ctx.visit(let_type)
 
             bindings_codes = [c for c in self.visit(binding_list)]
-            body_var, body_code = self.visit(ctx.environmentBody())
+            body_var, body = self.visit(ctx.environmentBody())
 
-            joined_bindings_codes = join_codes(bindings_codes).replace("\n\n", "\n")
-            new_env_code.add_main_epilog(f"{joined_bindings_codes}\n{body_code}")
+            new_env_code.main.extend(join(bindings_codes))
+            new_env_code.main.extend(body)
 
         return body_var, new_env_code
 
     def __visit_constant(
-        self, code: MakePrimitiveCode, value: Union[str, int, float]
+        self, kind: ConstantKind, value: Union[str, int, float]
     ) -> ExpressionVisitResult:
-        expr_var = self.__variable_manager.create_object_name()
-        code.update_data(var=expr_var, value=value)
+        expr_var = self.__create_object()
 
-        return expr_var, code
+        return expr_var, self.__owned(MakeConstant(expr_var, kind, value))
 
     def __visit_operands(self, operands) -> OperandsVisitResult:
         operand_vars = []
         operand_codes = []
 
         for op in operands:
-            op_var, op_template = self.visit(op)
+            op_var, op_code = self.visit(op)
             operand_vars.append(op_var)
-            operand_codes.append(op_template)
+            operand_codes.append(op_code)
 
         return operand_vars, operand_codes
 
     def __visit_boolean(self, value: bool) -> ExpressionVisitResult:
-        if value:
-            code = self.__code_creator.make_true()
-        else:
-            code = self.__code_creator.make_false()
+        var = self.__create_object()
+        kind = ConstantKind.TRUE if value else ConstantKind.FALSE
 
-        var = self.__variable_manager.create_object_name()
-        code.update_data(var=var)
-
-        return var, code
+        return var, self.__owned(MakeConstant(var, kind))
 
     def __visit_procedure(
         self,
-        formals_text: str,
-        body_text: str,
-        env_name: str,
-        ret_var: Optional[str] = None,
+        formals: Optional[Block],
+        body: Block,
+        env: Environment,
+        frame: Frame,
+        ret_var: Optional[Temp] = None,
     ) -> ExpressionVisitResult:
         function_name = self.__add_lambda_declaration(
-            formals_text=formals_text, body_text=body_text, ret_var=ret_var
+            formals=formals, body=body, ret_var=ret_var
         )
 
-        lambda_var = self.__variable_manager.create_object_name()
-        lambda_creation_code = self.__code_creator.make_lambda()
-        lambda_creation_code.update_data(
-            var=lambda_var, func=function_name, env=env_name
+        lambda_var = self.__create_object()
+        lambda_creation_code = self.__owned(
+            MakeLambda(lambda_var, function_name, self.__env_var(env), frame)
         )
 
         return lambda_var, lambda_creation_code
@@ -997,40 +1212,89 @@ class ASTVisitor(LispVisitor):
 
         function_name = self.__add_evaluable_declaration(expression)
 
-        evaluable_var = self.__variable_manager.create_object_name()
-        evaluable_creation_code = self.__code_creator.make_evaluable()
-        evaluable_creation_code.update_data(
-            var=evaluable_var, func=function_name, env=parent_env.name
+        evaluable_var = self.__create_object()
+        evaluable_creation_code = self.__owned(
+            MakeEvaluable(
+                evaluable_var,
+                function_name,
+                self.__env_var(parent_env),
+                parent_env.frame,
+            )
         )
 
         return evaluable_var, evaluable_creation_code
 
     def __visit_variable_definition(
-        self, variable_name: str, expr_var: str, expr_code: Code
-    ) -> ExpressionVisitResult:
+        self, variable_name: str, expr_var: Temp, expr_code: Sequence
+    ) -> DefinitionVisitResult:
         env = self.__environment_ctx.env
 
-        definition_code = self.__code_creator.set_variable_value()
-        definition_code.update_data(
-            env=env.name,
-            name=variable_name,
-            value=expr_var,
+        definition_code = Sequence(
+            [SetVariable(self.__env_var(env), variable_name, expr_var, env.frame)]
         )
 
         # First element is ignored and needed to unify the processing of expressions and definitions
-        return "", wrap_codes(definition_code, expr_code)
+        return None, wrap(definition_code, expr_code)
 
     def __visit_unspecified(self) -> ExpressionVisitResult:
-        var = self.__variable_manager.create_object_name()
-        code = self.__code_creator.make_unspecified()
-        code.update_data(var=var)
+        var = self.__create_object()
 
-        return var, code
+        return var, self.__owned(MakeConstant(var, ConstantKind.UNSPECIFIED))
+
+    def __global_environment(self, env_var: Temp, frame: Frame) -> Sequence:
+        return Sequence(
+            [GlobalEnvironment(env_var, frame)], [DestroyGlobalEnvironment(env_var)]
+        )
+
+    def __make_environment(
+        self, env_var: Temp, parent_var: Temp, frame: Frame
+    ) -> Sequence:
+        return Sequence(
+            [MakeEnvironment(env_var, parent_var, frame)],
+            [DestroyEnvironment(env_var)],
+        )
+
+    def __resolve_variable(self, env: Environment, name: str) -> Address:
+        # Code of the current function is executed in order, so only variables that are already defined in its environments can be accessed. Code of the function is executed later, so variables of the outer environments are resolved when they are all defined.
+        depth = 0
+
+        while env.has_parent:
+            if env.has_variable(name):
+                return Address(env.frame, name, depth)
+
+            parent = env.parent
+            if env.frame is not parent.frame:
+                depth += 1
+
+            if env.is_function:
+                return Address(parent.frame, name, depth)
+
+            env = parent
+
+        return Address(env.frame, name, depth)
+
+    def __owned(self, instruction: Instruction) -> Sequence:
+        # Result of the instruction is released by the cleanup
+        result = instruction.result
+        assert result is not None
+
+        return Sequence([instruction], [DecRef(result)])
+
+    def __create_object(self) -> Temp:
+        return Temp(self.__variable_manager.create_object_name())
+
+    def __create_environment(self) -> Temp:
+        return Temp(
+            self.__variable_manager.create_environment_name(), ValueType.ENVIRONMENT
+        )
+
+    def __env_var(self, env: Environment) -> Temp:
+        return Temp(env.name, ValueType.ENVIRONMENT)
 
     def __check_binding_list(self, variables_names: list[str]) -> None:
         # TODO: copy-paste
 
-        ctx = ast_context.ctx
+        ctx = self.__ast_context.ctx
         visited_variables = set()
 
         for v in variables_names:
@@ -1047,7 +1311,7 @@ class ASTVisitor(LispVisitor):
     def __check_formals(self, formals: list[str]) -> None:
         # TODO: copy-paste
 
-        ctx = ast_context.ctx
+        ctx = self.__ast_context.ctx
         visited_formals = set()
 
         for f in formals:
@@ -1066,7 +1330,7 @@ class ASTVisitor(LispVisitor):
     def __check_do_variables(self, variables_names: list[str]) -> None:
         # TODO: copy-paste
 
-        ctx = ast_context.ctx
+        ctx = self.__ast_context.ctx
         visited_variables = set()
 
         for v in variables_names:
@@ -1082,4 +1346,12 @@ class ASTVisitor(LispVisitor):
 
     def __check_variable_definition(self, variable_name: str) -> None:
         if self.__symbols.has_api_function_symbol(variable_name):
-            raise FunctionRedefineException(variable_name, ast_context.ctx)
+            raise FunctionRedefineException(variable_name, self.__ast_context.ctx)
+
+
+def _replace_calls(block: Block, errors: dict[int, ArityError]) -> None:
+    for k, instruction in enumerate(block):
+        block[k] = errors.get(id(instruction), instruction)
+
+        for nested in block[k].blocks:
+            _replace_calls(nested, errors)
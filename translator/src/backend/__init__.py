@@ -0,0 +1,3 @@
+__all__ = ["CBackend", "Lines"]
+
+from .c_backend import CBackend, Lines
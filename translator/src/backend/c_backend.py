@@ -0,0 +1,631 @@
+from typing import Any, Callable
+
+from src.ir import (
+    Program,
+    Function,
+    FunctionKind,
+    Block,
+    Value,
+    Argument,
+    ConstantKind,
+    MakeConstant,
+    MakeLambda,
+    MakeEvaluable,
+    MakeClosure,
+    MakeRestList,
+    GetVariable,
+    GetCell,
+    SetVariable,
+    UpdateVariable,
+    Call,
+    Apply,
+    TailCall,
+    TailApply,
+    ArityError,
+    CallBuiltin,
+    Force,
+    NativeCall,
+    ToBoolean,
+    GlobalEnvironment,
+    MakeEnvironment,
+    MoveEnvironment,
+    DestroyEnvironment,
+    DestroyGlobalEnvironment,
+    IncRef,
+    DecRef,
+    DeclareLocal,
+    Assign,
+    Copy,
+    NativeConstant,
+    NativeOperation,
+    Box,
+    If,
+    Loop,
+    SelfTailCall,
+    TailLoop,
+    PushRoots,
+    StoreRoot,
+    PopRoots,
+    SafePoint,
+    Verbatim,
+)
+from src.ir import ValueType
+from src.symbols import Symbols
+
+__all__ = ["CBackend", "Lines"]
+
+
+Lines = list[str]
+
+INDENT = "\t"
+
+
+class CBackend:
+    def __init__(self, symbols: Symbols):
+        """
+        Class prints C-code of the IR. Every instruction is printed once, directly into the lines of the output.
+
+        :param symbols: symbols of the runtime.
+        """
+
+        self.__symbols = symbols
+        self.__constructors = {
+            ConstantKind.INTEGER: symbols.CREATE_INTEGER,
+            ConstantKind.FLOAT: symbols.CREATE_FLOAT,
+            ConstantKind.STRING: symbols.CREATE_STRING,
+            ConstantKind.CHARACTER: symbols.CREATE_CHARACTER,
+            ConstantKind.TRUE: symbols.CREATE_TRUE,
+            ConstantKind.FALSE: symbols.CREATE_FALSE,
+            ConstantKind.UNSPECIFIED: symbols.CREATE_UNSPECIFIED,
+        }
+        self.__native_types = {
+            ValueType.INTEGER: symbols.INTEGER_TYPE,
+            ValueType.DOUBLE: symbols.DOUBLE_TYPE,
+            ValueType.BOOLEAN: symbols.BOOLEAN_TYPE,
+        }
+        self.__boxes = {
+            ValueType.INTEGER: symbols.CREATE_INTEGER,
+            ValueType.DOUBLE: symbols.CREATE_FLOAT,
+            ValueType.BOOLEAN: symbols.CREATE_BOOLEAN,
+        }
+        self.__printers: dict[type, Callable[[Any, str, Lines], None]] = {
+            MakeConstant: self.__print_make_constant,
+            MakeLambda: self.__print_make_callable,
+            MakeEvaluable: self.__print_make_callable,
+            MakeClosure: self.__print_make_closure,
+            MakeRestList: self.__print_make_rest_list,
+            GetVariable: self.__print_get_variable,
+            GetCell: self.__print_get_variable,
+            SetVariable: self.__print_set_variable,
+            UpdateVariable: self.__print_update_variable,
+            Call: self.__print_call,
+            Apply: self.__print_call,
+            TailCall: self.__print_call,
+            TailApply: self.__print_call,
+            ArityError: self.__print_arity_error,
+            CallBuiltin: self.__print_call_builtin,
+            Force: self.__print_force,
+            NativeCall: self.__print_native_call,
+            ToBoolean: self.__print_to_boolean,
+            GlobalEnvironment: self.__print_global_environment,
+            MakeEnvironment: self.__print_make_environment,
+            MoveEnvironment: self.__print_move_environment,
+            DestroyEnvironment: self.__print_destroy_environment,
+            DestroyGlobalEnvironment: self.__print_destroy_environment,
+            IncRef: self.__print_ref_count,
+            DecRef: self.__print_ref_count,
+            DeclareLocal: self.__print_declare_local,
+            Assign: self.__print_assign,
+            Copy: self.__print_native_definition,
+            NativeConstant: self.__print_native_definition,
+            NativeOperation: self.__print_native_definition,
+            Box: self.__print_box,
+            If: self.__print_if,
+            Loop: self.__print_loop,
+            SelfTailCall: self.__print_self_tail_call,
+            TailLoop: self.__print_tail_loop,
+            PushRoots: self.__print_push_roots,
+            StoreRoot: self.__print_store_root,
+            PopRoots: self.__print_pop_roots,
+            SafePoint: self.__print_safe_point,
+            Verbatim: self.__print_verbatim,
+        }
+
+    def emit(self, program: Program) -> Lines:
+        """
+        Returns lines of the C-program.
+        """
+
+        lines = ['#include "clisp.h"', ""]
+
+        for d in program.declarations:
+            lines.extend(d.splitlines())
+            lines.append("")
+
+        for f in program.functions:
+            self.__print_function(f, lines)
+            lines.append("")
+
+        lines.append("int main() {")
+        self.__print_block(program.main, INDENT, lines)
+        lines.append("}")
+
+        return lines
+
+    def emit_function(self, function: Function) -> str:
+        """
+        Returns C-code of the function.
+        """
+
+        lines: Lines = []
+        self.__print_function(function, lines)
+        return "\n".join(lines)
+
+    def emit_block(self, block: Block) -> str:
+        """
+        Returns C-code of the block without indentation.
+        """
+
+        lines: Lines = []
+        self.__print_block(block, "", lines)
+        return "\n".join(lines)
+
+    def __print_function(self, function: Function, lines: Lines) -> None:
+        symbols = self.__symbols
+
+        params = (
+            symbols.LAMBDA_PARAMS
+            if function.kind is FunctionKind.LAMBDA
+            else symbols.EVALUABLE_PARAMS
+        )
+
+        lines.append(f"{symbols.OBJECT_TYPE} {function.name}({', '.join(params)}) {{")
+        self.__print_block(function.body, INDENT, lines)
+        if function.result is not None:
+            lines.append(f"{INDENT}return {function.result.name};")
+        lines.append("}")
+
+    def __print_block(self, block: Block, indent: str, lines: Lines) -> None:
+        printers = self.__printers
+
+        for instruction in block:
+            printers[type(instruction)](instruction, indent, lines)
+
+    def __value(self, value: Value) -> str:
+        if isinstance(value, Argument):
+            return f"{self.__symbols.LAMBDA_ARGS}[{value.index}]"
+
+        return value.name
+
+    def __print_make_constant(
+        self, instruction: MakeConstant, indent: str, lines: Lines
+    ) -> None:
+        func = self.__constructors[instruction.kind]
+        value = "" if instruction.value is None else instruction.value
+
+        lines.append(
+            f"{indent}{self.__symbols.OBJECT_TYPE} {instruction.result.name} = {func}({value});"
+        )
+
+    def __print_make_callable(
+        self, instruction: MakeLambda | MakeEvaluable, indent: str, lines: Lines
+    ) -> None:
+        args = [instruction.function, instruction.env.name]
+
+        if isinstance(instruction, MakeLambda):
+            func = self.__symbols.CREATE_LAMBDA
+            args.append(str(instruction.frame.size))
+            args.append("true" if instruction.stack else "false")
+        else:
+            func = self.__symbols.CREATE_EVALUABLE
+
+        lines.append(
+            f"{indent}{self.__symbols.OBJECT_TYPE} {instruction.result.name} = {func}({', '.join(args)});"
+        )
+
+    def __print_make_closure(
+        self, instruction: MakeClosure, indent: str, lines: Lines
+    ) -> None:
+        symbols = self.__symbols
+        captures = instruction.captures
+        args = [
+            instruction.function,
+            str(instruction.frame.size),
+            "true" if instruction.stack else "false",
+            str(len(captures)),
+            self.__array(captures),
+        ]
+
+        lines.append(
+            f"{indent}{symbols.OBJECT_TYPE} {instruction.result.name} = {symbols.CREATE_CLOSURE}({', '.join(args)});"
+        )
+
+    def __print_make_rest_list(
+        self, instruction: MakeRestList, indent: str, lines: Lines
+    ) -> None:
+        symbols = self.__symbols
+        start = instruction.start
+
+        if start == 0:
+            count = symbols.LAMBDA_COUNT
+            args = symbols.LAMBDA_ARGS
+        else:
+            count = f"{symbols.LAMBDA_COUNT}-{start}"
+            args = f"{symbols.LAMBDA_ARGS}+{start}"
+
+        lines.append(
+            f"{indent}{symbols.OBJECT_TYPE} {instruction.result.name} = {symbols.CREATE_LIST_FROM_ARRAY}({count}, {args});"
+        )
+
+    def __print_get_variable(
+        self, instruction: GetVariable, indent: str, lines: Lines
+    ) -> None:
+        symbols = self.__symbols
+        address = instruction.address
+
+        if isinstance(instruction, GetCell):
+            func = symbols.GET_VARIABLE_CELL
+        elif address.in_cell:
+            func = symbols.GET_CELL_VARIABLE_VALUE
+        else:
+            func = symbols.GET_VARIABLE_VALUE
+
+        lines.append(
+            f"{indent}{symbols.OBJECT_TYPE} {instruction.result.name} = {func}({instruction.env.name}, {address.depth}, {address.slot});"
+        )
+
+    def __print_set_variable(
+        self, instruction: SetVariable, indent: str, lines: Lines
+    ) -> None:
+        symbols = self.__symbols
+
+        if instruction.in_cell:
+            func = (
+                symbols.SET_CELL_VARIABLE_VALUE_MOVE
+                if instruction.move
+                else symbols.SET_CELL_VARIABLE_VALUE
+            )
+        else:
+            func = (
+                symbols.SET_VARIABLE_VALUE_MOVE
+                if instruction.move
+                else symbols.SET_VARIABLE_VALUE
+            )
+
+        lines.append(
+            f'{indent}{func}({instruction.env.name}, {instruction.slot}, "{instruction.name}", {self.__value(instruction.value)});'
+        )
+
+    def __print_update_variable(
+        self, instruction: UpdateVariable, indent: str, lines: Lines
+    ) -> None:
+        symbols = self.__symbols
+        address = instruction.address
+
+        if address.in_cell:
+            func = (
+                symbols.UPDATE_CELL_VARIABLE_VALUE_MOVE
+                if instruction.move
+                else symbols.UPDATE_CELL_VARIABLE_VALUE
+            )
+        else:
+            func = (
+                symbols.UPDATE_VARIABLE_VALUE_MOVE
+                if instruction.move
+                else symbols.UPDATE_VARIABLE_VALUE
+            )
+
+        lines.append(
+            f"{indent}{symbols.OBJECT_TYPE} {instruction.result.name} = {func}({instruction.env.name}, {address.depth}, {address.slot}, {self.__value(instruction.value)});"
+        )
+
+    def __print_call(self, instruction: Call, indent: str, lines: Lines) -> None:
+        symbols = self.__symbols
+
+        if isinstance(instruction, TailApply):
+            func = symbols.TAIL_CALL_LAMBDA_LIST
+        elif isinstance(instruction, TailCall):
+            func = symbols.TAIL_CALL_LAMBDA
+        elif isinstance(instruction, Apply):
+            func = symbols.CALL_LAMBDA_LIST
+        else:
+            func = symbols.CALL_LAMBDA
+
+        # Arguments are passed in the array on the stack of the caller, the function reads them from it directly
+        args = self.__array(instruction.args)
+
+        lines.append(
+            f"{indent}{symbols.OBJECT_TYPE} {instruction.result.name} = {func}({self.__value(instruction.callee)}, {len(instruction.args)}, {args});"
+        )
+
+    def __print_arity_error(
+        self, instruction: ArityError, indent: str, lines: Lines
+    ) -> None:
+        symbols = self.__symbols
+        is_variadic = "true" if instruction.is_variadic else "false"
+
+        lines.append(
+            f'{indent}{symbols.OBJECT_TYPE} {instruction.result.name} = {symbols.ARITY_ERROR}("{instruction.name}", {instruction.expected}, {is_variadic}, {instruction.count});'
+        )
+
+    def __print_call_builtin(
+        self, instruction: CallBuiltin, indent: str, lines: Lines
+    ) -> None:
+        symbols = self.__symbols
+        count = len(instruction.args)
+        values = ", ".join(self.__value(a) for a in instruction.args)
+
+        if instruction.binary:
+            lines.append(
+                f"{indent}{symbols.OBJECT_TYPE} {instruction.result.name} = {instruction.function}({values});"
+            )
+            return
+
+        lines.append(
+            f"{indent}{symbols.OBJECT_TYPE} {instruction.result.name} = {instruction.function}({count}, {self.__array(instruction.args)});"
+        )
+
+    def __array(self, values: list[Value]) -> str:
+        """
+        Returns C-expression of the array of the objects: compound literal that lives until the end of the enclosing block.
+        """
+
+        if not values:
+            # Empty initializer of the array isn't allowed in C11
+            return "NULL"
+
+        return f"({self.__symbols.OBJECT_TYPE}[]){{{', '.join(self.__value(v) for v in values)}}}"
+
+    def __print_force(self, instruction: Force, indent: str, lines: Lines) -> None:
+        symbols = self.__symbols
+
+        lines.append(
+            f"{indent}{symbols.OBJECT_TYPE} {instruction.result.name} = {symbols.EVALUATE}({self.__value(instruction.evaluable)});"
+        )
+
+    def __print_native_call(
+        self, instruction: NativeCall, indent: str, lines: Lines
+    ) -> None:
+        symbols = self.__symbols
+
+        args = [
+            f'"{instruction.function}"',
+            f'"{instruction.library}"',
+            instruction.result_type,
+            str(len(instruction.args_types)),
+            *instruction.args_types,
+        ]
+
+        lines.append(
+            f"{indent}{symbols.OBJECT_TYPE} {instruction.result.name} = {symbols.NATIVE_CALL}({', '.join(args)});"
+        )
+
+    def __print_to_boolean(
+        self, instruction: ToBoolean, indent: str, lines: Lines
+    ) -> None:
+        symbols = self.__symbols
+
+        lines.append(
+            f"{indent}{symbols.BOOLEAN_TYPE} {instruction.result.name} = {symbols.OBJECT_TO_BOOLEAN}({self.__value(instruction.value)});"
+        )
+
+    def __print_global_environment(
+        self, instruction: GlobalEnvironment, indent: str, lines: Lines
+    ) -> None:
+        symbols = self.__symbols
+
+        lines.append(
+            f"{indent}{symbols.ENVIRONMENT_TYPE} {instruction.result.name} = {symbols.GET_GLOBAL_ENVIRONMENT}({instruction.frame.size});"
+        )
+
+    def __print_make_environment(
+        self, instruction: MakeEnvironment, indent: str, lines: Lines
+    ) -> None:
+        symbols = self.__symbols
+        result = instruction.result.name
+        parent = instruction.parent.name
+        size = instruction.frame.size
+
+        if not instruction.stack:
+            lines.append(
+                f"{indent}{symbols.ENVIRONMENT_TYPE} {result} = {symbols.CREATE_ENVIRONMENT}({parent}, {size});"
+            )
+            return
+
+        # Compound literals live until the end of the block, array of zero length isn't allowed in C11
+        size = max(size, 1)
+        lines.append(
+            f"{indent}{symbols.ENVIRONMENT_TYPE} {result} = {symbols.CREATE_STACK_ENVIRONMENT}(&({symbols.ENVIRONMENT_STRUCT_TYPE}){{0}}, {parent}, {size}, ({symbols.VARIABLE_TYPE}[{size}]){{{{0}}}});"
+        )
+
+    def __print_move_environment(
+        self, instruction: MoveEnvironment, indent: str, lines: Lines
+    ) -> None:
+        env = instruction.env.name
+
+        lines.append(f"{indent}{env} = {self.__symbols.MOVE_ENVIRONMENT}({env});")
+
+    def __print_destroy_environment(
+        self,
+        instruction: DestroyEnvironment | DestroyGlobalEnvironment,
+        indent: str,
+        lines: Lines,
+    ) -> None:
+        if isinstance(instruction, DestroyGlobalEnvironment):
+            func = self.__symbols.DESTROY_GLOBAL_ENVIRONMENT
+        elif instruction.stack:
+            func = self.__symbols.DESTROY_STACK_ENVIRONMENT
+        else:
+            func = self.__symbols.DESTROY_ENVIRONMENT
+
+        lines.append(f"{indent}{func}({instruction.env.name});")
+
+    def __print_ref_count(
+        self, instruction: IncRef | DecRef, indent: str, lines: Lines
+    ) -> None:
+        func = (
+            self.__symbols.INCREASE_REF_COUNT
+            if isinstance(instruction, IncRef)
+            else self.__symbols.DECREASE_REF_COUNT
+        )
+
+        lines.append(f"{indent}{func}({self.__value(instruction.value)});")
+
+    def __print_declare_local(
+        self, instruction: DeclareLocal, indent: str, lines: Lines
+    ) -> None:
+        local = instruction.local
+
+        lines.append(f"{indent}{self.__native_types[local.type_]} {local.name} = 0;")
+
+    def __print_assign(self, instruction: Assign, indent: str, lines: Lines) -> None:
+        lines.append(f"{indent}{instruction.local.name} = {instruction.value.name};")
+
+    def __print_native_definition(
+        self,
+        instruction: Copy | NativeConstant | NativeOperation,
+        indent: str,
+        lines: Lines,
+    ) -> None:
+        result = instruction.result
+
+        if isinstance(instruction, Copy):
+            value = instruction.value.name
+        elif isinstance(instruction, NativeConstant):
+            value = str(instruction.value)
+        else:
+            value = f"{instruction.left.name} {instruction.operator} {instruction.right.name}"
+
+        lines.append(
+            f"{indent}{self.__native_types[result.type_]} {result.name} = {value};"
+        )
+
+    def __print_box(self, instruction: Box, indent: str, lines: Lines) -> None:
+        value = instruction.value
+
+        lines.append(
+            f"{indent}{self.__symbols.OBJECT_TYPE} {instruction.result.name} = {self.__boxes[value.type_]}({value.name});"
+        )
+
+    def __print_if(self, instruction: If, indent: str, lines: Lines) -> None:
+        symbols = self.__symbols
+        result = instruction.result.name
+        inner = indent + INDENT
+        condition = self.__value(instruction.condition)
+
+        # Arguments are always objects
+        if (
+            isinstance(instruction.condition, Argument)
+            or instruction.condition.type_ is not ValueType.BOOLEAN
+        ):
+            condition = f"{symbols.OBJECT_TO_BOOLEAN}({condition})"
+
+        lines.append(f"{indent}{symbols.OBJECT_TYPE} {result};")
+        lines.append(f"{indent}if ({condition}) {{")
+        self.__print_block(instruction.then_block, inner, lines)
+        lines.append(f"{inner}{result} = {self.__value(instruction.then_value)};")
+        lines.append(f"{indent}}}")
+        lines.append(f"{indent}else {{")
+        self.__print_block(instruction.else_block, inner, lines)
+        lines.append(f"{inner}{result} = {self.__value(instruction.else_value)};")
+        lines.append(f"{indent}}}")
+
+    def __print_loop(self, instruction: Loop, indent: str, lines: Lines) -> None:
+        result = instruction.result.name
+        inner = indent + INDENT
+        exit_inner = inner + INDENT
+
+        lines.append(f"{indent}{self.__symbols.OBJECT_TYPE} {result};")
+        lines.append(f"{indent}while (1) {{")
+        self.__print_block(instruction.test_block, inner, lines)
+        lines.append(f"{inner}if ({instruction.test_value.name}) {{")
+        self.__print_block(instruction.exit_block, exit_inner, lines)
+        lines.append(f"{exit_inner}{result} = {self.__value(instruction.exit_value)};")
+        lines.append(f"{exit_inner}break;")
+        lines.append(f"{inner}}}")
+        self.__print_block(instruction.body_block, inner, lines)
+        lines.append(f"{indent}}}")
+
+    def __print_self_tail_call(
+        self, instruction: SelfTailCall, indent: str, lines: Lines
+    ) -> None:
+        symbols = self.__symbols
+
+        for i, a in enumerate(instruction.args):
+            value = self.__value(a)
+            lines.append(f"{indent}{symbols.TAIL_CALL_ARGS}[{i}] = {value};")
+            lines.append(f"{indent}{symbols.INCREASE_REF_COUNT}({value});")
+
+        lines.append(f"{indent}{symbols.TAIL_CALL_FLAG} = true;")
+        lines.append(
+            f"{indent}{symbols.OBJECT_TYPE} {instruction.result.name} = {symbols.CREATE_UNSPECIFIED}();"
+        )
+
+    def __print_tail_loop(
+        self, instruction: TailLoop, indent: str, lines: Lines
+    ) -> None:
+        symbols = self.__symbols
+        result = instruction.result.name
+        value = instruction.value.name
+        inner = indent + INDENT
+        exit_inner = inner + INDENT
+        params = instruction.params
+
+        # Array of zero length isn't allowed in C11
+        if params:
+            lines.append(
+                f"{indent}{symbols.OBJECT_TYPE} {symbols.TAIL_CALL_ARGS}[{len(params)}];"
+            )
+        lines.append(f"{indent}{symbols.BOOLEAN_TYPE} {symbols.TAIL_CALL_FLAG};")
+        lines.append(f"{indent}{symbols.OBJECT_TYPE} {result};")
+        lines.append(f"{indent}while (1) {{")
+        lines.append(f"{inner}{symbols.TAIL_CALL_FLAG} = false;")
+        self.__print_block(instruction.body_block, inner, lines)
+        lines.append(f"{inner}if (!{symbols.TAIL_CALL_FLAG}) {{")
+        lines.append(f"{exit_inner}{result} = {value};")
+        lines.append(f"{exit_inner}break;")
+        lines.append(f"{inner}}}")
+        lines.append(f"{inner}{symbols.DECREASE_REF_COUNT}({value});")
+        for i, p in enumerate(params):
+            lines.append(
+                f'{inner}{symbols.SET_VARIABLE_VALUE_MOVE}({p.env.name}, {p.slot}, "{p.name}", {symbols.TAIL_CALL_ARGS}[{i}]);'
+            )
+        lines.append(f"{indent}}}")
+
+    def __print_push_roots(
+        self, instruction: PushRoots, indent: str, lines: Lines
+    ) -> None:
+        lines.append(
+            f"{indent}{self.__symbols.PUSH_ROOTS}({instruction.objects}, {instruction.environments});"
+        )
+
+    def __print_store_root(
+        self, instruction: StoreRoot, indent: str, lines: Lines
+    ) -> None:
+        value = instruction.value
+        func = (
+            self.__symbols.STORE_ENVIRONMENT_ROOT
+            if value.type_ is ValueType.ENVIRONMENT
+            else self.__symbols.STORE_ROOT
+        )
+
+        stored = "NULL" if instruction.clear else value.name
+
+        lines.append(f"{indent}{func}({instruction.slot}, {stored});")
+
+    def __print_pop_roots(
+        self, instruction: PopRoots, indent: str, lines: Lines
+    ) -> None:
+        lines.append(f"{indent}{self.__symbols.POP_ROOTS}();")
+
+    def __print_safe_point(
+        self, instruction: SafePoint, indent: str, lines: Lines
+    ) -> None:
+        lines.append(f"{indent}{self.__symbols.SAFE_POINT}();")
+
+    def __print_verbatim(
+        self, instruction: Verbatim, indent: str, lines: Lines
+    ) -> None:
+        lines.extend(
+            indent + l for l in instruction.text.splitlines() if l and not l.isspace()
+        )
@@ -1,5 +1,4 @@
-from src.rendering.codes import Code
-
+from src.ir import Sequence, Frame
 
 __all__ = ["Environment"]
 
@@ -9,11 +8,20 @@ class Environment:
     Class represents a variable environment: list of the defined Lisp-variables.
     """
 
-    def __init__(self, name: str, code: Code, parent: "Environment"):
+    def __init__(
+        self,
+        name: str,
+        code: Sequence,
+        parent: "Environment",
+        frame: Frame,
+        is_function: bool = False,
+    ):
         self.__name = name
         self.__code = code
-        self.__variables: set[str] = set()
+        self.__variables: dict[str, None] = {}
         self.__parent = parent
+        self.__frame = frame
+        self.__is_function = is_function
 
     @property
     def has_parent(self) -> bool:
@@ -50,7 +58,8 @@ class Environment:
         :param name: the name of the variable.
         """
 
-        self.__variables.add(name)
+        self.__variables[name] = None
+        self.__frame.add(name)
 
     def extend(self, names: list[str]) -> None:
         """
@@ -59,7 +68,16 @@ class Environment:
         :param names: the names of the variables to add.
         """
 
-        self.__variables.update(names)
+        for name in names:
+            self.add(name)
+
+    @property
+    def variables(self) -> list[str]:
+        """
+        Variables of this environment (without variables of ancestors) in the order of their definition.
+        """
+
+        return list(self.__variables)
 
     @property
     def name(self) -> str:
@@ -70,13 +88,29 @@ class Environment:
         return self.__name
 
     @property
-    def code(self) -> Code:
+    def code(self) -> Sequence:
         """
-        Code of the environment.
+        Code of the environment: its creation and destruction. Cleanup of the expressions of the environment body is moved to it.
         """
 
         return self.__code
 
+    @property
+    def frame(self) -> Frame:
+        """
+        Layout of the runtime environment. Environment that has no runtime environment of its own (promise) shares the frame of the parent.
+        """
+
+        return self.__frame
+
+    @property
+    def is_function(self) -> bool:
+        """
+        Returns whether this is an environment of the function (lambda or promise). Code of the function is executed later than the code of the parent, so more variables of the ancestors can be defined by then.
+        """
+
+        return self.__is_function
+
     @property
     def parent(self) -> "Environment":
         """
@@ -0,0 +1,25 @@
+__all__ = [
+    "ValueType",
+    "Temp",
+    "Argument",
+    "Value",
+    "Frame",
+    "Address",
+    "Function",
+    "FunctionKind",
+    "Program",
+    "Sequence",
+    "wrap",
+    "nest",
+    "join",
+    "transfer_cleanup",
+]
+
+from .instructions import *
+from .instructions import __all__ as instructions_all
+from .frames import Frame, Address
+from .program import Function, FunctionKind, Program
+from .sequence import Sequence, wrap, nest, join, transfer_cleanup
+from .values import ValueType, Temp, Argument, Value
+
+__all__ += instructions_all
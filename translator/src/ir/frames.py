@@ -0,0 +1,169 @@
+from typing import Optional
+
+__all__ = ["Frame", "Address"]
+
+
+class Frame:
+    def __init__(self, parent: Optional["Frame"] = None):
+        """
+        Class represents layout of a runtime environment: every variable of the environment has its slot, slots are numbered in the order of the first definition. Frames are filled while the scope is visited, so addresses of the variables are resolved when the whole program is visited (variable of the scope can be defined after the lambda that references it).
+
+        :param parent: frame of the parent environment, None for the global one.
+        """
+
+        self.__parent = parent
+        self.__slots: dict[str, int] = {}
+        self.__cells: set[str] = set()
+
+    @property
+    def parent(self) -> Optional["Frame"]:
+        return self.__parent
+
+    def attach(self, parent: "Frame") -> None:
+        """
+        Makes the frame a child of another frame. It's done by the closure conversion: environments of the calls of the flat closure are children of its closure record, not of the environment where the closure was created.
+        """
+
+        self.__parent = parent
+
+    @property
+    def size(self) -> int:
+        """
+        Number of the slots, it's the capacity of the environment.
+        """
+
+        return len(self.__slots)
+
+    @property
+    def variables(self) -> list[str]:
+        """
+        Variables of the frame in the order of their slots.
+        """
+
+        return list(self.__slots)
+
+    def add(self, name: str) -> int:
+        """
+        Adds a variable to the frame (if it's not added yet) and returns its slot.
+        """
+
+        return self.__slots.setdefault(name, len(self.__slots))
+
+    @property
+    def cells(self) -> list[str]:
+        """
+        Variables of the frame that are kept in cells, in the order of their slots.
+        """
+
+        return [n for n in self.__slots if n in self.__cells]
+
+    def keep_in_cell(self, name: str) -> None:
+        """
+        Makes the variable of the frame kept in a cell: slot of the variable holds the cell with its value, so flat closures that capture the cell see later definitions and assignments of the variable.
+        """
+
+        self.__cells.add(name)
+
+    def in_cell(self, name: str) -> bool:
+        return name in self.__cells
+
+    def slot(self, name: str) -> int:
+        """
+        Returns the slot of the variable of this frame.
+
+        :raises KeyError: the frame has no such variable.
+        """
+
+        return self.__slots[name]
+
+    def find(self, name: str) -> "Frame":
+        """
+        Returns the frame (this one or an ancestor) that has the variable.
+
+        :raises KeyError: neither this frame nor its ancestors have such variable.
+        """
+
+        frame: Optional[Frame] = self
+
+        while frame is not None:
+            if name in frame.__slots:
+                return frame
+
+            frame = frame.__parent
+
+        raise KeyError(name)
+
+    def resolve(self, name: str) -> tuple[int, int]:
+        """
+        Returns address of the variable: number of the environments to go up (depth) and the slot in that environment.
+
+        :raises KeyError: neither this frame nor its ancestors have such variable.
+        """
+
+        frame: Optional[Frame] = self
+        depth = 0
+
+        while frame is not None:
+            if name in frame.__slots:
+                return depth, frame.__slots[name]
+
+            frame = frame.__parent
+            depth += 1
+
+        raise KeyError(name)
+
+
+class Address:
+    def __init__(self, frame: Frame, name: str, depth: int = 0):
+        """
+        Class represents address of the variable: depth of the environment with the variable and slot of the variable in it. Address is resolved in the frame when it's requested, so variables that are defined in the frame later are taken into account.
+
+        :param frame: frame where the variable is searched (with its ancestors).
+        :param name: name of the variable.
+        :param depth: depth of the frame relative to the environment where the variable is accessed.
+        """
+
+        self.__frame = frame
+        self.__name = name
+        self.__depth = depth
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def frame(self) -> Frame:
+        """
+        Frame that has the variable.
+        """
+
+        return self.__frame.find(self.__name)
+
+    @property
+    def depth(self) -> int:
+        return self.__depth + self.__frame.resolve(self.__name)[0]
+
+    @property
+    def slot(self) -> int:
+        return self.__frame.resolve(self.__name)[1]
+
+    @property
+    def in_cell(self) -> bool:
+        """
+        Whether the variable is kept in a cell, see Frame.keep_in_cell.
+        """
+
+        return self.frame.in_cell(self.__name)
+
+    def rebase(self, old: Frame, new: Frame) -> "Address":
+        """
+        Returns the address that searches the variable in the new frame if this one searches it in the old frame, otherwise returns this address. It's used when the environment at the same depth gets another layout (closure record instead of the environment where the closure was created).
+        """
+
+        if self.__frame is not old:
+            return self
+
+        return Address(new, self.__name, self.__depth)
+
+    def __repr__(self) -> str:
+        return f"{self.__name}@{self.depth}:{self.slot}"
@@ -0,0 +1,1160 @@
+from abc import ABC
+from enum import Enum
+from typing import Optional, Union
+
+from .frames import Frame, Address
+from .values import Temp, Value
+
+__all__ = [
+    "Block",
+    "Instruction",
+    "ConstantKind",
+    "MakeConstant",
+    "MakeLambda",
+    "MakeEvaluable",
+    "MakeClosure",
+    "MakeRestList",
+    "GetVariable",
+    "GetCell",
+    "SetVariable",
+    "UpdateVariable",
+    "Call",
+    "Apply",
+    "TailCall",
+    "TailApply",
+    "ArityError",
+    "CallBuiltin",
+    "Force",
+    "NativeCall",
+    "ToBoolean",
+    "GlobalEnvironment",
+    "MakeEnvironment",
+    "MoveEnvironment",
+    "DestroyEnvironment",
+    "DestroyGlobalEnvironment",
+    "IncRef",
+    "DecRef",
+    "DeclareLocal",
+    "Assign",
+    "Copy",
+    "NativeConstant",
+    "NativeOperation",
+    "Box",
+    "If",
+    "Loop",
+    "SelfTailCall",
+    "TailLoop",
+    "PushRoots",
+    "StoreRoot",
+    "PopRoots",
+    "SafePoint",
+    "Verbatim",
+]
+
+
+# Instructions that are executed sequentially
+Block = list["Instruction"]
+
+
+class Instruction(ABC):
+    """
+    Class represents an instruction of the IR. Instruction can define a temporary (result), use values (operands) and contain nested blocks (control flow).
+
+    Ownership of the results: values of GetVariable are borrowed from the environment, results of the other instructions are owned and must be released by DecRef. Native values (integers, doubles and booleans of C) aren't objects, they aren't reference counted.
+    """
+
+    @property
+    def result(self) -> Optional[Temp]:
+        return None
+
+    @property
+    def operands(self) -> list[Value]:
+        return []
+
+    @property
+    def blocks(self) -> list[Block]:
+        return []
+
+    def __repr__(self) -> str:
+        args = ", ".join(repr(o) for o in self.operands)
+        text = f"{type(self).__name__}({args})"
+
+        return text if self.result is None else f"{self.result!r} = {text}"
+
+
+class ConstantKind(Enum):
+    INTEGER = "integer"
+    FLOAT = "float"
+    STRING = "string"
+    CHARACTER = "character"
+    TRUE = "true"
+    FALSE = "false"
+    UNSPECIFIED = "unspecified"
+
+
+class MakeConstant(Instruction):
+    def __init__(
+        self,
+        result: Temp,
+        kind: ConstantKind,
+        value: Optional[Union[int, float, str]] = None,
+    ):
+        """
+        Creates an object of the constant.
+
+        :param result: created object.
+        :param kind: kind of the constant.
+        :param value: value (literal of C for strings and characters), booleans and unspecified have no value.
+        """
+
+        self.__result = result
+        self.__kind = kind
+        self.__value = value
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def kind(self) -> ConstantKind:
+        return self.__kind
+
+    @property
+    def value(self) -> Optional[Union[int, float, str]]:
+        return self.__value
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__result!r} = MakeConstant({self.__kind.value}, {self.__value!r})"
+        )
+
+
+class _MakeCallable(Instruction):
+    def __init__(self, result: Temp, function: str, env: Temp):
+        self.__result = result
+        self.__function = function
+        self.__env = env
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def function(self) -> str:
+        """
+        Name of the C-function.
+        """
+
+        return self.__function
+
+    @property
+    def env(self) -> Temp:
+        """
+        Captured environment.
+        """
+
+        return self.__env
+
+    @property
+    def operands(self) -> list[Value]:
+        return [self.__env]
+
+
+class MakeLambda(_MakeCallable):
+    def __init__(
+        self, result: Temp, function: str, env: Temp, frame: Frame, stack: bool = False
+    ):
+        """
+        Creates a lambda of the C-function that captures the environment.
+
+        :param frame: layout of the environments of the calls, the runtime allocates them with its size.
+        :param stack: whether the environments of the calls are allocated on the C-stack (they are never captured).
+        """
+
+        super().__init__(result, function, env)
+        self.__frame = frame
+        self.__stack = stack
+
+    @property
+    def frame(self) -> Frame:
+        return self.__frame
+
+    @property
+    def stack(self) -> bool:
+        return self.__stack
+
+
+class MakeEvaluable(_MakeCallable):
+    def __init__(self, result: Temp, function: str, env: Temp, frame: Frame):
+        """
+        Creates a promise of the C-function that captures the environment.
+
+        :param frame: layout of the captured environment.
+        """
+
+        super().__init__(result, function, env)
+        self.__frame = frame
+
+    @property
+    def frame(self) -> Frame:
+        return self.__frame
+
+
+class MakeClosure(Instruction):
+    def __init__(
+        self,
+        result: Temp,
+        function: str,
+        frame: Frame,
+        captures: list[Value],
+        stack: bool = False,
+    ):
+        """
+        Creates a flat closure of the C-function: the values of the captured variables (cells of the variables that are kept in cells) are copied into the closure record, the record is the parent of the environments of the calls and its parent is the global environment. Captures are borrowed, the record takes its own references.
+
+        :param frame: layout of the environments of the calls, its parent is the layout of the closure record.
+        :param captures: values of the captured variables in the order of the slots of the record.
+        :param stack: whether the environments of the calls are allocated on the C-stack (they are never captured).
+        """
+
+        self.__result = result
+        self.__function = function
+        self.__frame = frame
+        self.__captures = captures
+        self.__stack = stack
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def function(self) -> str:
+        """
+        Name of the C-function.
+        """
+
+        return self.__function
+
+    @property
+    def frame(self) -> Frame:
+        return self.__frame
+
+    @property
+    def captures(self) -> list[Value]:
+        return self.__captures
+
+    @property
+    def stack(self) -> bool:
+        return self.__stack
+
+    @property
+    def operands(self) -> list[Value]:
+        return self.__captures
+
+
+class MakeRestList(Instruction):
+    def __init__(self, result: Temp, start: int):
+        """
+        Creates a list of the arguments of the called lambda starting from the given one (variadic formal).
+
+        :param result: created list.
+        :param start: index of the first argument of the list.
+        """
+
+        self.__result = result
+        self.__start = start
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def start(self) -> int:
+        return self.__start
+
+
+class GetVariable(Instruction):
+    def __init__(self, result: Temp, env: Temp, address: Address):
+        """
+        Reads the variable of the environment (or of its ancestors). Result is borrowed.
+        """
+
+        self.__result = result
+        self.__env = env
+        self.__address = address
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def env(self) -> Temp:
+        return self.__env
+
+    @property
+    def name(self) -> str:
+        return self.__address.name
+
+    @property
+    def address(self) -> Address:
+        return self.__address
+
+    @property
+    def operands(self) -> list[Value]:
+        return [self.__env]
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__result!r} = GetVariable({self.__env!r}, {self.__address.name!r})"
+        )
+
+
+class GetCell(GetVariable):
+    """
+    Reads the cell of the variable that is kept in a cell (see Frame.keep_in_cell), the cell is created if the variable isn't defined yet. Result is borrowed.
+    """
+
+    def __repr__(self) -> str:
+        return f"{self.result!r} = GetCell({self.env!r}, {self.name!r})"
+
+
+class SetVariable(Instruction):
+    def __init__(
+        self, env: Temp, name: str, value: Value, frame: Frame, move: bool = False
+    ):
+        """
+        Defines the variable in the environment. The environment takes its own reference to the value.
+
+        :param frame: layout of the environment, the variable has its slot in it.
+        :param move: the environment takes the reference of the value instead of its own one, the value mustn't be released after.
+        """
+
+        self.__env = env
+        self.__name = name
+        self.__value = value
+        self.__frame = frame
+        self.__move = move
+
+    @property
+    def env(self) -> Temp:
+        return self.__env
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def value(self) -> Value:
+        return self.__value
+
+    @property
+    def frame(self) -> Frame:
+        return self.__frame
+
+    @property
+    def slot(self) -> int:
+        return self.__frame.slot(self.__name)
+
+    @property
+    def in_cell(self) -> bool:
+        return self.__frame.in_cell(self.__name)
+
+    @property
+    def move(self) -> bool:
+        return self.__move
+
+    @property
+    def operands(self) -> list[Value]:
+        return [self.__env, self.__value]
+
+    def __repr__(self) -> str:
+        func = "MoveVariable" if self.__move else "SetVariable"
+        return f"{func}({self.__env!r}, {self.__name!r}, {self.__value!r})"
+
+
+class UpdateVariable(Instruction):
+    def __init__(
+        self,
+        result: Temp,
+        env: Temp,
+        address: Address,
+        value: Value,
+        move: bool = False,
+    ):
+        """
+        Assigns the value to the existing variable of the environment (or of its ancestors). Result is the assigned value.
+
+        :param move: the environment takes the reference of the value instead of its own one, the value mustn't be released after.
+        """
+
+        self.__result = result
+        self.__env = env
+        self.__address = address
+        self.__value = value
+        self.__move = move
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def env(self) -> Temp:
+        return self.__env
+
+    @property
+    def name(self) -> str:
+        return self.__address.name
+
+    @property
+    def address(self) -> Address:
+        return self.__address
+
+    @property
+    def value(self) -> Value:
+        return self.__value
+
+    @property
+    def move(self) -> bool:
+        return self.__move
+
+    @property
+    def operands(self) -> list[Value]:
+        return [self.__env, self.__value]
+
+    def __repr__(self) -> str:
+        func = "MoveUpdateVariable" if self.__move else "UpdateVariable"
+        return f"{self.__result!r} = {func}({self.__env!r}, {self.__address.name!r}, {self.__value!r})"
+
+
+class Call(Instruction):
+    def __init__(self, result: Temp, callee: Value, args: list[Value]):
+        """
+        Calls the lambda with the arguments. Arguments are borrowed by the callee.
+        """
+
+        self.__result = result
+        self.__callee = callee
+        self.__args = args
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def callee(self) -> Value:
+        return self.__callee
+
+    @property
+    def args(self) -> list[Value]:
+        return self.__args
+
+    @property
+    def operands(self) -> list[Value]:
+        return [self.__callee, *self.__args]
+
+
+class Apply(Call):
+    """
+    Calls the lambda with the arguments, the last one is a list of the rest arguments.
+    """
+
+
+class TailCall(Call):
+    """
+    Call in the tail position: the callee is called by the trampoline of the runtime after the function returns, the arguments are kept by the runtime until then. Result is a marker that must be returned from the function as is.
+    """
+
+
+class TailApply(Apply):
+    """
+    Application in the tail position, see TailCall.
+    """
+
+
+class ArityError(Instruction):
+    def __init__(
+        self, result: Temp, name: str, expected: int, is_variadic: bool, count: int
+    ):
+        """
+        Replaces the call of the procedure that is known at the translation time and takes other number of the arguments: the program is aborted with the error when the call is reached.
+
+        :param result: value of the call, it's never produced.
+        :param name: name of the variable of the procedure.
+        :param expected: number of the fixed parameters of the procedure.
+        :param is_variadic: whether the procedure takes the rest arguments.
+        :param count: number of the arguments of the call.
+        """
+
+        self.__result = result
+        self.__name = name
+        self.__expected = expected
+        self.__is_variadic = is_variadic
+        self.__count = count
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def expected(self) -> int:
+        return self.__expected
+
+    @property
+    def is_variadic(self) -> bool:
+        return self.__is_variadic
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+
+class CallBuiltin(Instruction):
+    def __init__(
+        self,
+        result: Temp,
+        name: str,
+        function: str,
+        args: list[Value],
+        binary: bool = False,
+    ):
+        """
+        Calls the function of the runtime directly (without the lambda of the global environment). Arguments are borrowed by the function.
+
+        :param name: name of the standard function in Lisp.
+        :param function: name of the C-function.
+        :param binary: whether the function takes two arguments as parameters instead of the array of the arguments.
+        """
+
+        self.__result = result
+        self.__name = name
+        self.__function = function
+        self.__args = args
+        self.__binary = binary
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def function(self) -> str:
+        return self.__function
+
+    @property
+    def args(self) -> list[Value]:
+        return self.__args
+
+    @property
+    def binary(self) -> bool:
+        return self.__binary
+
+    @property
+    def operands(self) -> list[Value]:
+        return self.__args
+
+
+class Force(Instruction):
+    def __init__(self, result: Temp, evaluable: Value):
+        """
+        Evaluates the promise (once, then its value is remembered).
+        """
+
+        self.__result = result
+        self.__evaluable = evaluable
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def evaluable(self) -> Value:
+        return self.__evaluable
+
+    @property
+    def operands(self) -> list[Value]:
+        return [self.__evaluable]
+
+
+class NativeCall(Instruction):
+    def __init__(
+        self,
+        result: Temp,
+        library: str,
+        function: str,
+        result_type: str,
+        args_types: list[str],
+    ):
+        """
+        Creates a lambda that calls the function of the shared library.
+
+        :param result: created lambda.
+        :param library: name of the library.
+        :param function: name of the function.
+        :param result_type: native type of the result.
+        :param args_types: native types of the arguments.
+        """
+
+        self.__result = result
+        self.__library = library
+        self.__function = function
+        self.__result_type = result_type
+        self.__args_types = args_types
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def library(self) -> str:
+        return self.__library
+
+    @property
+    def function(self) -> str:
+        return self.__function
+
+    @property
+    def result_type(self) -> str:
+        return self.__result_type
+
+    @property
+    def args_types(self) -> list[str]:
+        return self.__args_types
+
+
+class ToBoolean(Instruction):
+    def __init__(self, result: Temp, value: Value):
+        """
+        Converts the object to the boolean value of C.
+        """
+
+        self.__result = result
+        self.__value = value
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def value(self) -> Value:
+        return self.__value
+
+    @property
+    def operands(self) -> list[Value]:
+        return [self.__value]
+
+
+class GlobalEnvironment(Instruction):
+    def __init__(self, result: Temp, frame: Frame):
+        """
+        Creates the global environment with the standard functions.
+
+        :param frame: layout of the environment, standard functions take its first slots.
+        """
+
+        self.__result = result
+        self.__frame = frame
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def frame(self) -> Frame:
+        return self.__frame
+
+
+class MakeEnvironment(Instruction):
+    def __init__(self, result: Temp, parent: Temp, frame: Frame, stack: bool = False):
+        """
+        Creates the environment with the given parent.
+
+        :param frame: layout of the environment, it's allocated with its size.
+        :param stack: whether the environment is allocated on the C-stack (it's never captured), then it must be destroyed in the same block.
+        """
+
+        self.__result = result
+        self.__parent = parent
+        self.__frame = frame
+        self.__stack = stack
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def parent(self) -> Temp:
+        return self.__parent
+
+    @property
+    def frame(self) -> Frame:
+        return self.__frame
+
+    @property
+    def stack(self) -> bool:
+        return self.__stack
+
+    @property
+    def operands(self) -> list[Value]:
+        return [self.__parent]
+
+
+class _EnvironmentOperation(Instruction):
+    def __init__(self, env: Temp):
+        self.__env = env
+
+    @property
+    def env(self) -> Temp:
+        return self.__env
+
+    @property
+    def operands(self) -> list[Value]:
+        return [self.__env]
+
+
+class MoveEnvironment(_EnvironmentOperation):
+    """
+    Rebinds the environment temporary to the copy of the environment for the next iteration of the loop (the old one can be captured by lambdas).
+    """
+
+
+class DestroyEnvironment(_EnvironmentOperation):
+    def __init__(self, env: Temp, stack: bool = False):
+        """
+        Releases the environment.
+
+        :param stack: whether the environment is allocated on the C-stack, then only its values are released.
+        """
+
+        super().__init__(env)
+        self.__stack = stack
+
+    @property
+    def stack(self) -> bool:
+        return self.__stack
+
+
+class DestroyGlobalEnvironment(_EnvironmentOperation):
+    """
+    Releases the global environment at the end of the program.
+    """
+
+
+class _RefCountOperation(Instruction):
+    def __init__(self, value: Value):
+        self.__value = value
+
+    @property
+    def value(self) -> Value:
+        return self.__value
+
+    @property
+    def operands(self) -> list[Value]:
+        return [self.__value]
+
+
+class IncRef(_RefCountOperation):
+    """
+    Increases the reference count of the object.
+    """
+
+
+class DecRef(_RefCountOperation):
+    """
+    Decreases the reference count of the object, it's destroyed when there are no references.
+    """
+
+
+class DeclareLocal(Instruction):
+    def __init__(self, local: Temp):
+        """
+        Declares the native local (integer or double) that holds the value of the unboxed Lisp-variable instead of the environment. Local is zero until it's assigned.
+        """
+
+        self.__local = local
+
+    @property
+    def local(self) -> Temp:
+        return self.__local
+
+    def __repr__(self) -> str:
+        return f"DeclareLocal({self.__local!r}: {self.__local.type_.value})"
+
+
+class Assign(Instruction):
+    def __init__(self, local: Temp, value: Temp):
+        """
+        Assigns the native value to the native local.
+        """
+
+        self.__local = local
+        self.__value = value
+
+    @property
+    def local(self) -> Temp:
+        return self.__local
+
+    @property
+    def value(self) -> Temp:
+        return self.__value
+
+    @property
+    def operands(self) -> list[Value]:
+        return [self.__local, self.__value]
+
+
+class Copy(Instruction):
+    def __init__(self, result: Temp, value: Temp):
+        """
+        Defines the native temporary with the current native value (of the local or another temporary).
+        """
+
+        self.__result = result
+        self.__value = value
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def value(self) -> Temp:
+        return self.__value
+
+    @property
+    def operands(self) -> list[Value]:
+        return [self.__value]
+
+
+class NativeConstant(Instruction):
+    def __init__(self, result: Temp, value: Union[int, float, str]):
+        """
+        Defines the native temporary with the value of the numeric literal.
+        """
+
+        self.__result = result
+        self.__value = value
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def value(self) -> Union[int, float, str]:
+        return self.__value
+
+    def __repr__(self) -> str:
+        return f"{self.__result!r} = NativeConstant({self.__value!r})"
+
+
+class NativeOperation(Instruction):
+    def __init__(self, result: Temp, operator: str, left: Temp, right: Temp):
+        """
+        Computes the operator of C with the native values: arithmetic ("+", "-", "*") gives the number, comparison ("<", ">", "<=", ">=", "==") gives the boolean value.
+        """
+
+        self.__result = result
+        self.__operator = operator
+        self.__left = left
+        self.__right = right
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def operator(self) -> str:
+        return self.__operator
+
+    @property
+    def left(self) -> Temp:
+        return self.__left
+
+    @property
+    def right(self) -> Temp:
+        return self.__right
+
+    @property
+    def operands(self) -> list[Value]:
+        return [self.__left, self.__right]
+
+    def __repr__(self) -> str:
+        return f"{self.__result!r} = NativeOperation({self.__left!r} {self.__operator} {self.__right!r})"
+
+
+class Box(Instruction):
+    def __init__(self, result: Temp, value: Temp):
+        """
+        Creates the object of the native value (integer, double or boolean).
+        """
+
+        self.__result = result
+        self.__value = value
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def value(self) -> Temp:
+        return self.__value
+
+    @property
+    def operands(self) -> list[Value]:
+        return [self.__value]
+
+
+class If(Instruction):
+    def __init__(
+        self,
+        result: Temp,
+        condition: Value,
+        then_block: Block,
+        then_value: Value,
+        else_block: Block,
+        else_value: Value,
+    ):
+        """
+        Executes one of the branches depending on the condition (object or native boolean value). Result is the value of the executed branch, it's owned: the branch must own it.
+        """
+
+        self.__result = result
+        self.__condition = condition
+        self.__then_block = then_block
+        self.__then_value = then_value
+        self.__else_block = else_block
+        self.__else_value = else_value
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def condition(self) -> Value:
+        return self.__condition
+
+    @property
+    def then_block(self) -> Block:
+        return self.__then_block
+
+    @property
+    def then_value(self) -> Value:
+        return self.__then_value
+
+    @property
+    def else_block(self) -> Block:
+        return self.__else_block
+
+    @property
+    def else_value(self) -> Value:
+        return self.__else_value
+
+    @property
+    def operands(self) -> list[Value]:
+        return [self.__condition]
+
+    @property
+    def blocks(self) -> list[Block]:
+        return [self.__then_block, self.__else_block]
+
+
+class Loop(Instruction):
+    def __init__(
+        self,
+        result: Temp,
+        test_block: Block,
+        test_value: Temp,
+        exit_block: Block,
+        exit_value: Value,
+        body_block: Block,
+    ):
+        """
+        Repeats test block and, while the test value is false, body block. When the test value is true, exit block is executed and the loop is finished. Result is the value of the exit block, it's owned.
+        """
+
+        self.__result = result
+        self.__test_block = test_block
+        self.__test_value = test_value
+        self.__exit_block = exit_block
+        self.__exit_value = exit_value
+        self.__body_block = body_block
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def test_block(self) -> Block:
+        return self.__test_block
+
+    @property
+    def test_value(self) -> Temp:
+        """
+        Boolean temporary defined in the test block.
+        """
+
+        return self.__test_value
+
+    @property
+    def exit_block(self) -> Block:
+        return self.__exit_block
+
+    @property
+    def exit_value(self) -> Value:
+        return self.__exit_value
+
+    @property
+    def body_block(self) -> Block:
+        return self.__body_block
+
+    @property
+    def blocks(self) -> list[Block]:
+        return [self.__test_block, self.__exit_block, self.__body_block]
+
+
+class SelfTailCall(Instruction):
+    def __init__(self, result: Temp, args: list[Value]):
+        """
+        Self call of the function in the tail position: the arguments are saved (their references are taken) to become the new values of the parameters, and the enclosing TailLoop repeats the body instead of returning. Result is a placeholder (unspecified object) that lets the remaining cleanup of the body run as usual, it's owned.
+        """
+
+        self.__result = result
+        self.__args = args
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def args(self) -> list[Value]:
+        return self.__args
+
+    @property
+    def operands(self) -> list[Value]:
+        return self.__args
+
+
+class TailLoop(Instruction):
+    def __init__(
+        self, result: Temp, body_block: Block, value: Temp, params: list[SetVariable]
+    ):
+        """
+        Repeats the body of the function while it ends with a SelfTailCall: after such iteration the value of the body is released and the parameters are rebound in place to the saved arguments, so the same environment and the same C-frame are reused. Result is the value of the last iteration, it's owned.
+
+        :param params: definitions of the parameters at the beginning of the function.
+        """
+
+        self.__result = result
+        self.__body_block = body_block
+        self.__value = value
+        self.__params = params
+
+    @property
+    def result(self) -> Temp:
+        return self.__result
+
+    @property
+    def body_block(self) -> Block:
+        return self.__body_block
+
+    @property
+    def value(self) -> Temp:
+        return self.__value
+
+    @property
+    def params(self) -> list[SetVariable]:
+        return self.__params
+
+    @property
+    def blocks(self) -> list[Block]:
+        return [self.__body_block]
+
+
+class PushRoots(Instruction):
+    def __init__(self, objects: int, environments: int):
+        """
+        Pushes the frame of the root slots of the function to the shadow stack of the tracing collector, slots are empty until StoreRoot. Without the collector it does nothing.
+
+        :param objects: number of the slots of the objects.
+        :param environments: number of the slots of the environments.
+        """
+
+        self.__objects = objects
+        self.__environments = environments
+
+    @property
+    def objects(self) -> int:
+        return self.__objects
+
+    @property
+    def environments(self) -> int:
+        return self.__environments
+
+    def __repr__(self) -> str:
+        return f"PushRoots({self.__objects}, {self.__environments})"
+
+
+class StoreRoot(Instruction):
+    def __init__(self, value: Temp, slot: int, clear: bool = False):
+        """
+        Stores the object or the environment to the root slot of its type, so the collector doesn't free it while the slot isn't reused.
+
+        :param clear: whether the slot is emptied instead: environment on the C-stack is gone after its destruction, the collector mustn't read it.
+        """
+
+        self.__value = value
+        self.__slot = slot
+        self.__clear = clear
+
+    @property
+    def value(self) -> Temp:
+        return self.__value
+
+    @property
+    def slot(self) -> int:
+        return self.__slot
+
+    @property
+    def clear(self) -> bool:
+        return self.__clear
+
+    @property
+    def operands(self) -> list[Value]:
+        return [self.__value]
+
+    def __repr__(self) -> str:
+        value = "NULL" if self.__clear else repr(self.__value)
+        return f"StoreRoot({value} -> {self.__slot})"
+
+
+class PopRoots(Instruction):
+    """
+    Pops the frame of PushRoots from the shadow stack at the end of the function.
+    """
+
+
+class SafePoint(Instruction):
+    """
+    Point where the collector may run: it's started when the heap has grown enough since the last collection.
+    """
+
+
+class Verbatim(Instruction):
+    def __init__(self, text: str):
+        """
+        C-code that is emitted as is (bodies of the platform definitions, translated prelude).
+        """
+
+        self.__text = text
+
+    @property
+    def text(self) -> str:
+        return self.__text
+
+    def __repr__(self) -> str:
+        return f"Verbatim({self.__text!r})"
@@ -0,0 +1,42 @@
+__all__ = [
+    "Pass",
+    "PassManager",
+    "ElideRefCounts",
+    "format_ref_count_report",
+    "UnboxNumbers",
+    "format_unboxing_report",
+    "EliminateSelfTailCalls",
+    "ProperTailCalls",
+    "TAIL_CALLS_FEATURE",
+    "ConvertClosures",
+    "AllocateStackFrames",
+    "RegisterRoots",
+    "default_passes",
+]
+
+from .manager import Pass, PassManager
+from .ref_count import ElideRefCounts, format_ref_count_report
+from .unboxing import UnboxNumbers, format_unboxing_report
+from .tail_calls import EliminateSelfTailCalls, ProperTailCalls, TAIL_CALLS_FEATURE
+from .closures import ConvertClosures
+from .stack_frames import AllocateStackFrames
+from .roots import RegisterRoots
+
+
+def default_passes(tail_calls: bool = False) -> list[Pass]:
+    """
+    Returns passes that are run on every translated program.
+
+    :param tail_calls: whether all tail calls are made through the trampoline, otherwise only the programs with "(declare tail-calls)" use it.
+    """
+
+    # Unboxing removes and adds reference counting, so it's done before the elision. Tail calls are found after both: only the cleanup can follow the call in the tail position. Closures are converted after the self tail calls are found by the variables the lambdas are bound to, and before the stack allocation: flat closures don't capture environments. Roots are found last, when every temporary and call is in place
+    return [
+        UnboxNumbers(),
+        ElideRefCounts(),
+        EliminateSelfTailCalls(),
+        ProperTailCalls(tail_calls),
+        ConvertClosures(),
+        AllocateStackFrames(),
+        RegisterRoots(),
+    ]
@@ -0,0 +1,100 @@
+from typing import Iterator, Optional
+
+from ..frames import Frame
+from ..instructions import (
+    Block,
+    Instruction,
+    MakeLambda,
+    GetVariable,
+    SetVariable,
+    UpdateVariable,
+    If,
+    Loop,
+    TailLoop,
+    Verbatim,
+)
+from ..program import Program
+from ..values import Value
+
+__all__ = [
+    "Variable",
+    "iter_instructions",
+    "mentions",
+    "variable_of",
+    "find_platform_frames",
+]
+
+
+# Lisp-variable of the environment: frame of the environment and name of the variable
+Variable = tuple[Frame, str]
+
+
+def iter_instructions(block: Block) -> Iterator[Instruction]:
+    """
+    Iterates over the instructions of the block and of the nested blocks in the order of the code.
+    """
+
+    for instruction in block:
+        yield instruction
+
+        for nested in instruction.blocks:
+            yield from iter_instructions(nested)
+
+
+def mentions(instruction: Instruction, value: Value) -> bool:
+    """
+    Checks whether the instruction (or any instruction of its blocks) uses the value. Verbatim code is treated as using everything.
+    """
+
+    for i in iter_instructions([instruction]):
+        if isinstance(i, Verbatim) or value in i.operands:
+            return True
+
+        if isinstance(i, If) and value in (i.then_value, i.else_value):
+            return True
+
+        if isinstance(i, Loop) and value == i.exit_value:
+            return True
+
+        if isinstance(i, TailLoop) and value == i.value:
+            return True
+
+    return False
+
+
+def variable_of(instruction: GetVariable | SetVariable | UpdateVariable) -> Variable:
+    """
+    Returns the variable that is accessed by the instruction.
+    """
+
+    if isinstance(instruction, SetVariable):
+        return instruction.frame, instruction.name
+
+    return instruction.address.frame, instruction.name
+
+
+def find_platform_frames(program: Program) -> set[Frame]:
+    """
+    Returns frames whose variables can be accessed by names: environments of the calls of the platform definitions and their ancestors.
+    """
+
+    lambda_frames = {}
+    for block in [program.main, *(f.body for f in program.functions)]:
+        for i in iter_instructions(block):
+            if isinstance(i, MakeLambda):
+                lambda_frames[i.function] = i.frame
+
+    frames = set()
+
+    for f in program.functions:
+        if f.name not in lambda_frames or not any(
+            isinstance(i, Verbatim) for i in iter_instructions(f.body)
+        ):
+            continue
+
+        frame: Optional[Frame] = lambda_frames[f.name]
+        while frame is not None:
+            frames.add(frame)
+            frame = frame.parent
+
+    return frames
@@ -0,0 +1,276 @@
+from typing import Optional
+
+from ..frames import Frame, Address
+from ..instructions import (
+    Block,
+    MakeLambda,
+    MakeEvaluable,
+    MakeClosure,
+    GetVariable,
+    GetCell,
+    SetVariable,
+    UpdateVariable,
+)
+from ..program import Program
+from ..values import Temp, Value
+from .blocks import Variable, find_platform_frames, iter_instructions, variable_of
+from .manager import Pass
+
+__all__ = ["ConvertClosures"]
+
+
+MAIN = "main"
+
+
+class ConvertClosures(Pass):
+    def __init__(self):
+        """
+        Class turns the lambdas that are created in the nested environments into flat closures: the closure keeps only the variables that its function (with the lambdas and promises created in it) accesses instead of the whole chain of the environments where it was created. The captured values are copied into the closure record when the closure is created, the record is the parent of the environments of the calls and the global environment is the parent of the record, so captured variables are accessed at the fixed depth without the walk over the chain.
+
+        Copy is correct only for the variable that already has its final value when it's captured: it's defined once, it's never assigned by "set!" and all closures that capture it directly are created after its definition by the same function. Other captured variables (recursive functions, variables of "letrec" and "do", assigned ones) are kept in cells: the environment and the closures share the cell, copies of the environment for the iterations of "do" get new cells.
+
+        Lambdas of the global environment are flat already, lambdas that are created in the environments of the platform definitions keep their environments (code of the platform definitions accesses variables by names).
+        """
+
+        self.__count = 0
+
+    @property
+    def name(self) -> str:
+        return "convert_closures"
+
+    @property
+    def count(self) -> int:
+        """
+        Number of the lambdas that were turned into flat closures in the last processed program.
+        """
+
+        return self.__count
+
+    def run(self, program: Program) -> None:
+        self.__count = 0
+
+        bodies = {f.name: f.body for f in program.functions}
+        bodies[MAIN] = program.main
+
+        creations: dict[str, tuple[str, MakeLambda | MakeEvaluable]] = {}
+        for owner, body in bodies.items():
+            for i in iter_instructions(body):
+                if isinstance(i, (MakeLambda, MakeEvaluable)):
+                    creations[i.function] = (owner, i)
+
+        platform_frames = find_platform_frames(program)
+        closures = {
+            f: i
+            for f, (_, i) in creations.items()
+            if isinstance(i, MakeLambda) and _can_convert(i.frame, platform_frames)
+        }
+
+        # All variables are found before the frames are changed: addresses are resolved in the current frames
+        accesses = _find_accesses(bodies, creations)
+        captures = {
+            f: _find_captures(i.frame, accesses[f]) for f, i in closures.items()
+        }
+        cells = _find_cells(bodies, creations, captures)
+
+        for frame, name in cells:
+            frame.keep_in_cell(name)
+
+        replacements: dict[int, Block] = {}
+
+        for f, i in closures.items():
+            # Converted lambdas are created in the nested environments, see _can_convert
+            parent = i.frame.parent
+            assert parent is not None
+
+            record = _find_root(parent)
+
+            if captures[f]:
+                record = Frame(record)
+                for v in captures[f]:
+                    record.add(v[1])
+                    if v in cells:
+                        record.keep_in_cell(v[1])
+
+            replacements[id(i)] = _capture(i, captures[f], cells)
+            _rebase(bodies[f], parent, record)
+            i.frame.attach(record)
+
+        for body in bodies.values():
+            _replace(body, replacements)
+
+        self.__count = len(closures)
+
+
+def _can_convert(frame: Frame, platform_frames: set[Frame]) -> bool:
+    parent = frame.parent
+
+    return (
+        parent is not None
+        and parent.parent is not None
+        and frame not in platform_frames
+        and parent not in platform_frames
+    )
+
+
+def _find_root(frame: Frame) -> Frame:
+    while frame.parent is not None:
+        frame = frame.parent
+
+    return frame
+
+
+def _is_inside(frame: Optional[Frame], scope: Frame) -> bool:
+    while frame is not None:
+        if frame is scope:
+            return True
+
+        frame = frame.parent
+
+    return False
+
+
+def _find_accesses(
+    bodies: dict[str, Block],
+    creations: dict[str, tuple[str, MakeLambda | MakeEvaluable]],
+) -> dict[str, list[Variable]]:
+    """
+    Returns variables that are accessed by every function and by the functions created in it (in the order of the first access).
+    """
+
+    children: dict[str, list[str]] = {}
+    for f, (owner, _) in creations.items():
+        children.setdefault(owner, []).append(f)
+
+    accesses: dict[str, list[Variable]] = {}
+
+    def visit(name: str) -> list[Variable]:
+        if name not in accesses:
+            variables = [
+                variable_of(i)
+                for i in iter_instructions(bodies[name])
+                if isinstance(i, (GetVariable, UpdateVariable))
+            ]
+            for child in children.get(name, []):
+                variables.extend(visit(child))
+
+            accesses[name] = list(dict.fromkeys(variables))
+
+        return accesses[name]
+
+    for name in bodies:
+        visit(name)
+
+    return accesses
+
+
+def _find_captures(frame: Frame, accesses: list[Variable]) -> list[Variable]:
+    """
+    Returns variables that the lambda with the frame captures: accessed variables of the outer environments except the global ones.
+    """
+
+    return [
+        v for v in accesses if v[0].parent is not None and not _is_inside(v[0], frame)
+    ]
+
+
+def _find_cells(
+    bodies: dict[str, Block],
+    creations: dict[str, tuple[str, MakeLambda | MakeEvaluable]],
+    captures: dict[str, list[Variable]],
+) -> set[Variable]:
+    """
+    Returns captured variables that can't be copied into the closure records, see ConvertClosures.
+    """
+
+    definitions: dict[Variable, list[tuple[str, int]]] = {}
+    assigned: set[Variable] = set()
+    positions: dict[int, int] = {}
+
+    for owner, body in bodies.items():
+        for k, i in enumerate(iter_instructions(body)):
+            positions[id(i)] = k
+
+            if isinstance(i, SetVariable):
+                definitions.setdefault(variable_of(i), []).append((owner, k))
+            elif isinstance(i, UpdateVariable):
+                assigned.add(variable_of(i))
+
+    cells = set()
+
+    for f, variables in captures.items():
+        owner, instruction = creations[f]
+        position = positions[id(instruction)]
+
+        # Variables that the owner captured itself are copied from its record, they are never changed there
+        inherited = set(captures.get(owner, []))
+
+        for v in variables:
+            if v in inherited:
+                continue
+
+            places = definitions.get(v, [])
+            if (
+                v in assigned
+                or len(places) != 1
+                or places[0][0] != owner
+                or places[0][1] > position
+            ):
+                cells.add(v)
+
+    return cells
+
+
+def _capture(
+    instruction: MakeLambda, captures: list[Variable], cells: set[Variable]
+) -> Block:
+    """
+    Returns the code that reads the captured variables (or their cells) in the environment where the lambda is created and creates the flat closure.
+    """
+
+    code: Block = []
+    values: list[Value] = []
+    parent = instruction.frame.parent
+    assert parent is not None
+
+    for k, v in enumerate(captures, 1):
+        value = Temp(f"{instruction.result.name}_capture{k}")
+        read = GetCell if v in cells else GetVariable
+        code.append(read(value, instruction.env, Address(parent, v[1])))
+        values.append(value)
+
+    code.append(
+        MakeClosure(
+            instruction.result,
+            instruction.function,
+            instruction.frame,
+            values,
+            instruction.stack,
+        )
+    )
+
+    return code
+
+
+def _rebase(block: Block, old: Frame, new: Frame) -> None:
+    """
+    Makes the accesses of the function that search variables in the environment where the closure was created search them in the closure record.
+    """
+
+    for k, i in enumerate(block):
+        if isinstance(i, GetVariable):
+            block[k] = type(i)(i.result, i.env, i.address.rebase(old, new))
+        elif isinstance(i, UpdateVariable):
+            block[k] = UpdateVariable(
+                i.result, i.env, i.address.rebase(old, new), i.value, i.move
+            )
+
+        for nested in i.blocks:
+            _rebase(nested, old, new)
+
+
+def _replace(block: Block, replacements: dict[int, Block]) -> None:
+    block[:] = [r for i in block for r in replacements.get(id(i), [i])]
+
+    for instruction in block:
+        for nested in instruction.blocks:
+            _replace(nested, replacements)
@@ -0,0 +1,61 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from src.timings import Timings
+from ..program import Program
+
+__all__ = ["Pass", "PassManager"]
+
+
+class Pass(ABC):
+    """
+    Class represents a transformation of the IR. Pass changes the program in place.
+    """
+
+    @property
+    @abstractmethod
+    def name(self) -> str:
+        """
+        Name of the pass, it's used in the timings.
+        """
+
+    @abstractmethod
+    def run(self, program: Program) -> None:
+        pass
+
+
+class PassManager:
+    def __init__(self, passes: Optional[list[Pass]] = None):
+        """
+        Class runs passes over the program in the order they were added.
+
+        :param passes: initial passes.
+        """
+
+        self.__passes: list[Pass] = [] if passes is None else list(passes)
+
+    @property
+    def passes(self) -> list[Pass]:
+        return self.__passes
+
+    def add(self, pass_: Pass) -> None:
+        """
+        Adds the pass to the end of the pipeline.
+        """
+
+        self.__passes.append(pass_)
+
+    def run(self, program: Program, timings: Optional[Timings] = None) -> None:
+        """
+        Runs all passes over the program.
+
+        :param program: program to transform.
+        :param timings: if given, every pass is measured as "pass: <name>".
+        """
+
+        if timings is None:
+            timings = Timings()
+
+        for p in self.__passes:
+            with timings.measure(f"pass: {p.name}"):
+                p.run(program)
@@ -0,0 +1,237 @@
+from typing import Optional
+
+from ..instructions import (
+    Block,
+    GetVariable,
+    SetVariable,
+    UpdateVariable,
+    IncRef,
+    DecRef,
+    If,
+)
+from ..program import Program
+from ..values import Temp, Value, ValueType
+from .blocks import iter_instructions, mentions
+from .manager import Pass
+
+__all__ = ["ElideRefCounts", "format_ref_count_report"]
+
+
+# Statistics of the function: name ("function"), number of the reference counting operations before and after the pass ("before", "after") and number of the transfers that were turned into moves ("moves")
+ReportRow = dict
+
+
+class ElideRefCounts(Pass):
+    def __init__(self):
+        """
+        Class removes redundant reference counting. It's based on the ownership of the values: results of all instructions except GetVariable are owned by the function until they are released by DecRef, so the reference count of an owned value can't drop to zero before its release and changes of the reference count in between are redundant.
+
+        Pass does the following in every block:
+
+        * releases of the owned values that follow "if" are sunk into both branches, so a branch that returns the value just moves it;
+        * increase of the owned value is removed together with the following release of the value when there are no other uses of the value in between (pairs are found across statements, not only adjacent ones);
+        * definition or assignment of the owned variable that is followed by the release of the value becomes a move: the environment takes the reference of the value instead of creating its own one.
+
+        Statistics of every function are collected into the report.
+        """
+
+        self.__report: list[ReportRow] = []
+
+    @property
+    def name(self) -> str:
+        return "elide_ref_counts"
+
+    @property
+    def report(self) -> list[ReportRow]:
+        """
+        Statistics of the functions of the last processed program, "main" is the last one.
+        """
+
+        return self.__report
+
+    def run(self, program: Program) -> None:
+        self.__report = []
+
+        bodies = [(f.name, f.body) for f in program.functions]
+        bodies.append(("main", program.main))
+
+        for name, body in bodies:
+            owned = {
+                i.result
+                for i in iter_instructions(body)
+                if i.result is not None
+                and i.result.type_ is ValueType.OBJECT
+                and not isinstance(i, GetVariable)
+            }
+
+            before = _count_ref_count_operations(body)
+            moves = self.__elide(body, owned)
+
+            self.__report.append(
+                {
+                    "function": name,
+                    "before": before,
+                    "after": _count_ref_count_operations(body),
+                    "moves": moves,
+                }
+            )
+
+    def __elide(self, block: Block, owned: set[Temp]) -> int:
+        self.__sink_releases(block, owned)
+        self.__cancel_pairs(block, owned)
+        moves = self.__make_moves(block, owned)
+
+        for instruction in block:
+            for nested in instruction.blocks:
+                moves += self.__elide(nested, owned)
+
+        return moves
+
+    @staticmethod
+    def __sink_releases(block: Block, owned: set[Temp]) -> None:
+        # Only the instructions after the current one are removed, so enumeration isn't broken
+        for k, instruction in enumerate(block):
+            if not isinstance(instruction, If):
+                continue
+
+            for value in _find_branch_increases(instruction):
+                if value not in owned:
+                    continue
+
+                j = _find_release(block, k + 1, value)
+                if j is None:
+                    continue
+
+                # The value isn't used between "if" and its release, so it can be released at the end of the branches
+                del block[j]
+                instruction.then_block.append(DecRef(value))
+                instruction.else_block.append(DecRef(value))
+
+    @staticmethod
+    def __cancel_pairs(block: Block, owned: set[Temp]) -> None:
+        i = 0
+
+        while i < len(block):
+            instruction = block[i]
+
+            if isinstance(instruction, IncRef) and instruction.value in owned:
+                j = _find_release(block, i + 1, instruction.value)
+
+                if j is not None:
+                    del block[j]
+                    del block[i]
+                    continue
+
+            i += 1
+
+    @staticmethod
+    def __make_moves(block: Block, owned: set[Temp]) -> int:
+        moves = 0
+
+        for i, instruction in enumerate(block):
+            if (
+                not isinstance(instruction, (SetVariable, UpdateVariable))
+                or instruction.move
+                or instruction.value not in owned
+            ):
+                continue
+
+            j = _find_release(block, i + 1, instruction.value)
+            if j is None:
+                continue
+
+            del block[j]
+            block[i] = (
+                SetVariable(
+                    instruction.env,
+                    instruction.name,
+                    instruction.value,
+                    instruction.frame,
+                    move=True,
+                )
+                if isinstance(instruction, SetVariable)
+                else UpdateVariable(
+                    instruction.result,
+                    instruction.env,
+                    instruction.address,
+                    instruction.value,
+                    move=True,
+                )
+            )
+            moves += 1
+
+        return moves
+
+
+def format_ref_count_report(report: list[ReportRow]) -> str:
+    """
+    Returns the report of the reference counting elision as a table with the total in the last row.
+
+    :param report: statistics of the functions, see ElideRefCounts.report.
+    """
+
+    total = {
+        "function": "total",
+        "before": sum(r["before"] for r in report),
+        "after": sum(r["after"] for r in report),
+        "moves": sum(r["moves"] for r in report),
+    }
+
+    header = ["Function", "Before", "After", "Removed", "Moves"]
+    rows = [
+        [
+            r["function"],
+            str(r["before"]),
+            str(r["after"]),
+            str(r["before"] - r["after"]),
+            str(r["moves"]),
+        ]
+        for r in [*report, total]
+    ]
+
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(
+            cell.ljust(width) if i == 0 else cell.rjust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in [header, *rows]
+    )
+
+
+def _count_ref_count_operations(block: Block) -> int:
+    return sum(isinstance(i, (IncRef, DecRef)) for i in iter_instructions(block))
+
+
+def _find_release(block: Block, start: int, value: Value) -> Optional[int]:
+    """
+    Returns index of the release of the value if it's the first use of the value in the block starting from the given index.
+    """
+
+    for j in range(start, len(block)):
+        instruction = block[j]
+
+        if isinstance(instruction, DecRef) and instruction.value == value:
+            return j
+
+        if mentions(instruction, value):
+            return None
+
+    return None
+
+
+def _find_branch_increases(instruction: If) -> list[Value]:
+    """
+    Returns values that are increased in the branches of "if" or of the nested ones (not in loops, their blocks are repeated).
+    """
+
+    values = []
+
+    for block in instruction.blocks:
+        for i in block:
+            if isinstance(i, IncRef):
+                values.append(i.value)
+            elif isinstance(i, If):
+                values.extend(_find_branch_increases(i))
+
+    return list(dict.fromkeys(values))
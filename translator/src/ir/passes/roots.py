@@ -0,0 +1,248 @@
+from bisect import bisect_right
+from typing import Optional
+
+from ..instructions import (
+    Block,
+    Instruction,
+    Call,
+    TailCall,
+    TailApply,
+    Force,
+    MoveEnvironment,
+    DestroyEnvironment,
+    IncRef,
+    DecRef,
+    If,
+    Loop,
+    TailLoop,
+    PushRoots,
+    StoreRoot,
+    PopRoots,
+    SafePoint,
+)
+from ..program import Program
+from ..values import Temp, ValueType
+from .blocks import iter_instructions
+from .manager import Pass
+
+__all__ = ["RegisterRoots"]
+
+
+class RegisterRoots(Pass):
+    def __init__(self):
+        """
+        Class makes the values of the C-frames visible to the tracing collector of the runtime (it's compiled in with CL_GC). The collector runs only at the safe points: calls of the procedures, forcing of the promises and the polls at the entries of the calling functions and at the iterations of the loops. Object and environment temporaries that are live across a safe point are stored into the root slots of the frame (the shadow stack), temporaries that aren't live at the same time share the slots.
+
+        Root instructions are printed as macros that are empty without the collector, so the same C-code is compiled with either memory manager. Reference counting is compiled out with the collector, so IncRef, DecRef and the destruction of the environments don't keep the values alive. Platform definitions are left as is: their code doesn't call procedures.
+        """
+
+        self.__count = 0
+
+    @property
+    def name(self) -> str:
+        return "register_roots"
+
+    @property
+    def count(self) -> int:
+        """
+        Number of the temporaries that were stored into the roots in the last processed program.
+        """
+
+        return self.__count
+
+    def run(self, program: Program) -> None:
+        self.__count = 0
+
+        self.__register(program.main, None)
+        for f in program.functions:
+            if f.result is None:
+                continue
+
+            # Function that calls nothing can't run for long: its loops poll by themselves
+            if any(_calls(i) for i in iter_instructions(f.body)):
+                f.body.insert(0, SafePoint())
+            self.__register(f.body, f.result)
+
+    def __register(self, body: Block, result: Optional[Temp]) -> None:
+        _poll_loops(body)
+
+        liveness = _Liveness()
+        liveness.visit(body)
+        if result is not None:
+            liveness.use(result, liveness.position)
+
+        slots = liveness.assign_slots()
+        if not slots:
+            return
+
+        self.__count += len(slots)
+
+        _store_roots(body, slots)
+
+        objects = sum(1 for t in slots if t.type_ is ValueType.OBJECT)
+        params = [
+            StoreRoot(t, slot) for t, slot in slots.items() if t not in liveness.defs
+        ]
+        body[:0] = [PushRoots(objects, len(slots) - objects), *params]
+        body.append(PopRoots())
+
+
+class _Liveness:
+    def __init__(self):
+        """
+        Class numbers the instructions in the order of the code and finds the positions of the definitions and the last uses of the temporaries and the positions of the safe points. Compound instructions take two positions: before and after their blocks, their results are defined after them.
+        """
+
+        self.position = 0
+        self.defs: dict[Temp, int] = {}
+        self.last_uses: dict[Temp, int] = {}
+        self.safe_points: list[int] = []
+        self.__loops: list[tuple[int, set[Temp]]] = []
+
+    def visit(self, block: Block) -> None:
+        for i in block:
+            start = self.__next()
+
+            if not _releases(i):
+                for operand in i.operands:
+                    if isinstance(operand, Temp):
+                        self.use(operand, start)
+
+            if _is_safe_point(i):
+                self.safe_points.append(start)
+
+            is_loop = isinstance(i, (Loop, TailLoop))
+            if is_loop:
+                self.__loops.append((start, set()))
+
+            for nested in i.blocks:
+                self.visit(nested)
+
+            end = self.__next()
+
+            for value in _compound_values(i):
+                self.use(value, end)
+
+            # Temporaries of the enclosing blocks that are used in the loop are needed by its next iterations
+            if is_loop:
+                _, used = self.__loops.pop()
+                for t in used:
+                    self.use(t, end)
+
+            if i.result is not None:
+                self.defs[i.result] = end
+
+    def use(self, value: Temp, position: int) -> None:
+        if value.type_ not in (ValueType.OBJECT, ValueType.ENVIRONMENT):
+            return
+
+        self.last_uses[value] = max(self.last_uses.get(value, position), position)
+
+        definition = self.defs.get(value, -1)
+        for start, used in self.__loops:
+            if start > definition:
+                used.add(value)
+
+    def assign_slots(self) -> dict[Temp, int]:
+        """
+        Returns slots of the temporaries that are live across the safe points. Slots of the objects and of the environments are numbered separately, the slot is reused when its temporary is dead.
+        """
+
+        live = []
+        for t, last in self.last_uses.items():
+            definition = self.defs.get(t, -1)
+            # The nearest safe point after the definition
+            k = bisect_right(self.safe_points, definition)
+            if k < len(self.safe_points) and self.safe_points[k] <= last:
+                live.append((definition, last, t))
+
+        slots: dict[Temp, int] = {}
+        ends: dict[ValueType, list[int]] = {
+            ValueType.OBJECT: [],
+            ValueType.ENVIRONMENT: [],
+        }
+
+        for definition, last, t in sorted(live, key=lambda x: (x[0], x[2].name)):
+            pool = ends[t.type_]
+            slot = next((s for s, end in enumerate(pool) if end <= definition), None)
+            if slot is None:
+                slot = len(pool)
+                pool.append(last)
+            else:
+                pool[slot] = last
+            slots[t] = slot
+
+        return slots
+
+    def __next(self) -> int:
+        self.position += 1
+        return self.position
+
+
+def _releases(instruction: Instruction) -> bool:
+    """
+    Checks whether the instruction does nothing with the collector, so it doesn't keep its operands alive. Environment on the C-stack is kept until its destruction: its slot is emptied there.
+    """
+
+    if isinstance(instruction, DestroyEnvironment):
+        return not instruction.stack
+
+    return isinstance(instruction, (IncRef, DecRef))
+
+
+def _calls(instruction: Instruction) -> bool:
+    return isinstance(instruction, (Call, Force))
+
+
+def _is_safe_point(instruction: Instruction) -> bool:
+    # Tail calls are made by the trampoline after the function returns
+    if isinstance(instruction, (TailCall, TailApply)):
+        return False
+
+    return _calls(instruction) or isinstance(instruction, SafePoint)
+
+
+def _compound_values(instruction: Instruction) -> list[Temp]:
+    if isinstance(instruction, If):
+        values = [instruction.then_value, instruction.else_value]
+    elif isinstance(instruction, Loop):
+        values = [instruction.exit_value]
+    elif isinstance(instruction, TailLoop):
+        values = [instruction.value, *(p.env for p in instruction.params)]
+    else:
+        values = []
+
+    return [v for v in values if isinstance(v, Temp)]
+
+
+def _poll_loops(block: Block) -> None:
+    for i in block:
+        if isinstance(i, Loop):
+            i.test_block.insert(0, SafePoint())
+        elif isinstance(i, TailLoop):
+            i.body_block.insert(0, SafePoint())
+
+        for nested in i.blocks:
+            _poll_loops(nested)
+
+
+def _store_roots(block: Block, slots: dict[Temp, int]) -> None:
+    """
+    Stores the temporaries into their slots right after they are defined (or rebound by MoveEnvironment). Slots of the environments on the C-stack are emptied after their destruction.
+    """
+
+    stored: Block = []
+    for i in block:
+        for nested in i.blocks:
+            _store_roots(nested, slots)
+
+        stored.append(i)
+
+        value = i.env if isinstance(i, MoveEnvironment) else i.result
+        if value is not None and value in slots:
+            stored.append(StoreRoot(value, slots[value]))
+
+        if isinstance(i, DestroyEnvironment) and i.stack and i.env in slots:
+            stored.append(StoreRoot(i.env, slots[i.env], clear=True))
+
+    block[:] = stored
@@ -0,0 +1,111 @@
+from ..frames import Frame
+from ..instructions import (
+    Block,
+    MakeLambda,
+    MakeEvaluable,
+    MakeClosure,
+    MakeEnvironment,
+    MoveEnvironment,
+    DestroyEnvironment,
+)
+from ..program import Program
+from ..values import Temp
+from .blocks import find_platform_frames, iter_instructions
+from .manager import Pass
+
+__all__ = ["AllocateStackFrames"]
+
+
+class AllocateStackFrames(Pass):
+    def __init__(self):
+        """
+        Class allocates environments that are never captured on the C-stack: such environment isn't allocated in the heap, isn't registered in the runtime and isn't reference counted, only its values are released when its scope ends. It's done for the environments of "let", "let*", "letrec" and "do" and for the environments of the calls of the lambdas (the runtime allocates them on its stack).
+
+        Environment is captured when a lambda or a promise is created in it or in its nested environments (they keep references to their ancestors), flat closures copy their variables and don't capture it. Environment with variables in cells is treated as captured: its copies for the iterations of "do" must get new cells. Environments of the calls of the platform definitions and their ancestors are treated as captured too, their code can do anything with the environment. Copies of the environments for the iterations of "do" aren't needed for the environments on the stack, so they are removed.
+        """
+
+        self.__count = 0
+
+    @property
+    def name(self) -> str:
+        return "allocate_stack_frames"
+
+    @property
+    def count(self) -> int:
+        """
+        Number of the environments (scopes and lambdas) that were allocated on the stack in the last processed program.
+        """
+
+        return self.__count
+
+    def run(self, program: Program) -> None:
+        self.__count = 0
+
+        captured = _find_captured_frames(program)
+
+        for body in [program.main, *(f.body for f in program.functions)]:
+            stack_envs: set[Temp] = set()
+            self.__allocate(body, captured, stack_envs)
+            _release(body, stack_envs)
+
+    def __allocate(
+        self, block: Block, captured: set[Frame], stack_envs: set[Temp]
+    ) -> None:
+        for k, i in enumerate(block):
+            if isinstance(i, MakeEnvironment) and i.frame not in captured:
+                block[k] = MakeEnvironment(i.result, i.parent, i.frame, stack=True)
+                stack_envs.add(i.result)
+                self.__count += 1
+            elif isinstance(i, MakeLambda) and i.frame not in captured:
+                block[k] = MakeLambda(i.result, i.function, i.env, i.frame, stack=True)
+                self.__count += 1
+            elif isinstance(i, MakeClosure) and i.frame not in captured:
+                block[k] = MakeClosure(
+                    i.result, i.function, i.frame, i.captures, stack=True
+                )
+                self.__count += 1
+
+            for nested in i.blocks:
+                self.__allocate(nested, captured, stack_envs)
+
+
+def _find_captured_frames(program: Program) -> set[Frame]:
+    frames = find_platform_frames(program)
+
+    for block in [program.main, *(f.body for f in program.functions)]:
+        for i in iter_instructions(block):
+            if isinstance(i, MakeLambda):
+                frame = i.frame.parent
+            elif isinstance(i, MakeEvaluable):
+                frame = i.frame
+            elif isinstance(i, MakeEnvironment) and i.frame.cells:
+                # Cells are shared with the closures, copies of the environment for the iterations of "do" need new ones
+                frame = i.frame
+            else:
+                continue
+
+            while frame is not None:
+                frames.add(frame)
+                frame = frame.parent
+
+    return frames
+
+
+def _release(block: Block, stack_envs: set[Temp]) -> None:
+    """
+    Makes the destruction of the environments on the stack release only their values and removes their copies.
+    """
+
+    block[:] = [
+        (
+            DestroyEnvironment(i.env, stack=True)
+            if isinstance(i, DestroyEnvironment) and i.env in stack_envs
+            else i
+        )
+        for i in block
+        if not (isinstance(i, MoveEnvironment) and i.env in stack_envs)
+    ]
+
+    for instruction in block:
+        for nested in instruction.blocks:
+            _release(nested, stack_envs)
@@ -0,0 +1,259 @@
+from typing import Optional
+
+from ..instructions import (
+    Block,
+    Instruction,
+    MakeLambda,
+    MakeEvaluable,
+    MakeClosure,
+    MakeRestList,
+    GetVariable,
+    SetVariable,
+    UpdateVariable,
+    Call,
+    Apply,
+    TailCall,
+    TailApply,
+    DestroyEnvironment,
+    IncRef,
+    DecRef,
+    If,
+    Loop,
+    SelfTailCall,
+    TailLoop,
+    Verbatim,
+)
+from ..program import Function, FunctionKind, Program
+from ..values import Argument, Temp, Value
+from .blocks import Variable, iter_instructions, mentions, variable_of
+from .manager import Pass
+
+__all__ = ["EliminateSelfTailCalls", "ProperTailCalls", "TAIL_CALLS_FEATURE"]
+
+
+# Position of the instruction: block and index in it
+Position = tuple[Block, int]
+
+# Feature of the program that enables ProperTailCalls, see Program.features
+TAIL_CALLS_FEATURE = "tail-calls"
+
+
+class EliminateSelfTailCalls(Pass):
+    def __init__(self):
+        """
+        Class turns self calls of the lambdas in the tail position into loops: instead of the recursive call the parameters are rebound in the same environment and the body is repeated, so the recursion runs in the constant space of the C-stack and without new environments.
+
+        Call is a self call when the callee is the variable that is bound to the lambda (by "define", "let", "letrec" and so on) exactly once and never changed, so it always refers to the function itself. Call is in the tail position when its value becomes the value of the function: only releases of the other values and destruction of the environments follow it, possibly through the branches of "if", bodies of "begin" and "let" and the exit of "do".
+
+        Function is transformed when it has only fixed parameters and doesn't create closures or promises (they could capture the environment that is reused), code of the platform definitions isn't transformed too. Self calls with other number of the arguments are left as they are.
+        """
+
+        self.__count = 0
+
+    @property
+    def name(self) -> str:
+        return "eliminate_self_tail_calls"
+
+    @property
+    def count(self) -> int:
+        """
+        Number of the self tail calls that were eliminated in the last processed program.
+        """
+
+        return self.__count
+
+    def run(self, program: Program) -> None:
+        self.__count = 0
+
+        bindings = _find_bindings(program)
+        functions = program.functions
+
+        for k, f in enumerate(functions):
+            if f.kind is not FunctionKind.LAMBDA or f.name not in bindings:
+                continue
+
+            transformed = self.__transform(f, bindings[f.name])
+            if transformed is not None:
+                functions[k] = transformed
+
+    def __transform(self, function: Function, variable: Variable) -> Optional[Function]:
+        body = function.body
+
+        if function.result is None or not _can_repeat(body):
+            return None
+
+        params = []
+        for i in body:
+            if not isinstance(i, SetVariable) or not isinstance(i.value, Argument):
+                break
+
+            params.append(i)
+
+        callees = {
+            i.result
+            for i in iter_instructions(body)
+            if isinstance(i, GetVariable) and variable_of(i) == variable
+        }
+
+        calls: list[tuple[Block, int, Call]] = []
+        for block, index in _find_tail_calls(body, function.result):
+            call = block[index]
+            if (
+                isinstance(call, Call)
+                and not isinstance(call, Apply)
+                and call.callee in callees
+                and len(call.args) == len(params)
+            ):
+                calls.append((block, index, call))
+
+        if not calls:
+            return None
+
+        for block, index, call in calls:
+            block[index] = SelfTailCall(call.result, call.args)
+
+        self.__count += len(calls)
+
+        # Reading of the callee has no effects, so it's removed when the callee isn't used by other calls
+        unused = {c for c in callees if not any(mentions(i, c) for i in body)}
+        _remove_reads(body, unused)
+
+        result = Temp(f"{function.result.name}_tail")
+        loop = TailLoop(result, body[len(params) :], function.result, params)
+
+        return Function(function.name, function.kind, [*params, loop], result)
+
+
+class ProperTailCalls(Pass):
+    def __init__(self, enabled: bool = False):
+        """
+        Class makes all calls in the tail position of the lambdas through the trampoline of the runtime: the function returns the call to the trampoline instead of making it, so any chain of the tail calls (mutual recursion, state machines) runs in the bounded C-stack. Trampoline adds work to every tail call (the arguments are saved by the runtime and copied back), so the pass is opt-in: it's enabled by the parameter or by "(declare tail-calls)" in the program.
+
+        Pass is run after EliminateSelfTailCalls, so self tail calls stay loops.
+
+        :param enabled: whether tail calls are made through the trampoline in every program.
+        """
+
+        self.__enabled = enabled
+        self.__count = 0
+
+    @property
+    def name(self) -> str:
+        return "proper_tail_calls"
+
+    @property
+    def count(self) -> int:
+        """
+        Number of the calls that were made through the trampoline in the last processed program.
+        """
+
+        return self.__count
+
+    def run(self, program: Program) -> None:
+        self.__count = 0
+
+        if not self.__enabled and TAIL_CALLS_FEATURE not in program.features:
+            return
+
+        for f in program.functions:
+            if f.kind is not FunctionKind.LAMBDA or f.result is None:
+                continue
+
+            calls = _find_tail_calls(f.body, f.result)
+
+            for block, index in calls:
+                call = block[index]
+                # Only calls and applications are found in the tail positions
+                assert isinstance(call, Call)
+
+                tail_call = TailApply if isinstance(call, Apply) else TailCall
+                block[index] = tail_call(call.result, call.callee, call.args)
+
+            self.__count += len(calls)
+
+
+def _find_bindings(program: Program) -> dict[str, Variable]:
+    """
+    Returns variables that are bound to the lambdas once and never changed: name of the C-function -> variable.
+    """
+
+    lambdas: dict[Value, str] = {}
+    bindings: dict[str, Variable] = {}
+    assignments: dict[Variable, int] = {}
+
+    for block in [program.main, *(f.body for f in program.functions)]:
+        for i in iter_instructions(block):
+            if isinstance(i, (MakeLambda, MakeClosure)):
+                lambdas[i.result] = i.function
+            elif isinstance(i, (SetVariable, UpdateVariable)):
+                v = variable_of(i)
+                assignments[v] = assignments.get(v, 0) + 1
+
+                if isinstance(i, SetVariable) and i.value in lambdas:
+                    bindings[lambdas[i.value]] = v
+
+    return {f: v for f, v in bindings.items() if assignments[v] == 1}
+
+
+def _can_repeat(body: Block) -> bool:
+    """
+    Checks whether the body can be repeated in the same environment.
+    """
+
+    return not any(
+        isinstance(i, (MakeLambda, MakeEvaluable, MakeClosure, MakeRestList, Verbatim))
+        for i in iter_instructions(body)
+    )
+
+
+def _remove_reads(block: Block, temps: set[Temp]) -> None:
+    block[:] = [
+        i for i in block if not (isinstance(i, GetVariable) and i.result in temps)
+    ]
+
+    for instruction in block:
+        for nested in instruction.blocks:
+            _remove_reads(nested, temps)
+
+
+def _find_tail_calls(block: Block, value: Value) -> list[Position]:
+    """
+    Returns calls and applications whose results become the value of the block.
+    """
+
+    for k in reversed(range(len(block))):
+        instruction = block[k]
+
+        if instruction.result == value:
+            break
+
+        if not _is_cleanup(instruction, value):
+            return []
+    else:
+        return []
+
+    if isinstance(instruction, Call):
+        return [(block, k)]
+
+    if isinstance(instruction, If):
+        return _find_tail_calls(
+            instruction.then_block, instruction.then_value
+        ) + _find_tail_calls(instruction.else_block, instruction.else_value)
+
+    if isinstance(instruction, Loop):
+        return _find_tail_calls(instruction.exit_block, instruction.exit_value)
+
+    if isinstance(instruction, TailLoop):
+        return _find_tail_calls(instruction.body_block, instruction.value)
+
+    return []
+
+
+def _is_cleanup(instruction: Instruction, value: Value) -> bool:
+    if isinstance(instruction, IncRef):
+        return instruction.value == value
+
+    if isinstance(instruction, DecRef):
+        return instruction.value != value
+
+    return isinstance(instruction, DestroyEnvironment)
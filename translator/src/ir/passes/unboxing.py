@@ -0,0 +1,471 @@
+import re
+from typing import Optional, Union
+
+from ..instructions import (
+    Block,
+    Instruction,
+    ConstantKind,
+    MakeConstant,
+    GetVariable,
+    SetVariable,
+    UpdateVariable,
+    CallBuiltin,
+    ToBoolean,
+    MakeEnvironment,
+    MoveEnvironment,
+    DecRef,
+    DeclareLocal,
+    Assign,
+    Copy,
+    NativeConstant,
+    NativeOperation,
+    Box,
+    If,
+    Loop,
+)
+from ..program import Program
+from ..values import Temp, Value, ValueType
+from .blocks import (
+    Variable,
+    find_platform_frames,
+    iter_instructions,
+    mentions,
+    variable_of,
+)
+from .manager import Pass
+
+__all__ = ["UnboxNumbers", "format_unboxing_report"]
+
+# Statistics of the function: name ("function") and unboxed variables with their types ("variables")
+ReportRow = dict
+
+# Operators of C for the standard functions that are computed with the native values
+ARITHMETIC = {"+": "+", "-": "-", "*": "*"}
+COMPARISONS = {"<": "<", ">": ">", "<=": "<=", ">=": ">=", "=": "=="}
+
+NUMBERS = {ValueType.INTEGER, ValueType.DOUBLE}
+SUFFIXES = {ValueType.INTEGER: "i", ValueType.DOUBLE: "d", ValueType.BOOLEAN: "b"}
+
+# Type of the value that depends on the variable whose type isn't inferred yet
+PENDING = "pending"
+
+Type = Union[ValueType, str]
+
+
+class UnboxNumbers(Pass):
+    def __init__(self):
+        """
+        Class keeps numeric variables in the native locals of C instead of the environments. Variable is unboxed when:
+
+        * it's a variable of "let" or "do" of the function (variables of the lambda calls and the global ones are set by other functions);
+        * no other function (lambda or promise created in its scope) accesses it, code of the platform definitions can't access it too;
+        * every value that is assigned to it is always an integer or always a double: numeric literal, unboxed variable or result of "+", "-", "*" of such values (product with zero is the integer zero, so only the product of integers is typed).
+
+        Arithmetic and comparisons of the unboxed values are computed inline, results of the comparisons are used as conditions directly. Values are boxed only when they escape: are passed to other functions, returned, displayed and so on.
+
+        Unboxed variables of every function are collected into the report.
+        """
+
+        self.__report: list[ReportRow] = []
+
+    @property
+    def name(self) -> str:
+        return "unbox_numbers"
+
+    @property
+    def report(self) -> list[ReportRow]:
+        """
+        Unboxed variables of the functions of the last processed program, "main" is the last one.
+        """
+
+        return self.__report
+
+    def run(self, program: Program) -> None:
+        self.__report = []
+
+        bodies = [(f.name, f.body) for f in program.functions]
+        bodies.append(("main", program.main))
+
+        accesses = {name: _find_accesses(body) for name, body in bodies}
+        platform_frames = find_platform_frames(program)
+
+        for name, body in bodies:
+            frames = {
+                i.frame
+                for i in iter_instructions(body)
+                if isinstance(i, MakeEnvironment)
+            }
+            others: set[Variable] = set()
+            for other, accessed in accesses.items():
+                if other != name:
+                    others.update(accessed)
+
+            candidates = [
+                v
+                for v in accesses[name]
+                if v[0] in frames and v[0] not in platform_frames and v not in others
+            ]
+
+            variables = _infer_variables(body, candidates)
+            if variables:
+                _Unboxing(body, variables).run()
+
+            self.__report.append(
+                {
+                    "function": name,
+                    "variables": [(v[1], t) for v, t in variables.items()],
+                }
+            )
+
+
+def format_unboxing_report(report: list[ReportRow]) -> str:
+    """
+    Returns the report of the unboxing as a table: every function with its unboxed variables.
+
+    :param report: unboxed variables of the functions, see UnboxNumbers.report.
+    """
+
+    header = ["Function", "Unboxed variables"]
+    rows = [
+        [
+            r["function"],
+            ", ".join(f"{n}: {t.value}" for n, t in r["variables"]) or "-",
+        ]
+        for r in report
+    ]
+
+    width = max(len(row[0]) for row in [header, *rows])
+    return "\n".join(f"{row[0].ljust(width)}  {row[1]}" for row in [header, *rows])
+
+
+class _Unboxing:
+    def __init__(self, body: Block, variables: dict[Variable, ValueType]):
+        """
+        Class rewrites the body of the function: unboxed variables become native locals, values that are computed from them become native temporaries.
+        """
+
+        self.__body = body
+        self.__variables = variables
+        self.__types, _ = _infer_temps(body, set(variables), variables)
+        self.__locals = {
+            v: Temp(f"{re.sub(r'[^0-9a-zA-Z_]', '_', v[1])}_{k}", t)
+            for k, (v, t) in enumerate(variables.items(), 1)
+        }
+
+        self.__definitions: dict[Value, Instruction] = {
+            i.result: i
+            for i in iter_instructions(body)
+            if i.result is not None and i.result in self.__types
+        }
+        self.__native = self.__find_native()
+        self.__boxed = self.__find_boxed()
+
+    def run(self) -> None:
+        self.__rewrite(self.__body)
+
+    def __find_native(self) -> set[Value]:
+        """
+        Returns temporaries that are computed natively: reads of the unboxed variables and values that are used natively (assigned to the unboxed variables, used as conditions or as operands of the native operations).
+        """
+
+        types = self.__types
+        stack: list[Value] = []
+
+        for i in iter_instructions(self.__body):
+            if isinstance(i, GetVariable) and self.__is_unboxed(i):
+                stack.append(i.result)
+            elif isinstance(i, (SetVariable, UpdateVariable)) and self.__is_unboxed(i):
+                stack.append(i.value)
+            elif isinstance(i, ToBoolean) and types.get(i.value) is ValueType.BOOLEAN:
+                stack.append(i.value)
+            elif isinstance(i, If) and types.get(i.condition) is ValueType.BOOLEAN:
+                stack.append(i.condition)
+
+        native: set[Value] = set()
+
+        while stack:
+            value = stack.pop()
+            if value in native:
+                continue
+
+            native.add(value)
+
+            definition = self.__definitions[value]
+            if isinstance(definition, CallBuiltin):
+                stack.extend(definition.args)
+
+        return native
+
+    def __find_boxed(self) -> set[Value]:
+        """
+        Returns native temporaries that are also needed as objects.
+        """
+
+        native = self.__native
+        boxed: set[Value] = set()
+
+        for i in iter_instructions(self.__body):
+            if isinstance(i, DecRef) or self.__uses_natively(i):
+                continue
+
+            values = list(i.operands)
+            if isinstance(i, If):
+                values = [i.then_value, i.else_value]
+                if not self.__is_condition(i.condition):
+                    values.append(i.condition)
+            elif isinstance(i, Loop):
+                values.append(i.exit_value)
+
+            boxed.update(v for v in values if v in native)
+
+        return boxed
+
+    def __uses_natively(self, instruction: Instruction) -> bool:
+        native = self.__native
+
+        if isinstance(instruction, CallBuiltin):
+            return instruction.result in native
+
+        if isinstance(instruction, (SetVariable, UpdateVariable)):
+            return self.__is_unboxed(instruction)
+
+        if isinstance(instruction, ToBoolean):
+            return self.__is_condition(instruction.value)
+
+        return False
+
+    def __is_condition(self, value: Value) -> bool:
+        """
+        Checks whether the value is the native boolean value that is used as the condition directly.
+        """
+
+        return value in self.__native and self.__types[value] is ValueType.BOOLEAN
+
+    def __is_unboxed(
+        self, instruction: GetVariable | SetVariable | UpdateVariable
+    ) -> bool:
+        return variable_of(instruction) in self.__variables
+
+    def __value(self, value: Value) -> Temp:
+        type_ = self.__types[value]
+
+        # Only temporaries of the inferred types are computed natively, arguments are always objects
+        assert isinstance(value, Temp) and isinstance(type_, ValueType)
+
+        return Temp(f"{value.name}_{SUFFIXES[type_]}", type_)
+
+    def __rewrite(self, block: Block) -> None:
+        native = self.__native
+        boxed = self.__boxed
+        variables = self.__variables
+        rewritten: Block = []
+        borrowed: list[Temp] = []
+
+        for instruction in block:
+            for nested in instruction.blocks:
+                self.__rewrite(nested)
+
+            if isinstance(instruction, MakeEnvironment):
+                rewritten.append(instruction)
+                frame = instruction.frame
+                rewritten.extend(
+                    DeclareLocal(self.__locals[(frame, name)])
+                    for name in frame.variables
+                    if (frame, name) in variables
+                )
+            elif isinstance(instruction, MoveEnvironment) and self.__is_empty(
+                instruction.env
+            ):
+                # Copy of the environment without variables is the same environment
+                continue
+            elif instruction.result in native and isinstance(
+                instruction, (MakeConstant, GetVariable, CallBuiltin)
+            ):
+                result = instruction.result
+                rewritten.append(self.__compute(instruction))
+
+                if result in boxed:
+                    rewritten.append(Box(result, self.__value(result)))
+                    if isinstance(instruction, GetVariable):
+                        borrowed.append(result)
+            elif isinstance(
+                instruction, (SetVariable, UpdateVariable)
+            ) and self.__is_unboxed(instruction):
+                local = self.__locals[variable_of(instruction)]
+                rewritten.append(Assign(local, self.__value(instruction.value)))
+
+                if isinstance(instruction, UpdateVariable):
+                    rewritten.append(
+                        MakeConstant(instruction.result, ConstantKind.UNSPECIFIED)
+                    )
+            elif isinstance(instruction, ToBoolean) and self.__is_condition(
+                instruction.value
+            ):
+                rewritten.append(
+                    Copy(instruction.result, self.__value(instruction.value))
+                )
+            elif isinstance(instruction, If) and self.__is_condition(
+                instruction.condition
+            ):
+                rewritten.append(
+                    If(
+                        instruction.result,
+                        condition=self.__value(instruction.condition),
+                        then_block=instruction.then_block,
+                        then_value=instruction.then_value,
+                        else_block=instruction.else_block,
+                        else_value=instruction.else_value,
+                    )
+                )
+            elif (
+                isinstance(instruction, DecRef)
+                and instruction.value in native
+                and instruction.value not in boxed
+            ):
+                continue
+            else:
+                rewritten.append(instruction)
+
+        # Boxes of the borrowed values are owned, so they are released after their last use
+        for value in borrowed:
+            last = max(i for i, x in enumerate(rewritten) if mentions(x, value))
+            rewritten.insert(last + 1, DecRef(value))
+
+        block[:] = rewritten
+
+    def __compute(
+        self, instruction: MakeConstant | GetVariable | CallBuiltin
+    ) -> Instruction:
+        result = self.__value(instruction.result)
+
+        if isinstance(instruction, MakeConstant):
+            # Only numeric literals are typed
+            assert instruction.value is not None
+            return NativeConstant(result, instruction.value)
+
+        if isinstance(instruction, GetVariable):
+            return Copy(result, self.__locals[variable_of(instruction)])
+
+        left, right = instruction.args
+        operator = ARITHMETIC.get(instruction.name) or COMPARISONS[instruction.name]
+        return NativeOperation(
+            result, operator, self.__value(left), self.__value(right)
+        )
+
+    def __is_empty(self, env: Temp) -> bool:
+        for i in iter_instructions(self.__body):
+            if isinstance(i, MakeEnvironment) and i.result == env:
+                return all((i.frame, n) in self.__variables for n in i.frame.variables)
+
+        return False
+
+
+def _find_accesses(body: Block) -> set[Variable]:
+    return {
+        variable_of(i)
+        for i in iter_instructions(body)
+        if isinstance(i, (GetVariable, SetVariable, UpdateVariable))
+    }
+
+
+def _infer_variables(
+    body: Block, candidates: list[Variable]
+) -> dict[Variable, ValueType]:
+    """
+    Returns variables that always hold values of the same numeric type, in the order of their first assignment.
+
+    Inference is optimistic: values that depend on the variables with unknown types are ignored until the types are known, variables with values of other or different types are excluded. Variables whose types can't be inferred this way (values depend only on each other) are excluded too.
+    """
+
+    variables: dict[Variable, ValueType] = {}
+    live = set(candidates)
+
+    while True:
+        _, assigned = _infer_temps(body, live, variables)
+        changed = False
+
+        for v in list(live):
+            types = set(assigned.get(v, [])) - {PENDING}
+
+            if not types <= NUMBERS or len(types) > 1:
+                live.discard(v)
+                variables.pop(v, None)
+                changed = True
+            elif types and variables.get(v) not in types:
+                type_ = types.pop()
+                assert isinstance(type_, ValueType)
+                variables[v] = type_
+                changed = True
+
+        if changed:
+            continue
+
+        undecided = {
+            v for v in live if v not in variables or PENDING in assigned.get(v, [])
+        }
+        if not undecided:
+            break
+
+        live -= undecided
+        for v in undecided:
+            variables.pop(v, None)
+
+    order = list(dict.fromkeys(assigned))
+    return {v: variables[v] for v in order if v in variables}
+
+
+def _infer_temps(
+    body: Block, live: set[Variable], variables: dict[Variable, ValueType]
+) -> tuple[dict[Value, Type], dict[Variable, list[Optional[Type]]]]:
+    """
+    Returns native types of the temporaries and types of the values assigned to the live variables (None for the values of unknown types).
+    """
+
+    temps: dict[Value, Type] = {}
+    assigned: dict[Variable, list[Optional[Type]]] = {}
+
+    for i in iter_instructions(body):
+        if isinstance(i, MakeConstant):
+            if i.kind is ConstantKind.INTEGER:
+                temps[i.result] = ValueType.INTEGER
+            elif i.kind is ConstantKind.FLOAT:
+                temps[i.result] = ValueType.DOUBLE
+        elif isinstance(i, GetVariable):
+            v = variable_of(i)
+            if v in live:
+                temps[i.result] = variables.get(v, PENDING)
+        elif isinstance(i, CallBuiltin) and i.binary:
+            left, right = i.args
+            type_ = _operation_type(i.name, temps.get(left), temps.get(right))
+            if type_ is not None:
+                temps[i.result] = type_
+        elif isinstance(i, (SetVariable, UpdateVariable)):
+            v = variable_of(i)
+            if v in live:
+                assigned.setdefault(v, []).append(temps.get(i.value))
+
+    return temps, assigned
+
+
+def _operation_type(
+    name: str, left: Optional[Type], right: Optional[Type]
+) -> Optional[Type]:
+    operands = {left, right}
+
+    if not operands <= NUMBERS | {PENDING}:
+        return None
+
+    if name in COMPARISONS:
+        return ValueType.BOOLEAN
+
+    if name not in ARITHMETIC:
+        return None
+
+    if PENDING in operands:
+        return PENDING
+
+    if operands == {ValueType.INTEGER}:
+        return ValueType.INTEGER
+
+    # Product with zero is the integer zero, so type of the product with a double isn't known
+    return None if name == "*" else ValueType.DOUBLE
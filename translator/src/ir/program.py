@@ -0,0 +1,100 @@
+from enum import Enum
+from typing import Optional
+
+from .instructions import Block
+from .values import Temp
+
+__all__ = ["FunctionKind", "Function", "Program"]
+
+
+class FunctionKind(Enum):
+    LAMBDA = "lambda"
+    EVALUABLE = "evaluable"
+
+
+class Function:
+    def __init__(
+        self, name: str, kind: FunctionKind, body: Block, result: Optional[Temp]
+    ):
+        """
+        Class represents a C-function of the lambda or of the promise.
+
+        :param name: name of the C-function.
+        :param kind: kind of the function, it defines the parameters.
+        :param body: body of the function.
+        :param result: returned value (owned), None if the body returns by itself (platform definitions).
+        """
+
+        self.__name = name
+        self.__kind = kind
+        self.__body = body
+        self.__result = result
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def kind(self) -> FunctionKind:
+        return self.__kind
+
+    @property
+    def body(self) -> Block:
+        return self.__body
+
+    @property
+    def result(self) -> Optional[Temp]:
+        return self.__result
+
+
+class Program:
+    def __init__(
+        self,
+        declarations: list[str],
+        functions: list[Function],
+        main: Block,
+        features: frozenset[str] = frozenset(),
+    ):
+        """
+        Class represents the whole program.
+
+        :param declarations: C-code of the functions that are declared before the others (translated prelude).
+        :param functions: functions of the lambdas and promises.
+        :param main: body of the "main".
+        :param features: features that are enabled by the program with "(declare ...)".
+        """
+
+        self.__declarations = declarations
+        self.__functions = functions
+        self.__main = main
+        self.__features = features
+
+    @property
+    def declarations(self) -> list[str]:
+        return self.__declarations
+
+    @property
+    def functions(self) -> list[Function]:
+        return self.__functions
+
+    @property
+    def main(self) -> Block:
+        return self.__main
+
+    @property
+    def features(self) -> frozenset[str]:
+        return self.__features
+
+    def iter_blocks(self):
+        """
+        Yields every block of the program: bodies of the functions, body of the "main" and all nested blocks. Outer blocks are yielded before nested ones.
+        """
+
+        stack = [self.__main] + [f.body for f in reversed(self.__functions)]
+
+        while stack:
+            block = stack.pop()
+            yield block
+
+            for instruction in reversed(block):
+                stack.extend(reversed(instruction.blocks))
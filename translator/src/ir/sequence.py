@@ -0,0 +1,114 @@
+from typing import Optional, Union
+
+from .instructions import Block
+
+__all__ = ["Sequence", "wrap", "nest", "join", "transfer_cleanup"]
+
+
+class Sequence:
+    def __init__(self, main: Optional[Block] = None, cleanup: Optional[Block] = None):
+        """
+        Class represents lowered code of an expression: main part computes the value, cleanup part releases it and all intermediate values. Cleanup is separated from the main part, so the value lives until the enclosing code doesn't need it.
+
+        :param main: instructions of the main part.
+        :param cleanup: instructions of the cleanup part.
+        """
+
+        self.__main = [] if main is None else main
+        self.__cleanup = [] if cleanup is None else cleanup
+
+    @property
+    def main(self) -> Block:
+        return self.__main
+
+    @property
+    def cleanup(self) -> Block:
+        return self.__cleanup
+
+    def instructions(self) -> Block:
+        """
+        Returns the whole code: main part followed by cleanup part.
+        """
+
+        return self.__main + self.__cleanup
+
+    def clear_cleanup(self) -> None:
+        self.__cleanup = []
+
+
+def wrap(sequence: Sequence, wrapping: Union[Sequence, list[Sequence]]) -> Sequence:
+    """
+    Function wraps sequence into the wrapping: main parts of the wrapping are executed first, cleanup parts are executed after the cleanup of the sequence in reverse order.
+
+    **Example**
+
+    sequence: main ``a``, cleanup ``~a``; wrapping: ``[b/~b, c/~c]``
+
+    result: main ``b c a``, cleanup ``~a ~c ~b``
+
+    :param sequence: sequence to wrap.
+    :param wrapping: wrappings for the sequence. Single sequence works as list of one element with it.
+    """
+
+    if isinstance(wrapping, Sequence):
+        wrapping = [wrapping]
+
+    main = []
+    for w in wrapping:
+        main.extend(w.main)
+    main.extend(sequence.main)
+
+    cleanup = list(sequence.cleanup)
+    for w in reversed(wrapping):
+        cleanup.extend(w.cleanup)
+
+    return Sequence(main, cleanup)
+
+
+def nest(sequences: list[Sequence]) -> Sequence:
+    """
+    Function nests sequences: main parts are executed in order, cleanup parts in reverse order.
+
+    **Example**
+
+    sequences: ``[a/~a, b/~b, c/~c]``
+
+    result: main ``a b c``, cleanup ``~c ~b ~a``
+
+    :param sequences: sequences to nest.
+    """
+
+    return wrap(sequences[-1], sequences[:-1])
+
+
+def join(sequences: list[Sequence]) -> Block:
+    """
+    Function joins sequences: every sequence is executed with its cleanup before the next one.
+
+    **Example**
+
+    sequences: ``[a/~a, b/~b]``
+
+    result: ``a ~a b ~b``
+
+    :param sequences: sequences to join.
+    """
+
+    block = []
+    for s in sequences:
+        block.extend(s.main)
+        block.extend(s.cleanup)
+
+    return block
+
+
+def transfer_cleanup(from_: Sequence, to_: Sequence) -> None:
+    """
+    Function moves cleanup part from one sequence to the beginning of the cleanup part of another one.
+
+    :param from_: the sequence to move from.
+    :param to_: the sequence to move to.
+    """
+
+    to_.cleanup[:0] = from_.cleanup
+    from_.clear_cleanup()
@@ -0,0 +1,71 @@
+from enum import Enum
+
+__all__ = ["ValueType", "Temp", "Argument", "Value"]
+
+
+class ValueType(Enum):
+    OBJECT = "object"
+    ENVIRONMENT = "environment"
+    BOOLEAN = "boolean"
+    INTEGER = "integer"
+    DOUBLE = "double"
+
+
+class Temp:
+    def __init__(self, name: str, type_: ValueType = ValueType.OBJECT):
+        """
+        Class represents a temporary value of the IR. Every object temporary is assigned only once (results of the conditions and loops are assigned in every branch, like phi-nodes), environment temporaries are rebound only by MoveEnvironment, native locals (see DeclareLocal) are assigned by Assign.
+
+        Temporaries are compared by names, so the same variable can be referenced by different instances.
+
+        :param name: name of the temporary, it's the name of the C-variable.
+        :param type_: type of the value.
+        """
+
+        self.__name = name
+        self.__type = type_
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def type_(self) -> ValueType:
+        return self.__type
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Temp) and self.__name == other.__name
+
+    def __hash__(self) -> int:
+        return hash(self.__name)
+
+    def __repr__(self) -> str:
+        return f"%{self.__name}"
+
+
+class Argument:
+    def __init__(self, index: int):
+        """
+        Class represents an argument of the called lambda. Arguments are borrowed: the caller owns them.
+
+        :param index: index of the argument.
+        """
+
+        self.__index = index
+
+    @property
+    def index(self) -> int:
+        return self.__index
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Argument) and self.__index == other.__index
+
+    def __hash__(self) -> int:
+        return hash(("argument", self.__index))
+
+    def __repr__(self) -> str:
+        return f"arg{self.__index}"
+
+
+# Value that can be an operand of the instruction
+Value = Temp | Argument
@@ -1,14 +1,17 @@
 import argparse
 import sys
 
-from src.ast_reading import read_ast
-from src.ast_visiting import ASTVisitor
-from src.postprocessing import postprocess, PostprocessingContext
-from src.preprocessing import preprocess
-from src.rendering import CodeCreator
+from src.ir.passes import (
+    ElideRefCounts,
+    UnboxNumbers,
+    default_passes,
+    format_ref_count_report,
+    format_unboxing_report,
+)
 from src.source_reading import read_from_stdin, read_from_file
 from src.symbols import Symbols
-from src.templates import Templates
+from src.timings import Timings, format_timings
+from src.translation import translate, load_prelude, describe_exception
 
 
 def write_generated_code(code_lines: list[str], output_file: str) -> None:
@@ -38,38 +41,93 @@ def main():
     )
     parser.add_argument("-o", "--output-file", default="output.c")
     parser.add_argument("-s", "--symbols-table", default="symbols.json")
-    parser.add_argument("-t", "--templates", default="code_templates")
+    parser.add_argument(
+        "-p",
+        "--prelude-cache",
+        default=".prelude_cache",
+        help="Directory where translated standard functions are cached",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Report wall time, CPU time and peak RSS of every phase of translation",
+    )
+    parser.add_argument(
+        "--timings-format",
+        choices=["text", "json"],
+        default="text",
+        help="Format of the timings report",
+    )
+    parser.add_argument(
+        "--timings-file", help="Write the report to the file instead of stderr"
+    )
+    parser.add_argument(
+        "--ref-count-report",
+        action="store_true",
+        help="Report how many reference counting operations were removed in every function",
+    )
+    parser.add_argument(
+        "--unboxing-report",
+        action="store_true",
+        help="Report which variables of every function are kept in native locals",
+    )
+    parser.add_argument(
+        "--tail-calls",
+        action="store_true",
+        help='Make all calls in the tail position through the trampoline of the runtime, as if the program had "(declare tail-calls)"',
+    )
     args = parser.parse_args()
 
-    source = read_from_stdin() if args.input_stdin else read_from_file(args.input_file)
-    read_ast(source)  # So syntax errors will be detected and printed with correct lines number
+    timings = Timings()
 
-    preprocessed = preprocess(source)
-    ast = read_ast(preprocessed)
+    try:
+        with timings.measure("read source"):
+            source = (
+                read_from_stdin()
+                if args.input_stdin
+                else read_from_file(args.input_file)
+            )
 
-    symbols = Symbols(args.symbols_table)
-    templates = Templates(args.templates)
+        with timings.measure("load symbols"):
+            symbols = Symbols(args.symbols_table)
 
-    code_creator = CodeCreator(symbols, templates)
+        with timings.measure("load prelude"):
+            prelude = load_prelude(symbols, args.prelude_cache)
 
-    visitor = ASTVisitor(
-        symbols=symbols,
-        code_creator=code_creator,
-    )
-    code_text = visitor.visit(ast)
+        passes = default_passes(tail_calls=args.tail_calls)
+        code_lines = translate(source, symbols, prelude, timings, passes)
+
+        if args.ref_count_report:
+            for p in passes:
+                if isinstance(p, ElideRefCounts):
+                    print(format_ref_count_report(p.report), file=sys.stderr)
+
+        if args.unboxing_report:
+            for p in passes:
+                if isinstance(p, UnboxNumbers):
+                    print(format_unboxing_report(p.report), file=sys.stderr)
+
+        with timings.measure("write"):
+            write_generated_code(code_lines, args.output_file)
+    finally:
+        if args.timings:
+            write_timings(timings, args.timings_format, args.timings_file)
+
+
+def write_timings(timings: Timings, fmt: str, timings_file: str | None) -> None:
+    report = format_timings(timings.phases, fmt)
 
-    preprocessing_context = PostprocessingContext(code_creator)
-    preprocessed_code_lines = postprocess(code_text, preprocessing_context)
+    if timings_file is None:
+        print(report, file=sys.stderr)
+        return
 
-    write_generated_code(preprocessed_code_lines, args.output_file)
+    with open(timings_file, "w") as f:
+        f.write(report + "\n")
 
 
 if __name__ == "__main__":
     try:
         main()
     except Exception as e:
-        curr_e = e
-        while curr_e:
-            print(curr_e, file=sys.stderr)
-            curr_e = curr_e.__cause__
+        print(describe_exception(e), file=sys.stderr)
         exit(1)
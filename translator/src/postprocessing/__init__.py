@@ -1,4 +0,0 @@
-__all__ = ["postprocess", "PostprocessingContext"]
-
-from .postprocessing import postprocess
-from .context import PostprocessingContext
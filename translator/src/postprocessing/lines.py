@@ -1 +0,0 @@
-Lines = list[str]
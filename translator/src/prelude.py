@@ -0,0 +1,118 @@
+__all__ = ["Prelude", "PRELUDE_CODE"]
+
+
+# Standard functions that are written on Lisp. They are translated once, then generated code is reused by every program
+PRELUDE_CODE = """
+(define (abs x)
+  (if (>= x 0)
+    x
+    (- x)))
+
+(define (zero? x) (= x 0))
+
+(define (negative? x) (< x 0))
+
+(define (positive? x) (> x 0))
+
+(define (empty? coll) (= (length coll) 0))
+
+(define (member? coll el)
+  (if (> (length coll) 0)
+    (if (= (car coll) el)
+      #t
+      (member? (cdr coll) el))
+    #f))
+
+(define (append coll el)
+  (define (_append _coll _res)
+    (if (> (length _coll) 0)
+      (cons (car _coll) (_append (cdr _coll) _res))
+      (list el)))
+  (_append coll (list)))
+
+(define (map f coll)
+  (letrec ((_map (lambda (_coll _res)
+                   (if (> (length _coll) 0)
+                     (_map (cdr _coll) (append _res (f (car _coll))))
+                     _res))))
+    (_map coll (list))))
+
+(define (filter pred coll)
+  (letrec ((_filter (lambda (_coll _res)
+                   (if (> (length _coll) 0)
+                     (let ((el (car _coll)))
+                       (if (pred el)
+                         (_filter (cdr _coll) (append _res el))
+                         (_filter (cdr _coll) _res)))
+                     _res))))
+    (_filter coll (list))))
+
+(define (quotient n1 n2)
+  (to-integer(/ n1 n2)))
+
+(define (remainder n1 n2)
+  (- n1 (* n2 (quotient n1 n2))))
+
+(define (modulo n1 n2)
+  (define _floor (native cmath/floor double double))
+  (if (< n2 0)
+    (- (modulo (- n1) (- n2)))
+    (if (>= n1 0)
+      (remainder n1 n2)
+      (+ n1 (- (* n2 (to-integer (_floor (to-double (/ n1 n2))))))))))\n\n"""
+
+
+class Prelude:
+    def __init__(
+        self,
+        declarations: list[str],
+        main_body: str,
+        variables: list[str],
+        counters: dict[str, int],
+    ):
+        """
+        Class represents the translated standard functions written on Lisp.
+
+        :param declarations: rendered declarations of the C-functions.
+        :param main_body: code that binds the functions in the global environment (at the beginning of the "main").
+        :param variables: names of the variables defined in the global environment.
+        :param counters: counters of the variable manager after translation, so names in the program don't collide with the names in the prelude.
+        """
+
+        self.__declarations = declarations
+        self.__main_body = main_body
+        self.__variables = variables
+        self.__counters = counters
+
+    @property
+    def declarations(self) -> list[str]:
+        return self.__declarations
+
+    @property
+    def main_body(self) -> str:
+        return self.__main_body
+
+    @property
+    def variables(self) -> list[str]:
+        return self.__variables
+
+    @property
+    def counters(self) -> dict[str, int]:
+        return self.__counters
+
+    def to_dict(self) -> dict:
+        return {
+            "declarations": self.__declarations,
+            "main_body": self.__main_body,
+            "variables": self.__variables,
+            "counters": self.__counters,
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "Prelude":
+        return Prelude(
+            declarations=data["declarations"],
+            main_body=data["main_body"],
+            variables=data["variables"],
+            counters=data["counters"],
+        )
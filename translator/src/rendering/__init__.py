@@ -1,10 +0,0 @@
-__all__ = [
-    "CodeCreator",
-    "wrap_codes",
-    "nest_codes",
-    "join_codes",
-    "transfer_secondary",
-]
-
-from .creator import CodeCreator
-from .utils import wrap_codes, nest_codes, join_codes, transfer_secondary
@@ -1,20 +0,0 @@
-from .code import Code
-from .empty import EmptyCode
-from .get_variable_value import GetVariableValueCode
-from .lambda_call import LambdaCallCode
-from .function_definition import FunctionDefinitionCode
-from .make_environment import MakeEnvironmentCode
-from .make_callable import MakeCallableCode
-from .make_list_from_array import MakeListFromArrayCode
-from .make_primitive import MakePrimitiveCode
-from .program import ProgramCode
-from .set_variable_code import SetVariableValueCode
-from .update_variable_code import UpdateVariableValueCode
-from .make_primitive import MakePrimitiveCode
-from .condition import ConditionCode
-from .having_var import HavingVarCode
-from .evaluation import EvaluationCode
-from .native_call import NativeCallCode
-from .loop import LoopCode
-from .get_boolean_value import GetBooleanValueCode
-from .move_environment import MoveEnvironmentCode
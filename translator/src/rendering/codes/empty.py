@@ -1,6 +0,0 @@
-from .code import Code
-
-
-class EmptyCode(Code):
-    def __init__(self):
-        super().__init__()
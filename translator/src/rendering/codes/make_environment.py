@@ -1,24 +0,0 @@
-from typing import Optional
-
-from .code import Code
-from src.symbols import Symbols
-from src.templates import Templates
-
-
-class MakeEnvironmentCode(Code):
-    def __init__(self, symbols: Symbols, templates: Templates):
-        super().__init__(
-            main_template=templates.MAKE_ENVIRONMENT,
-            secondary_template=templates.DESTROY_ENVIRONMENT,
-            main_data={
-                "type": symbols.ENVIRONMENT_TYPE,
-                "func": symbols.CREATE_ENVIRONMENT,
-            },
-            secondary_data={"func": symbols.DESTROY_ENVIRONMENT},
-        )
-
-    def update_data(
-        self, var: Optional[str] = None, parent: Optional[str] = None
-    ) -> None:
-        self._update_main_data(var=var, parent=parent)
-        self._update_secondary_data(var=var)
@@ -0,0 +1,192 @@
+import argparse
+import fcntl
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from typing import Any, Optional
+
+from src.ir.passes import default_passes
+from src.prelude import Prelude
+from src.symbols import Symbols
+from src.timings import Timings
+from src.translation import translate, load_prelude, describe_exception
+
+# One request or response is one line of JSON:
+#
+# request:  {"source": "<Lisp-code>", "timings": <bool, optional>, "tail_calls": <bool, optional>}
+# response: {"code": "<C-code>", "timings": [<phases>, if requested]} or {"error": "<text of the error>"}
+#
+# Service requests: {"command": "ping"} and {"command": "shutdown"}, response: {"ok": true}
+
+
+class TranslationRequestHandler(socketserver.StreamRequestHandler):
+    server: "TranslationServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            self.server.touch()
+
+            try:
+                request = json.loads(line)
+                response = self.__process(request)
+            except Exception as e:
+                response = {"error": describe_exception(e)}
+
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+    def __process(self, request: dict) -> dict:
+        command = request.get("command")
+
+        if command == "ping":
+            return {"ok": True}
+
+        if command == "shutdown":
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return {"ok": True}
+
+        timings = Timings()
+        code_lines = translate(
+            request["source"],
+            self.server.symbols,
+            self.server.prelude,
+            timings,
+            default_passes(tail_calls=request.get("tail_calls", False)),
+        )
+
+        response: dict[str, Any] = {"code": "".join(l + "\n" for l in code_lines)}
+        if request.get("timings"):
+            response["timings"] = timings.phases
+
+        return response
+
+
+class TranslationServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: str,
+        symbols: Symbols,
+        prelude: Prelude,
+        idle_timeout: float,
+    ):
+        """
+        Class represents a long-lived translator: it keeps imported ANTLR-parser, loaded symbols and translated prelude and translates Lisp-code received through the Unix socket. Every connection is served in its own thread.
+
+        :param socket_path: path of the Unix socket.
+        :param symbols: symbols.
+        :param prelude: translated standard functions written on Lisp.
+        :param idle_timeout: the server stops after this number of seconds without requests (0 - never).
+        """
+
+        self.symbols = symbols
+        self.prelude = prelude
+        self.__idle_timeout = idle_timeout
+        self.__last_request_time = time.monotonic()
+
+        super().__init__(socket_path, TranslationRequestHandler)
+
+    def touch(self) -> None:
+        """
+        Remembers that the server is in use, so it won't be stopped by idle timeout.
+        """
+
+        self.__last_request_time = time.monotonic()
+
+    def service_actions(self) -> None:
+        if not self.__idle_timeout:
+            return
+
+        if time.monotonic() - self.__last_request_time > self.__idle_timeout:
+            # serve_forever() calls service_actions() in its own thread, so shutdown() can't be called here
+            threading.Thread(target=self.shutdown, daemon=True).start()
+
+
+def serve(
+    socket_path: str,
+    symbols: Symbols,
+    prelude: Prelude,
+    idle_timeout: float,
+):
+    """
+    Runs the server until it is stopped. Only one server can listen on the given path: if another one is already running, the function returns immediately.
+    """
+
+    lock = open(f"{socket_path}.lock", "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)  # Left by a server that wasn't stopped properly
+
+    with TranslationServer(socket_path, symbols, prelude, idle_timeout) as server:
+        try:
+            server.serve_forever(poll_interval=1)
+        finally:
+            os.unlink(socket_path)
+            lock.close()
+
+
+def request(socket_path: str, message: dict, timeout: Optional[float] = None) -> dict:
+    """
+    Sends the request to the server and returns its response.
+
+    :raises OSError: the server is unavailable.
+    """
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(socket_path)
+        with s.makefile("rwb") as f:
+            f.write(json.dumps(message).encode() + b"\n")
+            f.flush()
+            response = f.readline()
+
+    if not response:
+        raise ConnectionError("Translation server closed the connection")
+
+    return json.loads(response)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="CLisp translation server",
+        description="Translates Lisp-code to C-code on requests through the Unix socket.",
+    )
+    parser.add_argument("--socket", required=True, help="Path of the Unix socket")
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=1800,
+        help="Stop after this number of seconds without requests (0 - never)",
+    )
+    parser.add_argument(
+        "--stop", action="store_true", help="Stop the server listening on the socket"
+    )
+    parser.add_argument("-s", "--symbols-table", default="symbols.json")
+    parser.add_argument("-p", "--prelude-cache", default=".prelude_cache")
+    args = parser.parse_args()
+
+    if args.stop:
+        request(args.socket, {"command": "shutdown"})
+        return
+
+    symbols = Symbols(args.symbols_table)
+    prelude = load_prelude(symbols, args.prelude_cache)
+
+    serve(args.socket, symbols, prelude, args.idle_timeout)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(describe_exception(e), file=sys.stderr)
+        exit(1)
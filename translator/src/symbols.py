@@ -1,3 +1,4 @@
+import hashlib
 import json
 from typing import Optional, Any
 
@@ -22,43 +23,89 @@ class Symbols:
         :raises json.decoder.JSONDecodeError: file is invalid.
         """
 
-        self.__data = json.load(open(json_path))
+        with open(json_path) as f:
+            text = f.read()
+
+        self.__data = json.loads(text)
+        self.__digest = hashlib.sha256(text.encode()).hexdigest()
 
         self.BOOLEAN_TYPE = self.__find_internal("boolean_type")
+        self.INTEGER_TYPE = self.__find_internal("integer_type")
+        self.DOUBLE_TYPE = self.__find_internal("double_type")
         self.OBJECT_TYPE = self.__find_internal("object_type")
         self.ENVIRONMENT_TYPE = self.__find_internal("environment_type")
+        self.ENVIRONMENT_STRUCT_TYPE = self.__find_internal("environment_struct_type")
+        self.VARIABLE_TYPE = self.__find_internal("variable_type")
         self.NATIVE_ARGUMENT_TYPE = self.__find_internal("native_argument_type")
         self.CREATE_UNSPECIFIED = self.__find_internal("unspecified")
         self.CREATE_INTEGER = self.__find_internal("integer")
         self.CREATE_FLOAT = self.__find_internal("float")
+        self.CREATE_BOOLEAN = self.__find_internal("boolean")
         self.CREATE_STRING = self.__find_internal("string")
         self.CREATE_CHARACTER = self.__find_internal("character")
         self.CREATE_TRUE = self.__find_internal("true")
         self.CREATE_FALSE = self.__find_internal("false")
         self.CREATE_LAMBDA = self.__find_internal("lambda")
+        self.CREATE_CLOSURE = self.__find_internal("closure")
         self.CREATE_EVALUABLE = self.__find_internal("evaluable")
         self.CREATE_LIST_FROM_ARRAY = self.__find_internal("list_array")
         self.OBJECT_TO_BOOLEAN = self.__find_internal("to_boolean")
         self.CREATE_ENVIRONMENT = self.__find_internal("environment")
         self.MOVE_ENVIRONMENT = self.__find_internal("move_environment")
         self.DESTROY_ENVIRONMENT = self.__find_internal("~environment")
+        self.CREATE_STACK_ENVIRONMENT = self.__find_internal("environment_stack")
+        self.DESTROY_STACK_ENVIRONMENT = self.__find_internal("~environment_stack")
         self.GET_GLOBAL_ENVIRONMENT = self.__find_internal("environment_global")
         self.DESTROY_GLOBAL_ENVIRONMENT = self.__find_internal("~environment_global")
         self.GET_VARIABLE_VALUE = self.__find_internal("get_variable_value")
         self.SET_VARIABLE_VALUE = self.__find_internal("set_variable_value")
+        self.SET_VARIABLE_VALUE_MOVE = self.__find_internal("set_variable_value_move")
         self.UPDATE_VARIABLE_VALUE = self.__find_internal("update_variable_value")
+        self.UPDATE_VARIABLE_VALUE_MOVE = self.__find_internal(
+            "update_variable_value_move"
+        )
+        self.GET_VARIABLE_CELL = self.__find_internal("get_variable_cell")
+        self.GET_CELL_VARIABLE_VALUE = self.__find_internal("get_cell_variable_value")
+        self.SET_CELL_VARIABLE_VALUE = self.__find_internal("set_cell_variable_value")
+        self.SET_CELL_VARIABLE_VALUE_MOVE = self.__find_internal(
+            "set_cell_variable_value_move"
+        )
+        self.UPDATE_CELL_VARIABLE_VALUE = self.__find_internal(
+            "update_cell_variable_value"
+        )
+        self.UPDATE_CELL_VARIABLE_VALUE_MOVE = self.__find_internal(
+            "update_cell_variable_value_move"
+        )
         self.CALL_LAMBDA = self.__find_internal("lambda_call")
         self.CALL_LAMBDA_LIST = self.__find_internal("lambda_call_list")
+        self.TAIL_CALL_LAMBDA = self.__find_internal("lambda_tail_call")
+        self.TAIL_CALL_LAMBDA_LIST = self.__find_internal("lambda_tail_call_list")
+        self.ARITY_ERROR = self.__find_internal("arity_error")
         self.EVALUATE = self.__find_internal("evaluation")
         self.NATIVE_CALL = self.__find_internal("native_call")
         self.INCREASE_REF_COUNT = self.__find_internal("ref_count++")
         self.DECREASE_REF_COUNT = self.__find_internal("ref_count--")
+        self.PUSH_ROOTS = self.__find_internal("push_roots")
+        self.STORE_ROOT = self.__find_internal("root")
+        self.STORE_ENVIRONMENT_ROOT = self.__find_internal("environment_root")
+        self.POP_ROOTS = self.__find_internal("pop_roots")
+        self.SAFE_POINT = self.__find_internal("safe_point")
         self.LAMBDA_PARAMS = self.__find_internal("lambda_function_params")
         self.LAMBDA_ENV = self.__find_internal("lambda_env")
         self.LAMBDA_ARGS = self.__find_internal("lambda_args")
         self.LAMBDA_COUNT = self.__find_internal("lambda_count")
         self.EVALUABLE_PARAMS = self.__find_internal("evaluable_function_params")
         self.EVALUABLE_ENV = self.__find_internal("evaluable_env")
+        self.TAIL_CALL_ARGS = self.__find_internal("tail_call_args")
+        self.TAIL_CALL_FLAG = self.__find_internal("tail_call_flag")
+
+    @property
+    def digest(self) -> str:
+        """
+        Hash of the table, it changes whenever the table changes.
+        """
+
+        return self.__digest
 
     def try_find_native_type(self, identifier: str) -> Optional[str]:
         """
@@ -79,6 +126,26 @@ class Symbols:
 
         return list(self.__api_functions.items())
 
+    def try_find_api_function(self, identifier: str) -> Optional[str]:
+        """
+        Finds and returns the symbol (C-function) that matches an API function.
+
+        :param identifier: identifier of a symbol.
+        :return: found symbol or None.
+        """
+
+        return self.__api_functions.get(identifier, None)
+
+    def try_find_binary_api_function(self, identifier: str) -> Optional[str]:
+        """
+        Finds and returns the symbol (C-function) that matches an API function called with two arguments. Such function takes the arguments as parameters, not as an array.
+
+        :param identifier: identifier of a symbol.
+        :return: found symbol or None.
+        """
+
+        return self.__api["binary_functions"].get(identifier, None)
+
     def has_api_function_symbol(self, identifier: str) -> bool:
         """
         Returns whether there is an API symbol.
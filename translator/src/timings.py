@@ -0,0 +1,77 @@
+import json
+import resource
+import time
+from contextlib import contextmanager
+from typing import Any
+
+# Measured phase: name ("phase"), wall and CPU time in seconds ("wall", "cpu") and peak RSS in KiB ("max_rss")
+Phase = dict[str, Any]
+
+
+class Timings:
+    def __init__(self):
+        """
+        Class collects wall time, CPU time and peak RSS of the phases of translation. Phases are kept in the order they were started, so nested phases follow the enclosing one.
+
+        CPU time is measured for the current thread only, so concurrent translations (in the translation server) don't affect each other. Peak RSS is the maximum resident set size of the whole process by the end of the phase.
+        """
+
+        self.__phases: list[Phase] = []
+
+    @contextmanager
+    def measure(self, name: str):
+        """
+        Measures the code in the block as a phase with given name.
+        """
+
+        phase: Phase = {"phase": name}
+        self.__phases.append(phase)
+
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            phase["wall"] = time.perf_counter() - wall_start
+            phase["cpu"] = time.thread_time() - cpu_start
+            phase["max_rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    @property
+    def phases(self) -> list[Phase]:
+        """
+        Measured phases: dictionaries with name ("phase"), wall and CPU time in seconds ("wall", "cpu") and peak RSS in KiB ("max_rss").
+        """
+
+        return self.__phases
+
+
+def format_timings(phases: list[Phase], fmt: str) -> str:
+    """
+    Returns the report of the phases.
+
+    :param phases: measured phases.
+    :param fmt: "text" (table) or "json".
+    """
+
+    if fmt == "json":
+        return json.dumps({"phases": phases})
+
+    header = ["Phase", "Wall", "CPU", "Peak RSS"]
+    rows = [
+        [
+            p["phase"],
+            f"{p['wall'] * 1000:.1f} ms",
+            f"{p['cpu'] * 1000:.1f} ms",
+            f"{p['max_rss'] / 1024:.1f} MiB",
+        ]
+        for p in phases
+    ]
+
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(
+            cell.ljust(width) if i == 0 else cell.rjust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in [header, *rows]
+    )
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from src.ast_reading import read_ast
+from src.ast_visiting import ASTVisitor
+from src.backend import CBackend, Lines
+from src.ir.passes import Pass, PassManager, default_passes
+from src.prelude import Prelude, PRELUDE_CODE
+from src.symbols import Symbols
+from src.timings import Timings
+
+
+def translate(
+    source: str,
+    symbols: Symbols,
+    prelude: Prelude,
+    timings: Optional[Timings] = None,
+    passes: Optional[list[Pass]] = None,
+) -> Lines:
+    """
+    Translates Lisp-code to C-code: AST is lowered into the IR, passes transform it, then the backend prints C-code. Symbols and prelude are only read, so they can be shared between concurrent translations.
+
+    :param source: Lisp-code.
+    :param symbols: symbols.
+    :param prelude: translated standard functions written on Lisp, see load_prelude().
+    :param timings: if given, durations of the phases of translation are measured into it.
+    :param passes: passes that transform the IR, default_passes() if not given. Passes can be inspected after the translation (for example, report of ElideRefCounts).
+    :return: lines of the generated C-code.
+    :raises SyntaxError: the code has syntax errors.
+    :raises VisitingException: the code is invalid.
+    """
+
+    if timings is None:
+        timings = Timings()
+
+    # The prelude isn't a part of the source, so lines in the errors are the lines of the source
+    with timings.measure("parse"):
+        ast = read_ast(source)
+
+    with timings.measure("lower"):
+        visitor = ASTVisitor(symbols=symbols, prelude=prelude)
+        program = visitor.visit(ast)
+
+    if passes is None:
+        passes = default_passes()
+
+    PassManager(passes).run(program, timings)
+
+    with timings.measure("emit"):
+        return CBackend(symbols).emit(program)
+
+
+def translate_prelude(symbols: Symbols) -> Prelude:
+    """
+    Translates the standard functions written on Lisp.
+    """
+
+    visitor = ASTVisitor(symbols=symbols)
+    program, variables, counters = visitor.visit_prelude(read_ast(PRELUDE_CODE))
+
+    PassManager(default_passes()).run(program)
+
+    backend = CBackend(symbols)
+
+    return Prelude(
+        declarations=[backend.emit_function(f) for f in program.functions],
+        main_body=backend.emit_block(program.main),
+        variables=variables,
+        counters=counters,
+    )
+
+
+def load_prelude(symbols: Symbols, cache_dir: Optional[str] = None) -> Prelude:
+    """
+    Returns the translated prelude. If cache directory is given, the prelude is read from it, or translated and stored there. Key of the cache is a hash of everything that affects the translation: the prelude, symbols and sources of the translator.
+
+    :param symbols: symbols.
+    :param cache_dir: directory of the cache.
+    """
+
+    if cache_dir is None:
+        return translate_prelude(symbols)
+
+    cache_path = Path(cache_dir) / f"{__compute_key(symbols)}.json"
+
+    try:
+        with open(cache_path) as f:
+            return Prelude.from_dict(json.load(f))
+    except (OSError, ValueError, KeyError):
+        pass
+
+    prelude = translate_prelude(symbols)
+
+    # Written atomically, so concurrent translators never read a partially written file
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix=".prelude.", dir=cache_path.parent)
+    with os.fdopen(tmp_fd, "w") as f:
+        json.dump(prelude.to_dict(), f)
+    os.replace(tmp_path, cache_path)
+
+    return prelude
+
+
+def __compute_key(symbols: Symbols) -> str:
+    h = hashlib.sha256()
+    h.update(PRELUDE_CODE.encode())
+    h.update(symbols.digest.encode())
+
+    for path in sorted(Path(__file__).parent.rglob("*.py")):
+        h.update(path.read_bytes())
+
+    return h.hexdigest()
+
+
+def describe_exception(e: BaseException) -> str:
+    """
+    Returns the text of the exception and all its causes, one per line.
+    """
+
+    messages = []
+
+    curr_e: Optional[BaseException] = e
+    while curr_e:
+        messages.append(str(curr_e))
+        curr_e = curr_e.__cause__
+
+    return "\n".join(messages)